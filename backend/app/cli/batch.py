@@ -0,0 +1,74 @@
+# backend/app/cli/batch.py
+"""
+Analyze a whole folder of recordings offline and save them as sessions
+(see services/batch_service.py). The analyzer pools are started once and
+stay warm for every file.
+
+Usage (from backend/):
+    python -m app.cli.batch recordings/
+    python -m app.cli.batch recordings/ --recursive --concurrency 8 --report batch.json
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from ..db.database import init_db
+from ..services.batch_service import analyze_batch, new_batch_file
+from ..services.worker_pool import shutdown_pools
+
+MEDIA_EXTENSIONS = (".mp4", ".mov", ".mkv", ".webm", ".avi", ".wav", ".mp3", ".m4a", ".ogg", ".flac")
+
+
+def _find_media(directory: Path, recursive: bool):
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        path for path in directory.glob(pattern)
+        if path.is_file() and path.suffix.lower() in MEDIA_EXTENSIONS
+    )
+
+
+def _print_update(file: dict):
+    if file["status"] == "done":
+        print(f"  done    {file['filename']}  {file['seconds']:.1f}s  overall={file['overall']}  "
+              f"session={file['session_id']}", flush=True)
+    elif file["status"] == "failed":
+        print(f"  failed  {file['filename']}  {file['error']}", flush=True)
+
+
+async def _run(files, concurrency):
+    try:
+        return await analyze_batch(files, on_update=_print_update, concurrency=concurrency)
+    finally:
+        shutdown_pools()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--recursive", action="store_true", help="include subdirectories")
+    parser.add_argument("--concurrency", type=int, default=None, help="files analyzed at the same time")
+    parser.add_argument("--report", type=Path, default=None, help="write the full JSON report here")
+    args = parser.parse_args()
+
+    paths = _find_media(args.directory, args.recursive)
+    if not paths:
+        parser.error(f"no media files found in {args.directory}")
+
+    init_db()
+    files = [new_batch_file(str(path.relative_to(args.directory)), str(path)) for path in paths]
+    print(f"analyzing {len(files)} files")
+    report = asyncio.run(_run(files, args.concurrency))
+
+    print(f"\n{report['done']} saved, {report['failed']} failed in {report['seconds']:.1f}s "
+          f"({report['files_per_minute']:.1f} files/min)")
+    timed = [file["seconds"] for file in report["files"] if file["status"] == "done"]
+    if timed:
+        print(f"per file: avg {sum(timed) / len(timed):.1f}s, max {max(timed):.1f}s")
+    if args.report is not None:
+        args.report.write_text(json.dumps(report, indent=2))
+        print(f"report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# backend/app/cli/rescore.py
+"""
+Re-score stored sessions with the current scoring rules, without re-running
+ASR or vision (see services/rescore_service.py).
+
+Usage (from backend/):
+    python -m app.cli.rescore --dry-run             # show what would change
+    python -m app.cli.rescore                       # update all sessions
+    python -m app.cli.rescore --rerun-text --session 12 --session 40
+"""
+import argparse
+import asyncio
+import json
+
+from ..db.database import init_db
+from ..services.rescore_service import rescore_sessions
+from ..services.worker_pool import shutdown_pools
+
+
+async def _run(args) -> dict:
+    try:
+        return await rescore_sessions(
+            dry_run=args.dry_run,
+            rerun_text=args.rerun_text,
+            session_ids=args.sessions,
+            limit=args.limit,
+            batch_size=args.batch_size,
+            max_diffs=args.max_diffs,
+        )
+    finally:
+        shutdown_pools()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="print the diff, write nothing")
+    parser.add_argument("--rerun-text", action="store_true", help="re-run the text analyzer on each transcript")
+    parser.add_argument("--session", type=int, action="append", dest="sessions", help="only this session id (repeatable)")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many sessions")
+    parser.add_argument("--batch-size", type=int, default=None, help="rows per read/write transaction")
+    parser.add_argument("--max-diffs", type=int, default=100, help="per-session diffs included in the report")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+
+    init_db()
+    report = asyncio.run(_run(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for entry in report["diffs"]:
+        changes = ", ".join(f"{column} {old} -> {new}" for column, (old, new) in entry["changes"].items())
+        print(f"session {entry['session_id']}: {changes}")
+    if report["diffs_truncated"]:
+        print(f"... {report['changed'] - len(report['diffs'])} more changed sessions")
+    mode = "dry run, nothing written" if report["dry_run"] else f"{report['written']} rows updated"
+    print(f"\n{report['scanned']} sessions scanned, {report['changed']} with score changes ({mode})")
+    print(f"{report['seconds']:.2f}s, {report['sessions_per_second']:.1f} sessions/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# backend/app/config.py
+"""
+Runtime settings for the backend, read from environment variables
+(optionally via a local .env file).
+"""
+import os
+from pathlib import Path
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# --- Analyzer worker pools ---
+# Each heavy analyzer gets its own process pool so one slow stage can't
+# starve the others. QUEUE_SIZE is how many extra requests may wait for a
+# free worker before the API starts answering 503.
+ASR_WORKERS = _env_int("FLUENTIQ_ASR_WORKERS", 1)
+ASR_QUEUE_SIZE = _env_int("FLUENTIQ_ASR_QUEUE_SIZE", 4)
+
+NLP_WORKERS = _env_int("FLUENTIQ_NLP_WORKERS", 1)
+NLP_QUEUE_SIZE = _env_int("FLUENTIQ_NLP_QUEUE_SIZE", 8)
+
+VISION_WORKERS = _env_int("FLUENTIQ_VISION_WORKERS", 2)
+VISION_QUEUE_SIZE = _env_int("FLUENTIQ_VISION_QUEUE_SIZE", 4)
+
+# Value of the Retry-After header when a pool queue is full
+POOL_RETRY_AFTER_SECONDS = _env_int("FLUENTIQ_POOL_RETRY_AFTER", 30)
+# Start the pools' workers (and load their models) in the background when
+# the API starts, instead of on the first request; see GET /ready
+WARM_UP_ON_START = os.getenv("FLUENTIQ_WARM_UP", "1").lower() not in ("0", "false", "no")
+# A failed warm-up is retried after this many seconds, doubling up to the max
+WARM_UP_RETRY_SECONDS = _env_int("FLUENTIQ_WARM_UP_RETRY", 10)
+WARM_UP_RETRY_MAX_SECONDS = _env_int("FLUENTIQ_WARM_UP_RETRY_MAX", 300)
+
+# --- Background jobs (POST /jobs) ---
+# Uploads for queued jobs live here (not in /tmp) so they survive a restart
+JOB_UPLOAD_DIR = Path(os.getenv("FLUENTIQ_JOB_UPLOAD_DIR", Path(__file__).parent / "db" / "job_uploads"))
+# How many jobs may run through the analyzer pools at once
+JOB_CONCURRENCY = _env_int("FLUENTIQ_JOB_CONCURRENCY", 2)
+
+# --- Uploads ---
+# Uploads are streamed to disk in chunks of this size (never held whole in memory)
+UPLOAD_CHUNK_BYTES = _env_int("FLUENTIQ_UPLOAD_CHUNK_BYTES", 1024 * 1024)
+
+# --- Result cache (keyed on upload SHA-256 + analyzer versions) ---
+RESULT_CACHE_DIR = Path(os.getenv("FLUENTIQ_RESULT_CACHE_DIR", Path(__file__).parent / "db" / "result_cache"))
+RESULT_CACHE_MAX_BYTES = _env_int("FLUENTIQ_RESULT_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+RESULT_CACHE_MAX_AGE_SECONDS = _env_int("FLUENTIQ_RESULT_CACHE_MAX_AGE", 30 * 24 * 3600)
+
+# --- Audio decoding ---
+FFMPEG_BINARY = os.getenv("FLUENTIQ_FFMPEG", "ffmpeg")
+# Memory-map decoded PCM instead of reading it into each worker's heap
+PCM_MMAP = os.getenv("FLUENTIQ_PCM_MMAP", "1").lower() not in ("0", "false", "no")
+
+# --- Speech recognition backend ---
+# whisper (PyTorch reference) | faster-whisper (CTranslate2, CPU-optimized)
+ASR_BACKEND = os.getenv("FLUENTIQ_ASR_BACKEND", "whisper")
+ASR_MODEL_SIZE = os.getenv("FLUENTIQ_ASR_MODEL", "base")
+# fp32 | fp16 | int8 (empty = backend default)
+ASR_COMPUTE_TYPE = os.getenv("FLUENTIQ_ASR_COMPUTE_TYPE", "")
+ASR_THREADS = _env_int("FLUENTIQ_ASR_THREADS", 0)
+ASR_BATCH_SIZE = _env_int("FLUENTIQ_ASR_BATCH_SIZE", 1)
+# Ask the engine for word timestamps; fluency metrics then use word timings
+# (pauses between words, articulation rate) instead of segment gaps
+ASR_WORD_TIMESTAMPS = os.getenv("FLUENTIQ_ASR_WORD_TIMESTAMPS", "0").lower() in ("1", "true", "yes")
+
+# --- Voice activity detection (silence skipping before ASR) ---
+VAD_ENABLED = os.getenv("FLUENTIQ_VAD", "1").lower() not in ("0", "false", "no")
+VAD_FRAME_MS = _env_int("FLUENTIQ_VAD_FRAME_MS", 30)
+# speech = louder than noise floor + MARGIN, and within DYNAMIC_RANGE of the peak
+VAD_MARGIN_DB = float(os.getenv("FLUENTIQ_VAD_MARGIN_DB", "10"))
+VAD_DYNAMIC_RANGE_DB = float(os.getenv("FLUENTIQ_VAD_DYNAMIC_RANGE_DB", "45"))
+# silences shorter than this are not counted as pauses
+VAD_MIN_SILENCE_SECONDS = float(os.getenv("FLUENTIQ_VAD_MIN_SILENCE", "0.3"))
+VAD_MIN_SPEECH_SECONDS = float(os.getenv("FLUENTIQ_VAD_MIN_SPEECH", "0.15"))
+# context kept around each speech region / silence inserted between regions for ASR
+VAD_PAD_SECONDS = float(os.getenv("FLUENTIQ_VAD_PAD", "0.2"))
+VAD_SPACER_SECONDS = float(os.getenv("FLUENTIQ_VAD_SPACER", "0.3"))
+
+# --- Chunked parallel transcription for long recordings ---
+# Recordings at least this long are split at silences and transcribed in parallel
+ASR_CHUNK_MIN_SECONDS = _env_int("FLUENTIQ_ASR_CHUNK_MIN_SECONDS", 600)
+ASR_CHUNK_SECONDS = _env_int("FLUENTIQ_ASR_CHUNK_SECONDS", 120)
+# overlap used only when no silence is found near a chunk boundary
+ASR_CHUNK_OVERLAP_SECONDS = float(os.getenv("FLUENTIQ_ASR_CHUNK_OVERLAP", "2.0"))
+
+# --- Live analysis over WebSocket (/ws/live) ---
+# push partial scores this often
+LIVE_UPDATE_SECONDS = float(os.getenv("FLUENTIQ_LIVE_UPDATE_SECONDS", "3"))
+# rolling metrics / max audio transcribed per update
+LIVE_WINDOW_SECONDS = float(os.getenv("FLUENTIQ_LIVE_WINDOW_SECONDS", "30"))
+# segments ending this close to the live edge stay tentative
+LIVE_TAIL_SECONDS = float(os.getenv("FLUENTIQ_LIVE_TAIL_SECONDS", "2"))
+# camera frames analyzed per second at most
+LIVE_FRAME_HZ = float(os.getenv("FLUENTIQ_LIVE_FRAME_HZ", "2"))
+LIVE_MAX_SECONDS = _env_int("FLUENTIQ_LIVE_MAX_SECONDS", 3600)
+
+# --- Video frame sampling ---
+# Frames analyzed per second of video (the original fixed step was fps * 0.5 frames, i.e. 2 Hz)
+VIDEO_SAMPLE_HZ = float(os.getenv("FLUENTIQ_VIDEO_SAMPLE_HZ", "2"))
+# Frames are downscaled to at most this width before inference (0 = keep full size)
+VIDEO_MAX_WIDTH = _env_int("FLUENTIQ_VIDEO_MAX_WIDTH", 640)
+# Seek instead of grab() through skipped frames when the sampling step is at least this many frames
+VIDEO_SEEK_MIN_STEP = _env_int("FLUENTIQ_VIDEO_SEEK_MIN_STEP", 60)
+
+# --- Parallel video analysis across time shards ---
+# Videos at least this long are split into shards analyzed in parallel
+VIDEO_SHARD_MIN_SECONDS = _env_int("FLUENTIQ_VIDEO_SHARD_MIN_SECONDS", 120)
+# number of shards (0 = one per vision worker)
+VIDEO_SHARDS = _env_int("FLUENTIQ_VIDEO_SHARDS", 0)
+
+# --- Warm MediaPipe graph pool ---
+# Pose + FaceMesh pairs kept ready in the API process (one per concurrent live session)
+VIDEO_GRAPH_POOL_SIZE = _env_int("FLUENTIQ_VIDEO_GRAPH_POOL_SIZE", 2)
+# ... and in each vision worker, which runs one video (or shard) at a time
+VIDEO_WORKER_GRAPH_POOL_SIZE = _env_int("FLUENTIQ_VIDEO_WORKER_GRAPH_POOL_SIZE", 1)
+# How long a request waits for a free pair before a temporary one is built
+VIDEO_GRAPH_MAX_WAIT_SECONDS = float(os.getenv("FLUENTIQ_VIDEO_GRAPH_MAX_WAIT_SECONDS", "2"))
+
+# --- Face mesh on the head region ---
+# Run FaceMesh on a head crop located by the pose landmarks instead of the full frame
+VIDEO_FACE_ROI = os.getenv("FLUENTIQ_VIDEO_FACE_ROI", "1").lower() not in ("0", "false", "no")
+# Head crops are downscaled to at most this many pixels per side
+VIDEO_FACE_ROI_SIZE = _env_int("FLUENTIQ_VIDEO_FACE_ROI_SIZE", 192)
+# Crop side as a multiple of the pose head landmarks' extent
+VIDEO_FACE_ROI_SCALE = float(os.getenv("FLUENTIQ_VIDEO_FACE_ROI_SCALE", "2.0"))
+# Below this pose nose visibility no head crop is made (FaceMesh runs on the full frame)
+VIDEO_HEAD_MIN_VISIBILITY = float(os.getenv("FLUENTIQ_VIDEO_HEAD_MIN_VISIBILITY", "0.5"))
+
+# --- Session timelines ---
+# Per-frame / per-segment timeline files (.npz) referenced from sessions.timeline_path
+TIMELINE_DIR = Path(os.getenv("FLUENTIQ_TIMELINE_DIR", Path(__file__).parent / "db" / "timelines"))
+
+# --- Bulk re-scoring ---
+# sessions rows read, re-scored and written per transaction
+RESCORE_BATCH_SIZE = _env_int("FLUENTIQ_RESCORE_BATCH_SIZE", 200)
+
+# --- Batch ingestion ---
+# Files of one batch analyzed at the same time (they share the analyzer pools)
+BATCH_CONCURRENCY = _env_int("FLUENTIQ_BATCH_CONCURRENCY", 4)
+# Sessions saved per transaction by the batch writer
+BATCH_WRITE_SIZE = _env_int("FLUENTIQ_BATCH_WRITE_SIZE", 25)
+# Least time between two progress writes of an HTTP batch's file list
+BATCH_PROGRESS_SECONDS = float(os.getenv("FLUENTIQ_BATCH_PROGRESS_SECONDS", "2"))
+
+# --- Grammar checking (LanguageTool) ---
+# Local LanguageTool servers started per NLP worker process
+GRAMMAR_SERVERS = _env_int("FLUENTIQ_GRAMMAR_SERVERS", 1)
+# Sentences checked concurrently per transcript
+GRAMMAR_THREADS = _env_int("FLUENTIQ_GRAMMAR_THREADS", 4)
+# Cached per-sentence results (LRU, per process; 0 = no cache)
+GRAMMAR_CACHE_SIZE = _env_int("FLUENTIQ_GRAMMAR_CACHE_SIZE", 4096)
+# Use an already running LanguageTool server (e.g. http://localhost:8081) instead of starting one
+LANGUAGETOOL_URL = os.getenv("FLUENTIQ_LANGUAGETOOL_URL", "")
+
+# --- spaCy ---
+SPACY_MODEL = os.getenv("FLUENTIQ_SPACY_MODEL", "en_core_web_sm")
+# Processes nlp.pipe uses for batched text analysis (rescoring)
+SPACY_PROCESSES = _env_int("FLUENTIQ_SPACY_PROCESSES", 1)
+SPACY_BATCH_SIZE = _env_int("FLUENTIQ_SPACY_BATCH_SIZE", 32)
+
+# --- Filler words ---
+# Comma-separated filler lexicon; entries may be phrases ("you know")
+FILLER_LEXICON = [
+    phrase.strip().lower()
+    for phrase in os.getenv("FLUENTIQ_FILLERS", "um,uh,erm,like,you know,i mean,sort of,kind of").split(",")
+    if phrase.strip()
+]
+
+# --- SQLite ---
+DB_PATH = Path(os.getenv("FLUENTIQ_DB_PATH", Path(__file__).parent / "db" / "fluentiq.db"))
+# Idle connections kept open for reuse
+DB_POOL_SIZE = _env_int("FLUENTIQ_DB_POOL_SIZE", 8)
+# Page cache per connection, in KiB
+DB_CACHE_KB = _env_int("FLUENTIQ_DB_CACHE_KB", 16 * 1024)
+# How long a writer waits for the write lock before "database is locked"
+DB_BUSY_TIMEOUT_MS = _env_int("FLUENTIQ_DB_BUSY_TIMEOUT_MS", 5000)
+
+# --- History API ---
+# Sessions per page of GET /history/all (the client may ask for up to HISTORY_MAX_PAGE_SIZE)
+HISTORY_PAGE_SIZE = _env_int("FLUENTIQ_HISTORY_PAGE_SIZE", 50)
+HISTORY_MAX_PAGE_SIZE = _env_int("FLUENTIQ_HISTORY_MAX_PAGE_SIZE", 500)
+# Rows read per query while streaming GET /history/export
+HISTORY_EXPORT_BATCH = _env_int("FLUENTIQ_HISTORY_EXPORT_BATCH", 200)
@@ -1,15 +1,102 @@
 # backend/app/db/database.py
+import queue
 import sqlite3
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent / "fluentiq.db"
+from .. import config
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+DB_PATH = Path(config.DB_PATH)
+
+# Score columns aggregated in session_rollups (see services/rollups.py), each
+# as a sum and a count of non-NULL values so averages match SQL AVG
+ROLLUP_COLUMNS = ("fluency", "grammar", "coherence", "readability", "posture", "gaze", "movement", "overall")
+ROLLUP_VALUE_COLUMNS = [f"{column}_{part}" for column in ROLLUP_COLUMNS for part in ("sum", "count")]
+
+
+def connect(path=None) -> sqlite3.Connection:
+    """
+    Open a tuned connection: WAL journal (readers never block the writer
+    and vice versa), synchronous=NORMAL (durable at checkpoints, safe with
+    WAL), a larger page cache and a busy timeout instead of immediate
+    "database is locked" errors. check_same_thread is off because pooled
+    connections move between threads; each is used by one thread at a time.
+    """
+    conn = sqlite3.connect(path or DB_PATH, timeout=config.DB_BUSY_TIMEOUT_MS / 1000.0,
+                           check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{max(0, config.DB_CACHE_KB)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
     return conn
 
+
+class PooledConnection:
+    """
+    A pooled sqlite3 connection. Behaves like the connection itself
+    (execute, cursor, commit, `with conn:` transactions, ...), except that
+    close() hands it back to the pool, rolling back anything uncommitted.
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn: sqlite3.Connection):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._conn.__exit__(*exc_info)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+
+class ConnectionPool:
+    """Keeps up to `size` idle connections open instead of reconnecting per query."""
+
+    def __init__(self, path, size: int = config.DB_POOL_SIZE):
+        self.path = path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max(1, size))
+
+    def acquire(self) -> PooledConnection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = connect(self.path)
+        return PooledConnection(self, conn)
+
+    def release(self, conn: sqlite3.Connection):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+pool = ConnectionPool(DB_PATH)
+
+
+def get_connection() -> PooledConnection:
+    """A connection from the shared pool; conn.close() returns it."""
+    return pool.acquire()
+
+
 def init_db():
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     conn = get_connection()
     cur = conn.cursor()
 
@@ -31,9 +118,89 @@ def init_db():
         audio_json TEXT,
         text_json TEXT,
         video_json TEXT,
-        fused_json TEXT
+        fused_json TEXT,
+
+        timeline_path TEXT
+    )
+    """)
+
+    # Batch ingestion (POST /batch): one row per batch, files_json holds the
+    # per-file status/timings (services/batch_service.py).
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS batches (
+        id TEXT PRIMARY KEY,
+        status TEXT,
+        files_json TEXT,
+        created_at TEXT,
+        updated_at TEXT
+    )
+    """)
+
+    # columns added after the table was first created
+    columns = {row["name"] for row in cur.execute("PRAGMA table_info(sessions)")}
+    if "timeline_path" not in columns:
+        # .npz file with per-frame / per-segment columns (services/timeline.py)
+        cur.execute("ALTER TABLE sessions ADD COLUMN timeline_path TEXT")
+
+    # date-range filters of the history list and export
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp)")
+
+    # running score aggregates per day / week (services/rollups.py); a new
+    # table is filled from the sessions already stored
+    rollups_exist = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'session_rollups'"
+    ).fetchone()
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS session_rollups (
+        kind TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        sessions INTEGER NOT NULL DEFAULT 0,
+        {", ".join(f"{name} REAL NOT NULL DEFAULT 0" for name in ROLLUP_VALUE_COLUMNS)},
+        PRIMARY KEY (kind, bucket)
+    )
+    """)
+    if not rollups_exist:
+        rebuild_rollups(cur)
+
+    # Background analysis jobs (POST /jobs). Kept next to sessions so queued
+    # work survives a restart; progress_json holds per-stage percentages.
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        status TEXT,
+        filename TEXT,
+        upload_path TEXT,
+        progress_json TEXT,
+        result_json TEXT,
+        error TEXT,
+        session_id INTEGER,
+        created_at TEXT,
+        updated_at TEXT
     )
     """)
 
     conn.commit()
     conn.close()
+
+
+def rebuild_rollups(cur):
+    """
+    Recompute every session_rollups row from the sessions table (one
+    GROUP BY per kind: "all", "day" and "week").
+    """
+    cur.execute("DELETE FROM session_rollups")
+    bucket_sql = {
+        "all": "''",
+        "day": "substr(timestamp, 1, 10)",
+        # Monday on or before the day: next Sunday ('weekday 0') minus six days
+        "week": "date(substr(timestamp, 1, 10), 'weekday 0', '-6 days')",
+    }
+    # SUM over only NULLs (e.g. video scores of audio-only sessions) is NULL
+    aggregates = ", ".join(f"COALESCE(SUM({c}), 0), COUNT({c})" for c in ROLLUP_COLUMNS)
+    for kind, bucket in bucket_sql.items():
+        cur.execute(f"""
+            INSERT INTO session_rollups (kind, bucket, sessions, {", ".join(ROLLUP_VALUE_COLUMNS)})
+            SELECT ?, {bucket}, COUNT(*), {aggregates}
+            FROM sessions WHERE timestamp IS NOT NULL
+            GROUP BY {bucket}
+        """, (kind,))
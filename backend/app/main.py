@@ -1,29 +1,37 @@
 # backend/app/main.py
 
-import tempfile
-import os
-from pathlib import Path
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import asyncio
+import json
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+
+from . import config
 
 # --- Database initialization ---
-from .db.database import init_db
+from .db.database import init_db, pool as db_pool
 
 # --- Services ---
-from .services.audio_processor import analyze_audio_file
-from .services.text_processor import analyze_text
-from .services.video_processor import analyze_video_file
-from .services.fusion import fuse_audio_text_video
-from .services.history_service import save_session, get_all_sessions, get_summary
+from .services.pipeline import run_multimodal_pipeline
+from .services.uploads import save_upload, remove_upload
+from .services.worker_pool import PoolBusyError, get_pool_readiness, get_pool_stats, shutdown_pools, warm_pools
+from .services.result_cache import result_cache
+from .services.live_session import run_live_session
+from .services.job_service import create_job, get_job, schedule_job, resume_unfinished_jobs
+from .services.batch_service import create_batch, get_batch, new_batch_file, schedule_batch, resume_unfinished_batches
+from .services.history_service import (
+    save_session_async, list_sessions, get_session, iter_sessions, get_summary, get_trends,
+    get_session_timeline,
+)
+from .services.timeline import timeline_window
+from .services.rescore_service import rescore_sessions
 
 # --- Models ---
-from .models.api_models import (
-    AudioAnalysisResponse,
-    TextAnalysisResponse,
-    MultimodalAnalysisResponse,
-    MultimodalStats,
-)
+from .models.api_models import MultimodalAnalysisResponse, JobStatusResponse, RescoreRequest
 
 # -------------------------------
 # FastAPI App Setup
@@ -31,8 +39,9 @@ from .models.api_models import (
 
 app = FastAPI(title="FluentIQ Multimodal Backend")
 
-# Initialize database on startup
-init_db()
+# Models are not loaded in this process at import time: the analyzer pools'
+# workers load them, in the background after startup (see /ready)
+_startup = {"database": False, "warm_up": None}
 
 # CORS
 app.add_middleware(
@@ -44,117 +53,288 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def _startup_tasks():
+    # Initialize database on startup
+    init_db()
+    _startup["database"] = True
+    # pick up jobs and batches that were queued or mid-run when the server stopped
+    resume_unfinished_jobs()
+    resume_unfinished_batches()
+    if config.WARM_UP_ON_START:
+        _startup["warm_up"] = asyncio.get_running_loop().create_task(warm_pools())
+
+
+@app.on_event("shutdown")
+def _shutdown_pools():
+    # stop a warm-up still loading or waiting to retry
+    if _startup["warm_up"] is not None:
+        _startup["warm_up"].cancel()
+    shutdown_pools()
+
+
+@app.on_event("shutdown")
+def _close_db():
+    db_pool.close()
+
+
+@app.exception_handler(PoolBusyError)
+async def _pool_busy_handler(request, exc: PoolBusyError):
+    # Backpressure: tell clients to come back instead of queueing forever
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "pool": exc.pool_name},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(BrokenProcessPool)
+async def _pool_crashed_handler(request, exc: BrokenProcessPool):
+    # a worker died mid-request; the pool restarts its workers in the background
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "An analyzer worker crashed; retry later."},
+        headers={"Retry-After": str(config.POOL_RETRY_AFTER_SECONDS)},
+    )
+
+
 @app.get("/ping")
 def ping():
     return {"message": "Backend is running!"}
 
 
+@app.get("/ready")
+def ready():
+    """
+    Per-model readiness. 200 once the database is initialized and every
+    analyzer pool has loaded its model (with FLUENTIQ_WARM_UP=0 pools load
+    on first use and only a failed start counts against readiness), 503
+    before that.
+    """
+    models = get_pool_readiness()
+    if config.WARM_UP_ON_START:
+        models_ready = all(model["state"] == "ready" for model in models.values())
+    else:
+        models_ready = all(model["state"] != "failed" for model in models.values())
+    is_ready = _startup["database"] and models_ready
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"ready": is_ready, "database": _startup["database"], "models": models},
+    )
+
+
+@app.get("/pools")
+def pools():
+    """Return load of the ASR / NLP / vision worker pools."""
+    return get_pool_stats()
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Return hit/miss counters of the analysis result cache."""
+    return result_cache.stats()
+
+
 # ------------------------------------------------------
 #               MAIN MULTIMODAL PIPELINE
 # ------------------------------------------------------
 @app.post("/analyze/audio", response_model=MultimodalAnalysisResponse)
 async def analyze_audio(file: UploadFile = File(...)):
 
-    # Save uploaded file once to reuse for all processors
-    suffix = Path(file.filename).suffix or ".mp4"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        contents = await file.read()
-        tmp.write(contents)
-        tmp_path = tmp.name
+    # Stream the upload to disk once; every analyzer reads this one file
+    tmp_path, upload_hash = await save_upload(file)
 
     try:
-        # Wrapper so we can re-read file multiple times
-        class _SimpleUpload:
-            def __init__(self, path, filename):
-                self.path = path
-                self.filename = filename
-                self.file = open(path, "rb")
-
-            async def read(self):
-                self.file.seek(0)
-                return self.file.read()
-
-            def close(self):
-                try:
-                    self.file.close()
-                except:
-                    pass
-
-        ufile = _SimpleUpload(tmp_path, file.filename)
-
-        # --- 1) AUDIO ANALYSIS ---
-        audio_result = await analyze_audio_file(ufile)
-        audio_dict = audio_result.dict()
-
-        # --- 2) TEXT ANALYSIS ---
-        transcript = audio_dict.get("transcript", "")
-        text_result = analyze_text(transcript)
-        text_dict = text_result if isinstance(text_result, dict) else text_result
-
-        # --- 3) VIDEO ANALYSIS ---
-        try:
-            video_result = await analyze_video_file(ufile)
-        except Exception:
-            video_result = None
-        finally:
-            ufile.close()
-
-        # --- 4) FUSION ---
-        fused = fuse_audio_text_video(audio_dict, text_dict, video_result)
-
-        # --- 5) STATISTICS MODEL ---
-        stats = MultimodalStats(
-            word_count=audio_dict["stats"]["word_count"],
-            duration_seconds=audio_dict["stats"]["duration_seconds"],
-            total_pause_seconds=audio_dict["stats"]["total_pause_seconds"],
-            sentence_count=text_dict["stats"]["sentence_count"],
-            avg_sentence_length=text_dict["stats"]["avg_sentence_length"],
-            grammar_errors=text_dict["stats"]["grammar_errors"],
-        )
-
-        # --- 6) BUILD RESPONSE ---
-        response = {
-            "transcript": transcript,
-            "audio": audio_dict,
-            "text": text_dict,
-            "video": video_result,
-            "fused": fused,
-            "stats": stats.dict(),
-            "notes": {
-                "pipeline": "audio -> text -> video fusion",
-                "storage": "session saved to SQLite history",
-            },
-        }
+        # --- 1-6) SPEECH (audio -> text) || VIDEO, THEN FUSION ---
+        response = await run_multimodal_pipeline(tmp_path, upload_hash=upload_hash)
 
         # --- 7) SAVE SESSION TO DB ---
-        save_session(
-            transcript=transcript,
-            fused=fused,
-            audio=audio_dict,
-            text=text_dict,
-            video=video_result
+        await save_session_async(
+            transcript=response["transcript"],
+            fused=response["fused"],
+            audio=response["audio"],
+            text=response["text"],
+            video=response["video"],
+            timeline=response.pop("timeline", None)
         )
 
         return response
 
     finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
+        remove_upload(tmp_path)
+
+
+# ------------------------------------------------------
+#                   LIVE (STREAMING) ANALYSIS
+# ------------------------------------------------------
+
+@app.websocket("/ws/live")
+async def live_analysis(websocket: WebSocket):
+    """Stream audio (and optional JPEG frames) for rolling feedback; see services/live_session.py."""
+    await run_live_session(websocket)
+
+
+# ------------------------------------------------------
+#                   BACKGROUND JOBS
+# ------------------------------------------------------
+
+@app.post("/jobs", response_model=JobStatusResponse, status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    """Queue an upload for analysis and return its job id immediately."""
+    upload_path, _ = await save_upload(file, config.JOB_UPLOAD_DIR)
+    job_id = await asyncio.to_thread(create_job, file.filename, upload_path)
+    schedule_job(job_id, upload_path)
+    return await asyncio.to_thread(get_job, job_id)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def job_status(job_id: str):
+    """Return status and per-stage progress of a job."""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/result", response_model=MultimodalAnalysisResponse)
+def job_result(job_id: str):
+    """Return the analysis result of a finished job."""
+    job = get_job(job_id, include_result=True)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job['error']}")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']} ({job['progress_text']})")
+    return job["result"]
+
+
+# ------------------------------------------------------
+#                   BATCH INGESTION
+# ------------------------------------------------------
+
+@app.post("/batch", status_code=202)
+async def submit_batch(files: List[UploadFile] = File(...)):
+    """
+    Queue many recordings at once. They are analyzed in the background
+    across the analyzer pools and saved in batched transactions; poll
+    GET /batch/{batch_id} for per-file progress and timings.
+    """
+    batch_files = []
+    try:
+        for file in files:
+            upload_path, upload_hash = await save_upload(file, config.JOB_UPLOAD_DIR)
+            batch_files.append(new_batch_file(file.filename, upload_path, upload_hash))
+    except BaseException:
+        for batch_file in batch_files:
+            remove_upload(batch_file["path"])
+        raise
+    batch_id = create_batch(batch_files)
+    schedule_batch(batch_id, batch_files)
+    return get_batch(batch_id)
+
+
+@app.get("/batch/{batch_id}")
+def batch_status(batch_id: str):
+    """Status, throughput and per-file results of a batch."""
+    batch = get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found.")
+    return batch
 
 
 # ------------------------------------------------------
 #                   HISTORY ENDPOINTS
 # ------------------------------------------------------
 
+def _parse_timestamp(value: Optional[str], name: str) -> Optional[str]:
+    """Normalize an ISO date/datetime query parameter to the stored timestamp format."""
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"'{name}' must be an ISO date or datetime.")
+
+
 @app.get("/history/all")
-def history_all():
-    """Return list of all past analysis sessions."""
-    return get_all_sessions()
+def history_all(limit: int = config.HISTORY_PAGE_SIZE, cursor: Optional[int] = None,
+                since: Optional[str] = None, until: Optional[str] = None):
+    """
+    Page through past sessions, newest first: scores and timestamp only
+    (full rows via /history/{session_id}). Pass the returned next_cursor
+    as `cursor` for the next page; since/until (ISO, UTC) restrict the
+    timestamp range [since, until).
+    """
+    return list_sessions(
+        limit=max(1, min(limit, config.HISTORY_MAX_PAGE_SIZE)),
+        cursor=cursor,
+        since=_parse_timestamp(since, "since"),
+        until=_parse_timestamp(until, "until"),
+    )
+
+
+@app.get("/history/export")
+def history_export(since: Optional[str] = None, until: Optional[str] = None):
+    """Stream full sessions (oldest first) as NDJSON, one JSON object per line."""
+    rows = iter_sessions(since=_parse_timestamp(since, "since"), until=_parse_timestamp(until, "until"))
+    return StreamingResponse(
+        (json.dumps(row) + "\n" for row in rows),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=fluentiq_history.ndjson"},
+    )
 
 
 @app.get("/history/summary")
 def history_summary():
-    """Return aggregated improvement summary (averages)."""
+    """Return aggregated improvement summary (averages), from the running rollups."""
     return get_summary()
+
+
+@app.get("/history/trends")
+def history_trends(bucket: str = "week", periods: int = 12, window: int = 4):
+    """
+    Score trends per day or week: average of each of the last `periods`
+    buckets with sessions, a `window`-bucket moving average and the
+    improvement slope (points per day / week) for every score.
+    """
+    if bucket not in ("day", "week"):
+        raise HTTPException(status_code=400, detail="'bucket' must be 'day' or 'week'.")
+    return get_trends(bucket, max(1, min(periods, 520)), max(1, window))
+
+
+@app.get("/history/{session_id}")
+def history_session(session_id: int):
+    """Full stored session: transcript and the audio/text/video/fused JSON."""
+    session = get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    return session
+
+
+@app.get("/history/{session_id}/timeline")
+def history_timeline(session_id: int, start: float = 0.0, end: Optional[float] = None, max_points: int = 500):
+    """
+    Per-frame posture/gaze/movement and per-segment speech metrics of one
+    session between `start` and `end` seconds, with the frame series
+    averaged down to at most `max_points` points for charting.
+    """
+    timeline = get_session_timeline(session_id)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="No timeline stored for this session.")
+    return {"session_id": session_id, **timeline_window(timeline, start, end, max(1, min(max_points, 5000)))}
+
+
+@app.post("/history/rescore")
+async def history_rescore(request: RescoreRequest):
+    """
+    Re-score stored sessions with the current scoring rules (no ASR or
+    vision). Dry run by default: returns per-session diffs and throughput
+    without writing; send {"dry_run": false} to update the rows.
+    """
+    return await rescore_sessions(
+        dry_run=request.dry_run,
+        rerun_text=request.rerun_text,
+        session_ids=request.session_ids,
+        limit=request.limit,
+    )
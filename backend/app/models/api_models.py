@@ -2,7 +2,7 @@
 from pydantic import BaseModel
 from typing import Dict
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 # --- existing audio models (keep these if already present) ---
@@ -11,6 +11,7 @@ class AudioFluencyScores(BaseModel):
     filler_count: int
     pause_ratio: float
     fluency_score: int
+    articulation_rate: Optional[float] = None  # words per minute of speaking time (pauses excluded)
 
 class AudioStats(BaseModel):
     word_count: int
@@ -82,4 +83,21 @@ class MultimodalAnalysisResponse(BaseModel):
     video: Optional[Dict] = None   # video dict if present; else None
     fused: FusionScores
     stats: MultimodalStats
-    notes: Optional[Dict[str, str]] = None
\ No newline at end of file
+    notes: Optional[Dict[str, str]] = None
+
+class JobStatusResponse(BaseModel):
+    id: str
+    status: str                  # queued | running | done | failed
+    filename: Optional[str] = None
+    progress: Dict[str, float]   # per-stage percent, e.g. {"audio": 60.0, "video": 30.0}
+    progress_text: str           # e.g. "audio 60%, text 0%, video 30%, fusion 0%"
+    session_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+class RescoreRequest(BaseModel):
+    dry_run: bool = True                     # report diffs only, write nothing
+    rerun_text: bool = False                 # re-run the text analyzer on each transcript
+    session_ids: Optional[List[int]] = None  # default: all sessions
+    limit: Optional[int] = None
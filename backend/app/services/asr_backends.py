@@ -0,0 +1,189 @@
+# backend/app/services/asr_backends.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from .. import config
+
+# Backends for speech recognition. All of them take 16 kHz mono float32
+# samples and return {"text": str, "segments": [{"start", "end", "text"}]}
+# (plus "words": [{"word", "start", "end"}] per segment when word timestamps
+# are requested), so the rest of the pipeline does not care which engine produced them.
+# Heavy engines are imported lazily inside load().
+
+MODEL_SIZES = ("tiny", "base", "small", "medium")
+
+
+class ASRBackend(ABC):
+    """
+    Transcription backend interface.
+
+    model_size: Whisper checkpoint size (tiny / base / small / ...)
+    compute_type: numeric precision, e.g. "fp32", "fp16" or "int8"
+    threads: CPU threads for inference (0 = library default)
+    batch_size: segments decoded together (1 = sequential decoding)
+    word_timestamps: also return per-word start/end times
+    """
+
+    name = "base"
+    default_compute_type = "fp32"
+
+    def __init__(self, model_size: str = "base", compute_type: Optional[str] = None,
+                 threads: int = 0, batch_size: int = 1, word_timestamps: bool = False):
+        if model_size not in MODEL_SIZES:
+            raise ValueError(f"Unknown ASR model size '{model_size}'. Choose one of {', '.join(MODEL_SIZES)}.")
+        self.model_size = model_size
+        self.compute_type = compute_type or self.default_compute_type
+        self.threads = threads
+        self.batch_size = max(1, batch_size)
+        self.word_timestamps = word_timestamps
+        self._model: Optional[Any] = None
+
+    @property
+    def version(self) -> str:
+        """Identifies the engine/model/precision; part of the result cache key."""
+        version = f"{self.name}-{self.model_size}-{self.compute_type}"
+        return f"{version}-words" if self.word_timestamps else version
+
+    @abstractmethod
+    def load(self):
+        """Load the model (slow; done once per worker process)."""
+
+    @abstractmethod
+    def transcribe(self, audio) -> Dict:
+        """Transcribe 16 kHz mono float32 samples (see the module comment for the result)."""
+
+    def ensure_loaded(self):
+        """Load the model unless it is already loaded."""
+        if self._model is None:
+            self.load()
+
+
+class WhisperBackend(ASRBackend):
+    """
+    Reference openai-whisper (PyTorch) backend. fp16 only takes effect on
+    GPU; int8 applies PyTorch dynamic quantization to the Linear layers,
+    which is the main speed-up available on CPU-only nodes. openai-whisper
+    decodes sequentially, so batch_size is ignored.
+    """
+
+    name = "whisper"
+
+    def load(self):
+        try:
+            import whisper
+            import torch
+        except ImportError as e:
+            raise RuntimeError(
+                "The 'whisper' package is required for audio transcription. "
+                "Install it with 'pip install -U openai-whisper' or run the app in an "
+                "environment that has Whisper available.") from e
+
+        if self.threads > 0:
+            torch.set_num_threads(self.threads)
+
+        model = whisper.load_model(self.model_size)
+        if self.compute_type == "int8":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self._model = model
+
+    def transcribe(self, audio) -> Dict:
+        self.ensure_loaded()
+        result = self._model.transcribe(audio, fp16=self.compute_type == "fp16",
+                                        word_timestamps=self.word_timestamps)
+        segments = []
+        for seg in result.get("segments", []):
+            segment = {"start": float(seg["start"]), "end": float(seg["end"]), "text": seg.get("text", "")}
+            if self.word_timestamps:
+                segment["words"] = [
+                    {"word": w["word"].strip(), "start": float(w["start"]), "end": float(w["end"])}
+                    for w in seg.get("words", [])
+                ]
+            segments.append(segment)
+        return {
+            "text": result.get("text", "").strip(),
+            "segments": segments,
+        }
+
+
+class FasterWhisperBackend(ASRBackend):
+    """
+    CTranslate2-based faster-whisper backend, optimized for CPU inference
+    (int8 by default). With batch_size > 1 it uses the batched pipeline,
+    which decodes several speech segments per forward pass.
+    """
+
+    name = "faster-whisper"
+    default_compute_type = "int8"
+
+    def load(self):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise RuntimeError(
+                "The 'faster-whisper' package is required for the faster-whisper ASR backend. "
+                "Install it with 'pip install faster-whisper' or set FLUENTIQ_ASR_BACKEND=whisper.") from e
+
+        compute_type = "float16" if self.compute_type == "fp16" else \
+            "float32" if self.compute_type == "fp32" else self.compute_type
+        model = WhisperModel(
+            self.model_size,
+            device="cpu",
+            compute_type=compute_type,
+            cpu_threads=self.threads,
+        )
+        if self.batch_size > 1:
+            try:
+                from faster_whisper import BatchedInferencePipeline
+                model = BatchedInferencePipeline(model=model)
+            except ImportError:
+                # older faster-whisper: fall back to sequential decoding
+                self.batch_size = 1
+        self._model = model
+
+    def transcribe(self, audio) -> Dict:
+        self.ensure_loaded()
+        kwargs = {"batch_size": self.batch_size} if self.batch_size > 1 else {}
+        seg_iter, _info = self._model.transcribe(audio, word_timestamps=self.word_timestamps, **kwargs)
+
+        segments: List[Dict] = []
+        texts = []
+        for seg in seg_iter:
+            segment = {"start": float(seg.start), "end": float(seg.end), "text": seg.text}
+            if self.word_timestamps:
+                segment["words"] = [
+                    {"word": w.word.strip(), "start": float(w.start), "end": float(w.end)}
+                    for w in seg.words or []
+                ]
+            segments.append(segment)
+            texts.append(seg.text)
+        return {
+            "text": "".join(texts).strip(),
+            "segments": segments,
+        }
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_asr_backend(name: str, model_size: str = "base", compute_type: Optional[str] = None,
+                       threads: int = 0, batch_size: int = 1, word_timestamps: bool = False) -> ASRBackend:
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown ASR backend '{name}'. Choose one of {', '.join(BACKENDS)}.")
+    return backend_cls(model_size, compute_type, threads, batch_size, word_timestamps)
+
+
+def backend_from_config() -> ASRBackend:
+    """Build the backend selected by the FLUENTIQ_ASR_* settings (not loaded yet)."""
+    return create_asr_backend(
+        config.ASR_BACKEND,
+        model_size=config.ASR_MODEL_SIZE,
+        compute_type=config.ASR_COMPUTE_TYPE or None,
+        threads=config.ASR_THREADS,
+        batch_size=config.ASR_BATCH_SIZE,
+        word_timestamps=config.ASR_WORD_TIMESTAMPS,
+    )
@@ -0,0 +1,68 @@
+# backend/app/services/audio_extract.py
+import os
+import shutil
+import subprocess
+from typing import Optional
+
+import numpy as np
+
+from .. import config
+
+# Whisper (and every acoustic feature we compute) works on 16 kHz mono float32
+SAMPLE_RATE = 16000
+
+
+def extract_pcm(path: str, out_path: Optional[str] = None) -> str:
+    """
+    Decode the first audio stream of `path` once with ffmpeg into raw
+    16 kHz mono float32 samples and return the path of the .f32 file.
+
+    Video, subtitle and data streams are dropped at the demuxer
+    (-vn -sn -dn), so large video containers are not decoded beyond
+    their audio track. Raises RuntimeError if ffmpeg is missing or the
+    file has no decodable audio.
+    """
+    ffmpeg = shutil.which(config.FFMPEG_BINARY)
+    if ffmpeg is None:
+        raise RuntimeError(
+            f"ffmpeg ('{config.FFMPEG_BINARY}') is required to decode audio. "
+            "Install it or set FLUENTIQ_FFMPEG to its path.")
+
+    out_path = out_path or f"{path}.pcm.f32"
+    cmd = [
+        ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+        "-i", path,
+        "-map", "0:a:0", "-vn", "-sn", "-dn",
+        "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", "f32le", out_path,
+    ]
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        try:
+            os.remove(out_path)
+        except OSError:
+            pass
+        message = proc.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"Failed to decode audio: {message or 'no audio stream'}")
+    return out_path
+
+
+def load_pcm(pcm_path: str, mmap: Optional[bool] = None) -> np.ndarray:
+    """
+    Load a .f32 file written by extract_pcm. With mmap (the default, see
+    FLUENTIQ_PCM_MMAP) samples are paged in on demand and shared through
+    the page cache by every process reading the same file; copy-on-write
+    mode keeps the array writable for libraries that expect that.
+    """
+    if mmap is None:
+        mmap = config.PCM_MMAP
+    if os.path.getsize(pcm_path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    if mmap:
+        return np.memmap(pcm_path, dtype=np.float32, mode="c")
+    return np.fromfile(pcm_path, dtype=np.float32)
+
+
+def pcm_duration_seconds(pcm_path: str) -> float:
+    """Duration of a .f32 file without reading it."""
+    return os.path.getsize(pcm_path) / (4.0 * SAMPLE_RATE)
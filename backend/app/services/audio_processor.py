@@ -1,72 +1,247 @@
 # backend/app/services/audio_processor.py
-import os
 import re
-import tempfile
-from pathlib import Path
-from typing import Dict, Any, Optional
+from bisect import bisect_right
+from typing import Dict, List, Optional
 
-# Whisper is an optional heavy dependency; import lazily so the package
-# can be imported by FastAPI/UVicorn even when Whisper isn't available
-# (e.g., during static analysis or in lightweight environments).
-_whisper_model: Optional[Any] = None
+import numpy as np
 
+from .. import config
 from ..models.api_models import AudioAnalysisResponse, AudioFluencyScores, AudioStats
+from .asr_backends import ASRBackend, backend_from_config
+from .audio_extract import SAMPLE_RATE, load_pcm
+from .fillers import filler_matcher, tokenize
+from .result_cache import settings_version
 
+# The ASR engine (Whisper by default) is an optional heavy dependency; it is
+# imported and loaded lazily so the package can be imported by
+# FastAPI/UVicorn even when it isn't available (e.g., during static
+# analysis or in lightweight environments).
+_asr_backend: Optional[ASRBackend] = None
 
-def _get_whisper_model():
-    """Lazily import and load the Whisper model, caching the instance.
+# Bump when the ASR output format changes; combined with the backend
+# version (engine / model size / precision) in the result cache key
+ASR_VERSION = "pcm16k-vad-1"
 
-    Raises RuntimeError with a helpful message if the `whisper` package
-    is not installed.
+
+def _get_asr_backend() -> ASRBackend:
+    """Lazily create the configured ASR backend, caching the instance.
+
+    The model itself is loaded on first use (or by warm_up); the backend
+    raises RuntimeError with a helpful message if its engine package is
+    not installed.
+    """
+    global _asr_backend
+    if _asr_backend is None:
+        _asr_backend = backend_from_config()
+    return _asr_backend
+
+
+def asr_version() -> str:
+    """
+    Cache-key version of the configured ASR stage (does not load the model):
+    the backend version plus the VAD and chunking settings, which change
+    what is transcribed and how the pieces are stitched back together.
+    """
+    return settings_version(
+        f"{ASR_VERSION}:{_get_asr_backend().version}",
+        config.VAD_ENABLED, config.VAD_FRAME_MS, config.VAD_MARGIN_DB, config.VAD_DYNAMIC_RANGE_DB,
+        config.VAD_MIN_SILENCE_SECONDS, config.VAD_MIN_SPEECH_SECONDS,
+        config.VAD_PAD_SECONDS, config.VAD_SPACER_SECONDS,
+        config.ASR_CHUNK_MIN_SECONDS, config.ASR_CHUNK_SECONDS, config.ASR_CHUNK_OVERLAP_SECONDS,
+    )
+
+
+def warm_up():
+    """Load the ASR model ahead of the first request (worker initializer)."""
+    _get_asr_backend().ensure_loaded()
+
+
+def detect_speech_regions(audio, sample_rate: int = SAMPLE_RATE) -> List[List[float]]:
+    """
+    Energy-based voice activity detection.
+
+    Splits the signal into short frames, marks frames whose RMS level is
+    above an adaptive threshold (noise floor + margin, but never far below
+    the loudest frames) as speech, closes gaps shorter than the minimum
+    pause and drops blips shorter than the minimum speech length.
+    Returns [[start_s, end_s], ...] on the original timeline.
+    """
+    frame_len = max(1, int(sample_rate * config.VAD_FRAME_MS / 1000))
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return []
+
+    frames = np.asarray(audio[: n_frames * frame_len], dtype=np.float32).reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    level_db = 20.0 * np.log10(rms + 1e-10)
+
+    noise_floor = np.percentile(level_db, 10)
+    threshold = max(noise_floor + config.VAD_MARGIN_DB, level_db.max() - config.VAD_DYNAMIC_RANGE_DB)
+    is_speech = level_db > threshold
+
+    # run boundaries of the speech mask
+    padded = np.concatenate(([False], is_speech, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    frame_seconds = frame_len / sample_rate
+    runs = [[start * frame_seconds, end * frame_seconds] for start, end in zip(edges[::2], edges[1::2])]
+
+    regions: List[List[float]] = []
+    for start, end in runs:
+        if regions and start - regions[-1][1] < config.VAD_MIN_SILENCE_SECONDS:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+    return [
+        [round(float(start), 3), round(float(end), 3)] for start, end in regions
+        if end - start >= config.VAD_MIN_SPEECH_SECONDS
+    ]
+
+
+def _concat_speech(audio, regions: List[List[float]], sample_rate: int = SAMPLE_RATE):
+    """
+    Build the ASR input from speech regions only (padded slightly, with a
+    short silent spacer between regions so the recognizer sees a boundary).
+    Returns (samples, offsets) where offsets holds
+    (concat_start_s, orig_start_s, length_s) for mapping timestamps back.
     """
-    global _whisper_model
-    if _whisper_model is not None:
-        return _whisper_model
+    pad = config.VAD_PAD_SECONDS
+    spacer = np.zeros(int(config.VAD_SPACER_SECONDS * sample_rate), dtype=np.float32)
+    total = len(audio) / sample_rate
 
-    try:
-        import whisper
-    except ImportError as e:
-        raise RuntimeError(
-            "The 'whisper' package is required for audio transcription. "
-            "Install it with 'pip install -U openai-whisper' or run the app in an "
-            "environment that has Whisper available.") from e
+    pieces = []
+    offsets = []
+    cursor = 0.0
+    for start, end in regions:
+        orig_start = max(0.0, start - pad)
+        orig_end = min(total, end + pad)
+        piece = np.asarray(audio[int(orig_start * sample_rate): int(orig_end * sample_rate)], dtype=np.float32)
+        length = len(piece) / sample_rate
+        offsets.append((cursor, orig_start, length))
+        pieces.append(piece)
+        pieces.append(spacer)
+        cursor += length + len(spacer) / sample_rate
 
-    # Load model (this can be slow; done once per process)
-    _whisper_model = whisper.load_model("base")
-    return _whisper_model
+    if not pieces:
+        return np.zeros(0, dtype=np.float32), []
+    return np.concatenate(pieces), offsets
 
 
-def _compute_fluency_metrics(transcript: str, segments) -> Dict:
+def _to_original_time(t: float, offsets, starts: List[float]) -> float:
+    """
+    Map a timestamp on the concatenated speech-only timeline back to the
+    recording. `starts` is [o[0] for o in offsets], precomputed for bisect.
+    """
+    idx = bisect_right(starts, t) - 1
+    concat_start, orig_start, length = offsets[max(0, idx)]
+    # times inside the spacer after a region clamp to that region's end
+    return float(orig_start + min(max(0.0, t - concat_start), length))
+
+
+def word_timings(segments) -> List[Dict]:
+    """
+    Flatten the per-word timestamps of ASR segments ({"word", "start",
+    "end"}). Empty unless every segment carries words (word timestamp mode).
+    """
+    if not segments or any("words" not in seg for seg in segments):
+        return []
+    return [word for seg in segments for word in seg["words"]]
+
+
+def _compute_fluency_metrics(transcript: str, segments, speech_regions: Optional[List[List[float]]] = None) -> Dict:
     """
     Compute words-per-minute, filler count, pause ratio, and fluency score
     from the transcript and Whisper segments.
+
+    With word timestamps (FLUENTIQ_ASR_WORD_TIMESTAMPS) everything comes
+    from the word timings (see fluency_from_words). Otherwise, when the VAD
+    silence map is available (speech_regions), duration and pauses come
+    from it directly: duration spans first to last speech and pauses are
+    the silences between speech regions. Failing that they are inferred
+    from gaps between Whisper segments.
     """
-    words = re.findall(r"\w+", transcript)
-    word_count = len(words)
+    words = word_timings(segments)
+    if words:
+        return fluency_from_words(words)
 
-    # Duration from first segment start to last segment end
-    if segments:
-        start_time = segments[0]["start"]
-        end_time = segments[-1]["end"]
-        total_duration = max(0.1, end_time - start_time)
+    tokens = tokenize(transcript)
+
+    if speech_regions:
+        total_duration = max(0.1, speech_regions[-1][1] - speech_regions[0][0])
+        total_pause = sum(
+            max(0.0, curr[0] - prev[1]) for prev, curr in zip(speech_regions, speech_regions[1:])
+        )
     else:
-        total_duration = 60.0  # fallback 1 min
+        # Duration from first segment start to last segment end
+        if segments:
+            start_time = segments[0]["start"]
+            end_time = segments[-1]["end"]
+            total_duration = max(0.1, end_time - start_time)
+        else:
+            total_duration = 60.0  # fallback 1 min
 
-    # Pause time = gaps between segments
+        # Pause time = gaps between segments
+        total_pause = 0.0
+        for prev, curr in zip(segments, segments[1:]):
+            gap = curr["start"] - prev["end"]
+            if gap > 0:
+                total_pause += gap
+
+    return fluency_from_totals(tokens, total_duration, total_pause)
+
+
+def fluency_from_words(words: List[Dict]) -> Dict:
+    """
+    Fluency metrics from word timestamps in one pass over the words:
+    fillers (streamed through the filler matcher, so phrases like "you
+    know" count), pauses (gaps between consecutive words of at least
+    VAD_MIN_SILENCE_SECONDS), duration from first to last word, WPM and
+    articulation rate (words per minute of actual speaking time).
+    """
+    matcher = filler_matcher()
+    state = 0
+    position = 0
+    last_filler_end = 0
+    word_count = 0
+    filler_count = 0
     total_pause = 0.0
-    for prev, curr in zip(segments, segments[1:]):
-        gap = curr["start"] - prev["end"]
-        if gap > 0:
-            total_pause += gap
+    prev_end = None
+
+    for word in words:
+        if prev_end is not None:
+            gap = word["start"] - prev_end
+            if gap >= config.VAD_MIN_SILENCE_SECONDS:
+                total_pause += gap
+        prev_end = max(prev_end or 0.0, word["end"])
+
+        for token in tokenize(word["word"]):
+            word_count += 1
+            position += 1
+            state, length = matcher.step(state, token, limit=position - last_filler_end)
+            if length:
+                filler_count += 1
+                last_filler_end = position
+
+    total_duration = max(0.1, prev_end - words[0]["start"]) if words else 60.0
+    return _fluency_metrics(word_count, filler_count, total_duration, total_pause)
+
+
+def fluency_from_totals(words: List[str], total_duration: float, total_pause: float) -> Dict:
+    """
+    Fluency metrics and score from the words and the speech timing totals.
+    Split out of _compute_fluency_metrics so stored sessions (which keep the
+    totals, not the segments) can be re-scored with the current rules.
+    """
+    filler_count = filler_matcher().count(w.lower() for w in words)
+    return _fluency_metrics(len(words), filler_count, total_duration, total_pause)
+
 
+def _fluency_metrics(word_count: int, filler_count: int, total_duration: float, total_pause: float) -> Dict:
     # Simple metrics
     minutes = total_duration / 60.0
     wpm = word_count / minutes if minutes > 0 else 0.0
     pause_ratio = total_pause / total_duration if total_duration > 0 else 0.0
-
-    # Filler words
-    lower_words = [w.lower() for w in words]
-    filler_count = sum(lower_words.count(f) for f in ["um", "uh", "like"])
+    speaking_minutes = max(0.0, total_duration - total_pause) / 60.0
+    articulation_rate = word_count / speaking_minutes if speaking_minutes > 0 else 0.0
 
     # Fluency score heuristic
     base_score = 90
@@ -86,55 +261,191 @@ def _compute_fluency_metrics(transcript: str, segments) -> Dict:
         "duration_seconds": total_duration,
         "total_pause_seconds": total_pause,
         "wpm": wpm,
+        "articulation_rate": articulation_rate,
         "filler_count": filler_count,
         "pause_ratio": pause_ratio,
         "fluency_score": score,
     }
 
 
-async def analyze_audio_file(upload_file) -> AudioAnalysisResponse:
+def transcribe_audio(audio) -> Dict:
     """
-    Save the uploaded file, run Whisper transcription,
-    compute fluency metrics, and return a structured response.
+    Run the configured ASR backend on 16 kHz mono float32 samples and return
+    the raw output needed downstream: {"text": str, "segments": [{"start", "end", "text"}]}.
+    This is the expensive stage; its output is what the result cache stores.
     """
-    suffix = Path(upload_file.filename).suffix or ".mp4"
+    # Passing samples instead of a path stops the engine from spawning its
+    # own ffmpeg decode of the container.
+    return _get_asr_backend().transcribe(audio)
 
-    # Save to a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        contents = await upload_file.read()
-        tmp.write(contents)
-        tmp_path = tmp.name
 
-    try:
-        # Transcribe using Whisper (loaded lazily)
-        model = _get_whisper_model()
-        result = model.transcribe(tmp_path)
-        transcript = result.get("text", "").strip()
-        segments = result.get("segments", [])
+def _timed_items(segments):
+    """Segments and their word timings, for shifting timestamps in place."""
+    for seg in segments:
+        yield seg
+        yield from seg.get("words", ())
 
-        metrics = _compute_fluency_metrics(transcript, segments)
 
-        scores = AudioFluencyScores(
-            wpm=round(metrics["wpm"], 2),
-            filler_count=metrics["filler_count"],
-            pause_ratio=round(metrics["pause_ratio"], 3),
-            fluency_score=metrics["fluency_score"],
-        )
+def transcribe_speech(audio, regions: Optional[List[List[float]]] = None) -> Dict:
+    """
+    VAD pre-pass + ASR: transcribe only the detected speech regions and map
+    segment timestamps back to the original timeline. The silence map is
+    returned as "speech_regions" so pause metrics can use it directly.
+    `regions` may be passed in when VAD already ran (chunked transcription).
+    """
+    if not config.VAD_ENABLED:
+        return transcribe_audio(audio)
 
-        stats = AudioStats(
-            word_count=metrics["word_count"],
-            duration_seconds=round(metrics["duration_seconds"], 2),
-            total_pause_seconds=round(metrics["total_pause_seconds"], 2),
-        )
+    if regions is None:
+        regions = detect_speech_regions(audio)
+    if not regions:
+        return {"text": "", "segments": [], "speech_regions": []}
 
-        return AudioAnalysisResponse(
-            transcript=transcript,
-            scores=scores,
-            stats=stats,
-        )
-    finally:
-        # Clean up temp file
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
+    speech_audio, offsets = _concat_speech(audio, regions)
+    result = transcribe_audio(speech_audio)
+    starts = [o[0] for o in offsets]
+    for item in _timed_items(result["segments"]):
+        item["start"] = round(_to_original_time(item["start"], offsets, starts), 3)
+        item["end"] = round(_to_original_time(item["end"], offsets, starts), 3)
+    result["speech_regions"] = regions
+    return result
+
+
+def transcribe_pcm_file(pcm_path: str) -> Dict:
+    """Transcribe a .f32 file produced by audio_extract.extract_pcm (worker entry point)."""
+    return transcribe_speech(load_pcm(pcm_path))
+
+
+def detect_speech_regions_file(pcm_path: str) -> List[List[float]]:
+    """VAD over a whole .f32 file (empty when VAD is disabled)."""
+    if not config.VAD_ENABLED:
+        return []
+    return detect_speech_regions(load_pcm(pcm_path))
+
+
+def plan_transcription_chunks(regions: List[List[float]], duration: float) -> List[Dict]:
+    """
+    Split a long recording into ~ASR_CHUNK_SECONDS chunks for parallel ASR.
+
+    Cuts are placed in the middle of a silence (between two VAD speech
+    regions) close to the target length, so no words are split. If a
+    window has no silence, the cut is forced and neighbouring chunks
+    overlap by ASR_CHUNK_OVERLAP_SECONDS; stitching dedupes that overlap.
+
+    Each chunk is {"start", "end"} (audio window sent to ASR) and
+    {"own_start", "own_end"} (the part of the timeline whose segments it
+    keeps). The owned intervals partition the recording.
+    """
+    target = float(config.ASR_CHUNK_SECONDS)
+    overlap = float(config.ASR_CHUNK_OVERLAP_SECONDS)
+    if duration <= target * 1.25:
+        return [{"start": 0.0, "end": duration, "own_start": 0.0, "own_end": duration}]
+
+    cut_points = [(prev[1] + curr[0]) / 2.0 for prev, curr in zip(regions, regions[1:])]
+
+    chunks = []
+    own_start = 0.0
+    window_start = 0.0
+    while duration - own_start > target * 1.25:
+        lo = bisect_right(cut_points, own_start + target * 0.75)
+        hi = bisect_right(cut_points, own_start + target * 1.25)
+        candidates = cut_points[lo:hi]
+        if candidates:
+            cut = min(candidates, key=lambda c: abs(c - (own_start + target)))
+            pad = 0.0
+        else:
+            cut = own_start + target
+            pad = overlap
+        chunks.append({
+            "start": window_start,
+            "end": min(duration, cut + pad),
+            "own_start": own_start,
+            "own_end": cut,
+        })
+        own_start = cut
+        window_start = max(0.0, cut - pad)
+
+    chunks.append({"start": window_start, "end": duration, "own_start": own_start, "own_end": duration})
+    return chunks
+
+
+def transcribe_pcm_chunk(pcm_path: str, chunk: Dict, regions: List[List[float]]) -> Dict:
+    """
+    Transcribe one chunk of a .f32 file (worker entry point). Segment
+    timestamps are returned on the full recording's timeline.
+    """
+    start, end = chunk["start"], chunk["end"]
+    audio = load_pcm(pcm_path)[int(start * SAMPLE_RATE): int(end * SAMPLE_RATE)]
+
+    chunk_regions = [
+        [max(r_start, start) - start, min(r_end, end) - start]
+        for r_start, r_end in regions
+        if r_end > start and r_start < end
+    ]
+    result = transcribe_speech(audio, chunk_regions if config.VAD_ENABLED else None)
+    for item in _timed_items(result["segments"]):
+        item["start"] = round(item["start"] + start, 3)
+        item["end"] = round(item["end"] + start, 3)
+    return result
+
+
+def _normalize_segment_text(text: str) -> str:
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def stitch_chunk_transcripts(chunks: List[Dict], results: List[Dict], regions: List[List[float]]) -> Dict:
+    """
+    Merge per-chunk ASR results into one {"text", "segments", "speech_regions"}
+    result, identical in shape to a single-pass transcription.
+
+    A segment is kept only by the chunk that owns its midpoint, which drops
+    the copies produced in overlapping windows; a segment whose text repeats
+    the previous kept segment right at a boundary is dropped as well.
+    """
+    segments: List[Dict] = []
+    for i, (chunk, result) in enumerate(zip(chunks, results)):
+        last_chunk = i == len(chunks) - 1
+        for seg in result.get("segments", []):
+            mid = (seg["start"] + seg["end"]) / 2.0
+            if mid < chunk["own_start"] or (mid >= chunk["own_end"] and not last_chunk):
+                continue
+            if segments and seg["start"] < segments[-1]["end"] + config.ASR_CHUNK_OVERLAP_SECONDS \
+                    and _normalize_segment_text(seg["text"]) == _normalize_segment_text(segments[-1]["text"]):
+                continue
+            segments.append(seg)
+
+    stitched = {
+        "text": " ".join(seg["text"].strip() for seg in segments if seg["text"].strip()),
+        "segments": segments,
+    }
+    if config.VAD_ENABLED:
+        stitched["speech_regions"] = regions
+    return stitched
+
+
+def build_audio_response(asr_result: Dict) -> AudioAnalysisResponse:
+    """Compute fluency metrics from ASR output and build the audio response."""
+    transcript = asr_result.get("text", "")
+    segments = asr_result.get("segments", [])
+
+    metrics = _compute_fluency_metrics(transcript, segments, asr_result.get("speech_regions"))
+
+    scores = AudioFluencyScores(
+        wpm=round(metrics["wpm"], 2),
+        articulation_rate=round(metrics["articulation_rate"], 2),
+        filler_count=metrics["filler_count"],
+        pause_ratio=round(metrics["pause_ratio"], 3),
+        fluency_score=metrics["fluency_score"],
+    )
+
+    stats = AudioStats(
+        word_count=metrics["word_count"],
+        duration_seconds=round(metrics["duration_seconds"], 2),
+        total_pause_seconds=round(metrics["total_pause_seconds"], 2),
+    )
+
+    return AudioAnalysisResponse(
+        transcript=transcript,
+        scores=scores,
+        stats=stats,
+    )
@@ -0,0 +1,310 @@
+# backend/app/services/batch_service.py
+"""
+Batch ingestion: analyze many recordings in one go (POST /batch or
+python -m app.cli.batch DIR).
+
+Files are scheduled through the same pipeline as single uploads, at most
+BATCH_CONCURRENCY at a time, so the ASR / NLP / vision pools stay busy
+and their workers (and the models loaded in them) stay warm from one
+file to the next. Finished analyses are saved through BatchSessionWriter,
+which inserts BATCH_WRITE_SIZE sessions per transaction instead of one.
+
+Each file is tracked as a dict:
+  {"filename", "path", "upload_hash", "status": queued | running | analyzed
+   | done | failed, "session_id", "seconds", "timings", "overall", "error"}
+and the batch report summarizes them.
+"""
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .. import config
+from ..db.database import get_connection
+from .history_service import save_sessions
+from .pipeline import run_multimodal_pipeline
+from .uploads import remove_upload
+from .worker_pool import PoolBusyError
+
+FileCallback = Callable[[Dict], None]
+
+_running_batches: Dict[str, asyncio.Task] = {}
+
+
+class BatchSessionWriter:
+    """
+    Buffers finished analyses and saves them with save_sessions, one
+    transaction per `batch_size` sessions. `on_saved(file, session_id)` is
+    called for each saved file and `on_failed(file, error)` for each file
+    whose session could not be saved.
+    """
+
+    def __init__(self, batch_size: int = config.BATCH_WRITE_SIZE,
+                 on_saved: Optional[Callable[[Dict, int], None]] = None,
+                 on_failed: Optional[Callable[[Dict, Exception], None]] = None):
+        self.batch_size = max(1, batch_size)
+        self._on_saved = on_saved
+        self._on_failed = on_failed
+        self._pending: List[tuple] = []
+        self._lock = asyncio.Lock()
+
+    async def add(self, file: Dict, response: Dict):
+        self._pending.append((file, {
+            "transcript": response["transcript"],
+            "fused": response["fused"],
+            "audio": response["audio"],
+            "text": response["text"],
+            "video": response["video"],
+            "timeline": response.pop("timeline", None),
+        }))
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            results = await asyncio.to_thread(_save_entries, [entry for _, entry in pending])
+        for (file, _), result in zip(pending, results):
+            if isinstance(result, Exception):
+                if self._on_failed is not None:
+                    self._on_failed(file, result)
+            elif self._on_saved is not None:
+                self._on_saved(file, result)
+
+
+def _save_entries(entries: List[Dict]) -> List:
+    """
+    save_sessions in one transaction; if that fails, each entry on its own,
+    so one bad entry only fails itself. Returns a session id or the
+    exception per entry.
+    """
+    try:
+        return save_sessions(entries)
+    except Exception as e:
+        if len(entries) == 1:
+            return [e]
+    results = []
+    for entry in entries:
+        try:
+            results.append(save_sessions([entry])[0])
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def new_batch_file(filename: str, path: str, upload_hash: Optional[str] = None) -> Dict:
+    return {
+        "filename": filename,
+        "path": path,
+        "upload_hash": upload_hash,
+        "status": "queued",
+        "session_id": None,
+        "seconds": None,
+        "timings": None,
+        "overall": None,
+        "error": None,
+    }
+
+
+async def analyze_batch(
+    files: List[Dict],
+    on_update: Optional[FileCallback] = None,
+    concurrency: Optional[int] = None,
+    remove_after: bool = False,
+) -> Dict:
+    """
+    Analyze every queued file (see new_batch_file) and save the sessions in
+    batches. Files already done or failed are skipped, so a batch can be
+    resumed. `on_update(file)` is called whenever a file changes state.
+    remove_after deletes each upload once it is saved or failed (server
+    side uploads; the CLI leaves the user's files alone).
+
+    Returns the batch report (see batch_report).
+    """
+    t0 = time.perf_counter()
+    slots = asyncio.Semaphore(max(1, concurrency or config.BATCH_CONCURRENCY))
+
+    def _update(file: Dict, **fields):
+        file.update(fields)
+        if on_update is not None:
+            on_update(file)
+
+    def _saved(file: Dict, session_id: int):
+        _update(file, status="done", session_id=session_id)
+        if remove_after:
+            remove_upload(file["path"])
+
+    def _not_saved(file: Dict, error: Exception):
+        _update(file, status="failed", error=str(error) or error.__class__.__name__)
+        if remove_after:
+            remove_upload(file["path"])
+
+    writer = BatchSessionWriter(on_saved=_saved, on_failed=_not_saved)
+
+    async def _analyze(file: Dict):
+        async with slots:
+            started = time.perf_counter()
+            _update(file, status="running")
+            try:
+                while True:
+                    try:
+                        response = await run_multimodal_pipeline(file["path"], upload_hash=file.get("upload_hash"))
+                        break
+                    except PoolBusyError as e:
+                        # another request holds the pools; wait like background jobs do
+                        await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                _update(file, status="failed", error=str(e) or e.__class__.__name__,
+                        seconds=round(time.perf_counter() - started, 3))
+                if remove_after:
+                    remove_upload(file["path"])
+                return
+
+            notes = response.get("notes") or {}
+            _update(
+                file,
+                status="analyzed",
+                seconds=round(time.perf_counter() - started, 3),
+                timings={key[:-len("_seconds")]: float(value)
+                         for key, value in notes.items() if key.endswith("_seconds")},
+                overall=response["fused"].get("overall"),
+            )
+        await writer.add(file, response)
+
+    await asyncio.gather(*(
+        _analyze(file) for file in files if file["status"] not in ("done", "failed")
+    ))
+    await writer.flush()
+    return batch_report(files, time.perf_counter() - t0)
+
+
+def batch_report(files: List[Dict], elapsed: Optional[float] = None) -> Dict:
+    """Counts, throughput and per-file results of a batch."""
+    counts = {status: 0 for status in ("queued", "running", "analyzed", "done", "failed")}
+    for file in files:
+        counts[file["status"]] = counts.get(file["status"], 0) + 1
+    finished = counts["done"] + counts["failed"]
+    report = {
+        "total": len(files),
+        **counts,
+        "files": [{key: value for key, value in file.items() if key != "path"} for file in files],
+    }
+    if elapsed is not None:
+        report["seconds"] = round(elapsed, 3)
+        report["files_per_minute"] = round(60.0 * finished / elapsed, 2) if elapsed > 0 else 0.0
+    return report
+
+
+# --- HTTP batches (persisted like jobs so they survive a restart) ---
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _store_batch(batch_id: str, status: str, files_json: str):
+    conn = get_connection()
+    conn.execute(
+        "UPDATE batches SET status = ?, files_json = ?, updated_at = ? WHERE id = ?",
+        (status, files_json, _now(), batch_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+async def _save_batch(batch_id: str, status: str, files: List[Dict]):
+    # serialized on the loop (the files keep changing), written in a thread
+    await asyncio.to_thread(_store_batch, batch_id, status, json.dumps(files))
+
+
+def create_batch(files: List[Dict]) -> str:
+    batch_id = uuid.uuid4().hex
+    timestamp = _now()
+    conn = get_connection()
+    conn.execute(
+        "INSERT INTO batches (id, status, files_json, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+        (batch_id, "queued", json.dumps(files), timestamp, timestamp),
+    )
+    conn.commit()
+    conn.close()
+    return batch_id
+
+
+def get_batch(batch_id: str) -> Optional[Dict]:
+    conn = get_connection()
+    row = conn.execute("SELECT * FROM batches WHERE id = ?", (batch_id,)).fetchone()
+    conn.close()
+    if row is None:
+        return None
+    return {
+        "id": row["id"],
+        "status": row["status"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        **batch_report(json.loads(row["files_json"] or "[]")),
+    }
+
+
+async def _run_batch(batch_id: str, files: List[Dict]):
+    changed = asyncio.Event()
+
+    async def _save_progress():
+        # file state changes only mark the batch dirty; its file list is
+        # written at most once per BATCH_PROGRESS_SECONDS
+        while True:
+            await changed.wait()
+            changed.clear()
+            await _save_batch(batch_id, "running", files)
+            await asyncio.sleep(config.BATCH_PROGRESS_SECONDS)
+
+    progress = None
+    try:
+        await _save_batch(batch_id, "running", files)
+        progress = asyncio.get_running_loop().create_task(_save_progress())
+        try:
+            report = await analyze_batch(files, on_update=lambda _file: changed.set(), remove_after=True)
+            status = "done" if report["failed"] < report["total"] else "failed"
+        except Exception as e:
+            status = "failed"
+            for file in files:
+                if file["status"] not in ("done", "failed"):
+                    file.update(status="failed", error=str(e) or e.__class__.__name__)
+        progress.cancel()
+        await asyncio.gather(progress, return_exceptions=True)
+        await _save_batch(batch_id, status, files)
+    finally:
+        # cancelled (shutdown): the batch stays "running" and is resumed on restart
+        if progress is not None:
+            progress.cancel()
+        _running_batches.pop(batch_id, None)
+
+
+def schedule_batch(batch_id: str, files: List[Dict]):
+    """Start a batch in the background on the running event loop."""
+    if batch_id in _running_batches:
+        return
+    _running_batches[batch_id] = asyncio.get_running_loop().create_task(_run_batch(batch_id, files))
+
+
+def resume_unfinished_batches() -> int:
+    """
+    Re-schedule batches left queued or running by a previous process.
+    Files that were mid-analysis start over; finished ones are kept.
+    Returns the number resumed.
+    """
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT id, files_json FROM batches WHERE status IN ('queued', 'running') ORDER BY created_at"
+    ).fetchall()
+    conn.close()
+
+    for row in rows:
+        files = json.loads(row["files_json"] or "[]")
+        for file in files:
+            if file["status"] in ("running", "analyzed"):
+                file["status"] = "queued"
+        schedule_batch(row["id"], files)
+    return len(rows)
@@ -0,0 +1,107 @@
+# backend/app/services/fillers.py
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .. import config
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens, split the same way for transcripts and lexicon entries."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class FillerMatcher:
+    """
+    Aho–Corasick automaton over word tokens for a filler lexicon whose
+    entries may span several words ("um", "you know", "sort of").
+
+    Tokens are fed one at a time with step(), so a transcript is matched in
+    a single pass no matter how many fillers the lexicon holds. State 0 is
+    the root; each state remembers the lengths of the lexicon entries that
+    end there (directly or through its suffix links), longest first.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._lengths: List[List[int]] = [[]]
+        self.phrases = []
+        for phrase in phrases:
+            tokens = tokenize(phrase)
+            if tokens and tokens not in self.phrases:
+                self.phrases.append(tokens)
+                self._add(tokens)
+        self._link()
+
+    def _add(self, tokens: Sequence[str]):
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._lengths.append([])
+                self._goto[state][token] = nxt
+            state = nxt
+        self._lengths[state].append(len(tokens))
+
+    def _link(self):
+        # breadth-first, so a state's suffix link is final before its children need it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(token, 0)
+                self._fail[child] = link if link != child else 0
+                self._lengths[child] = sorted(set(self._lengths[child] + self._lengths[self._fail[child]]),
+                                              reverse=True)
+                queue.append(child)
+
+    def step(self, state: int, token: str, limit: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Advance the automaton by one token. Returns (new state, length in
+        tokens of the longest filler ending at this token, 0 if none).
+        With `limit`, only fillers of at most that many tokens count (those
+        that do not reach back into an earlier match).
+        """
+        while state and token not in self._goto[state]:
+            state = self._fail[state]
+        state = self._goto[state].get(token, 0)
+        lengths = self._lengths[state]
+        if limit is None:
+            return state, lengths[0] if lengths else 0
+        return state, next((length for length in lengths if length <= limit), 0)
+
+    def find(self, tokens: Iterable[str]) -> List[Tuple[int, int]]:
+        """
+        Non-overlapping filler occurrences as (start, end) token indices,
+        end exclusive. Where matches overlap, the one ending first wins
+        ("you know like" counts two fillers, "sort of" counts one); a
+        shorter filler that fits after it still counts.
+        """
+        spans = []
+        state = 0
+        last_end = 0
+        for i, token in enumerate(tokens):
+            state, length = self.step(state, token, limit=i + 1 - last_end)
+            if length:
+                spans.append((i + 1 - length, i + 1))
+                last_end = i + 1
+        return spans
+
+    def count(self, tokens: Iterable[str]) -> int:
+        return len(self.find(tokens))
+
+
+@lru_cache(maxsize=1)
+def filler_matcher() -> FillerMatcher:
+    """The matcher for the FLUENTIQ_FILLERS lexicon (built once per process)."""
+    return FillerMatcher(config.FILLER_LEXICON)
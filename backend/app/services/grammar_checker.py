@@ -0,0 +1,170 @@
+# backend/app/services/grammar_checker.py
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .. import config
+
+
+def normalize_sentence(sentence: str) -> Tuple[str, List[int]]:
+    """
+    Collapse runs of whitespace and trim, so the same phrasing with
+    different spacing shares a cache entry. Returns (normalized text,
+    index map) where index_map[i] is the offset in `sentence` of
+    normalized character i (plus one trailing entry for end offsets).
+    """
+    chars: List[str] = []
+    index_map: List[int] = []
+    pending_space = None
+    for i, ch in enumerate(sentence):
+        if ch.isspace():
+            if chars and pending_space is None:
+                pending_space = i
+            continue
+        if pending_space is not None:
+            chars.append(" ")
+            index_map.append(pending_space)
+            pending_space = None
+        chars.append(ch)
+        index_map.append(i)
+    index_map.append(index_map[-1] + 1 if index_map else 0)
+    return "".join(chars), index_map
+
+
+class GrammarChecker:
+    """
+    LanguageTool grammar checking per sentence, with memoization.
+
+    `servers` LanguageTool server instances are started in this process
+    (each language_tool_python.LanguageTool launches a local server), or
+    all requests go to the already running server at `remote_url`. Up to
+    `threads` sentences are checked at once, spread round-robin over the
+    servers. Results are cached per normalized sentence in an LRU of
+    `cache_size` entries, so repeated phrasing never reaches the server.
+    Match offsets are remapped from the sentence to the transcript.
+    """
+
+    def __init__(self, language: str = "en-US", servers: int = 1, threads: int = 4,
+                 cache_size: int = 4096, remote_url: Optional[str] = None):
+        self.language = language
+        self.servers = max(1, servers)
+        self.threads = max(1, threads)
+        self.cache_size = max(0, cache_size)
+        self.remote_url = remote_url or None
+        self._tools: List = []
+        self._next_tool = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Tuple[Dict, ...]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def _start(self):
+        with self._lock:
+            if self._tools:
+                return
+            try:
+                import language_tool_python
+            except ImportError as e:
+                raise RuntimeError(
+                    "The 'language_tool_python' package is required for grammar checking. "
+                    "Install it with 'pip install language-tool-python'.") from e
+
+            if self.remote_url:
+                tools = [language_tool_python.LanguageTool(self.language, remote_server=self.remote_url)]
+            else:
+                tools = [language_tool_python.LanguageTool(self.language) for _ in range(self.servers)]
+            self._next_tool = itertools.cycle(tools)
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="grammar")
+            self._tools = tools
+
+    def warm_up(self):
+        """Start the server(s) and run one check on each (worker initializer)."""
+        self._start()
+        for tool in self._tools:
+            tool.check("This is a warm up sentence.")
+
+    def _check_uncached(self, normalized: str) -> Tuple[Dict, ...]:
+        with self._lock:
+            tool = next(self._next_tool)
+        return tuple(
+            {
+                "offset": m.offset,
+                "length": getattr(m, "errorLength", 0),
+                "message": m.message,
+                "rule_id": getattr(m, "ruleId", ""),
+            }
+            for m in tool.check(normalized)
+        )
+
+    def _check_sentence(self, normalized: str) -> Tuple[Dict, ...]:
+        with self._lock:
+            cached = self._cache.get(normalized)
+            if cached is not None:
+                self._cache.move_to_end(normalized)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        matches = self._check_uncached(normalized)
+        if self.cache_size:
+            with self._lock:
+                self._cache[normalized] = matches
+                self._cache.move_to_end(normalized)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return matches
+
+    def check(self, text: str, sentence_spans: Sequence[Tuple[int, int]]) -> List[Dict]:
+        """
+        Check `text` sentence by sentence. sentence_spans are (start, end)
+        character offsets of the sentences in `text`. Returns matches
+        {"offset", "length", "message", "rule_id"} with offsets into `text`,
+        in transcript order.
+        """
+        self._start()
+        sentences = []
+        for start, end in sentence_spans:
+            normalized, index_map = normalize_sentence(text[start:end])
+            if normalized:
+                sentences.append((start, normalized, index_map))
+        if not sentences:
+            return []
+
+        if len(sentences) == 1:
+            results = [self._check_sentence(sentences[0][1])]
+        else:
+            results = list(self._executor.map(self._check_sentence, [s[1] for s in sentences]))
+
+        matches = []
+        for (start, normalized, index_map), sentence_matches in zip(sentences, results):
+            for m in sentence_matches:
+                begin = min(m["offset"], len(normalized))
+                finish = min(m["offset"] + m["length"], len(normalized))
+                offset = start + index_map[begin]
+                end = start + (index_map[finish - 1] + 1 if finish > begin else index_map[begin])
+                matches.append({**m, "offset": offset, "length": end - offset})
+        return matches
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "servers": len(self._tools),
+                "threads": self.threads,
+                "cache_entries": len(self._cache),
+                "cache_hits": self._hits,
+                "cache_misses": self._misses,
+            }
+
+
+def checker_from_config() -> GrammarChecker:
+    """Build the checker selected by the FLUENTIQ_GRAMMAR_* settings (servers start on first use)."""
+    return GrammarChecker(
+        language="en-US",
+        servers=config.GRAMMAR_SERVERS,
+        threads=config.GRAMMAR_THREADS,
+        cache_size=config.GRAMMAR_CACHE_SIZE,
+        remote_url=config.LANGUAGETOOL_URL,
+    )
@@ -0,0 +1,148 @@
+# backend/app/services/graph_pool.py
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class GraphPool:
+    """
+    Per-process pool of pre-initialized MediaPipe graph sets (e.g. a
+    Pose + FaceMesh pair), so requests check one out instead of paying
+    graph construction and model loading every time.
+
+    Up to `size` sets are built (lazily, or up front with fill()) and kept.
+    When all of them are checked out, acquire() waits up to `max_wait`
+    seconds for one to come back, then builds a temporary set that is
+    closed on release, so a burst never stalls indefinitely. Sets are reset
+    before going back to the pool so tracking state never leaks from one
+    video into the next. Wait times are recorded for stats().
+    """
+
+    def __init__(self, factory: Callable[[], Tuple[Any, ...]], size: int, max_wait: float = 5.0):
+        self._factory = factory
+        self.size = max(1, size)
+        self.max_wait = max(0.0, max_wait)
+        self._idle: List[Tuple[Any, ...]] = []
+        self._cond = threading.Condition()
+        self._created = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._overflow = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def fill(self):
+        """Build the remaining sets now (worker initializer / app startup)."""
+        while True:
+            with self._cond:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            graphs = self._build()
+            with self._cond:
+                self._idle.append(graphs)
+                self._cond.notify()
+
+    def _build(self) -> Tuple[Any, ...]:
+        try:
+            return self._factory()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+            raise
+
+    def acquire(self) -> Tuple[Tuple[Any, ...], float]:
+        """Check out a graph set. Returns (graphs, seconds spent waiting)."""
+        t0 = time.perf_counter()
+        build = False
+        overflow = False
+        with self._cond:
+            if not self._idle and self._created < self.size:
+                self._created += 1
+                build = True
+            elif not self._idle:
+                self._waiting += 1
+                try:
+                    self._cond.wait_for(lambda: bool(self._idle), timeout=self.max_wait)
+                finally:
+                    self._waiting -= 1
+                if not self._idle:
+                    self._overflow += 1
+                    overflow = True
+            graphs = self._idle.pop() if not build and not overflow else None
+
+            waited = time.perf_counter() - t0
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        if graphs is None:
+            graphs = self._factory() if overflow else self._build()
+            if overflow:
+                graphs = _Overflow(graphs)
+        return graphs, waited
+
+    def release(self, graphs: Tuple[Any, ...]):
+        """Return a set to the pool (temporary sets are closed instead)."""
+        if isinstance(graphs, _Overflow):
+            _close(graphs)
+            return
+        try:
+            for graph in graphs:
+                graph.reset()
+        except Exception:
+            # a graph that cannot be reset is replaced on the next acquire
+            _close(graphs)
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append(graphs)
+            self._cond.notify()
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "overflow": self._overflow,
+                "wait_seconds_total": round(self._wait_total, 3),
+                "wait_seconds_avg": round(self._wait_total / self._checkouts, 4) if self._checkouts else 0.0,
+                "wait_seconds_max": round(self._wait_max, 3),
+            }
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for graphs in idle:
+            _close(graphs)
+
+
+def combine_stats(stats: Iterable[Dict[str, float]]) -> Dict[str, float]:
+    """Totals of several pools' stats() (e.g. one per vision worker process)."""
+    stats = list(stats)
+    combined: Dict[str, float] = {"pools": len(stats)}
+    for key in ("size", "created", "idle", "waiting", "checkouts", "overflow"):
+        combined[key] = sum(s[key] for s in stats)
+    wait_total = sum(s["wait_seconds_total"] for s in stats)
+    combined["wait_seconds_total"] = round(wait_total, 3)
+    combined["wait_seconds_avg"] = round(wait_total / combined["checkouts"], 4) if combined["checkouts"] else 0.0
+    combined["wait_seconds_max"] = max((s["wait_seconds_max"] for s in stats), default=0.0)
+    return combined
+
+
+class _Overflow(tuple):
+    """Marks a temporary graph set built because the pool was exhausted."""
+
+
+def _close(graphs: Optional[Tuple[Any, ...]]):
+    for graph in graphs or ():
+        try:
+            graph.close()
+        except Exception:
+            pass
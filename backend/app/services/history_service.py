@@ -1,64 +1,229 @@
+import asyncio
 import json
+import sqlite3
 from datetime import datetime
 
+from .. import config
 from ..db.database import get_connection
+from .rollups import apply_to_rollups, summary_from_rollups, trends_from_rollups
+from .timeline import load_timeline, save_timeline
 
-def save_session(transcript, fused, audio, text, video):
-    conn = get_connection()
-    cur = conn.cursor()
 
+def _entry(transcript, fused, audio, text, video, timeline):
+    return {
+        "transcript": transcript,
+        "fused": fused,
+        "audio": audio,
+        "text": text,
+        "video": video,
+        "timeline": timeline,
+    }
+
+
+def save_session(transcript, fused, audio, text, video, timeline=None):
+    """
+    Insert one analysis into the history. `timeline` (per-frame / per-segment
+    columns from the pipeline) is written to its own file and referenced
+    from the row. Commits directly: with WAL a commit takes well under a
+    millisecond, and the busy timeout covers concurrent writers.
+    """
+    return save_sessions([_entry(transcript, fused, audio, text, video, timeline)])[0]
+
+
+async def save_session_async(transcript, fused, audio, text, video, timeline=None):
+    """save_session for the event loop: runs in a thread so the loop is not blocked."""
+    return await asyncio.to_thread(save_session, transcript, fused, audio, text, video, timeline)
+
+
+def save_sessions(entries):
+    """
+    Insert several analyses (dicts with the save_session arguments) in one
+    transaction, then write their timelines. Returns the new session ids in
+    order. Timeline failures do not fail the call: the rows are committed
+    by then (see save_timelines).
+    """
+    session_ids = insert_sessions(entries)
+    save_timelines(entries, session_ids)
+    return session_ids
+
+
+def insert_sessions(entries):
+    """Insert the sessions rows (and their rollups) in one transaction; returns their ids."""
     timestamp = datetime.utcnow().isoformat()
+    session_ids = []
+
+    rows = []
+    for entry in entries:
+        fused = entry["fused"]
+        video = entry.get("video")
+        rows.append({
+            "timestamp": timestamp,
+            "transcript": entry["transcript"],
+            "fluency": fused.get("fluency"),
+            "grammar": fused.get("grammar"),
+            "coherence": fused.get("coherence"),
+            "readability": fused.get("readability"),
+            "posture": fused.get("video", {}).get("posture") if video else None,
+            "gaze": fused.get("video", {}).get("gaze") if video else None,
+            "movement": fused.get("video", {}).get("movement") if video else None,
+            "overall": fused.get("overall"),
+            "audio_json": json.dumps(entry["audio"]),
+            "text_json": json.dumps(entry["text"]),
+            "video_json": json.dumps(video) if video else None,
+            "fused_json": json.dumps(fused),
+        })
+
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        for row in rows:
+            cur.execute(f"""
+                INSERT INTO sessions ({", ".join(row)})
+                VALUES ({", ".join("?" for _ in row)})
+            """, tuple(row.values()))
+            session_ids.append(cur.lastrowid)
+        # the summary / trend aggregates change in the same transaction
+        apply_to_rollups(cur, rows)
+        conn.commit()
+    finally:
+        conn.close()
+    return session_ids
+
+
+def save_timelines(entries, session_ids):
+    """
+    Write the timeline file of each saved session that has one and record
+    its path. Runs after the insert commit so compressing them does not
+    hold the write lock. Best effort: the timeline is auxiliary, so a
+    session whose file cannot be written (or recorded) simply has none.
+    """
+    timeline_paths = []
+    for entry, session_id in zip(entries, session_ids):
+        if entry.get("timeline") is None:
+            continue
+        try:
+            timeline_paths.append((save_timeline(session_id, entry["timeline"]), session_id))
+        except Exception:
+            continue
+    if not timeline_paths:
+        return
+
+    conn = None
+    try:
+        conn = get_connection()
+        for path, session_id in timeline_paths:
+            try:
+                conn.execute("UPDATE sessions SET timeline_path = ? WHERE id = ?", (path, session_id))
+            except sqlite3.Error:
+                continue
+        conn.commit()
+    except sqlite3.Error:
+        pass
+    finally:
+        if conn is not None:
+            conn.close()
+
 
-    cur.execute("""
-        INSERT INTO sessions (
-            timestamp, transcript,
-            fluency, grammar, coherence, readability,
-            posture, gaze, movement, overall,
-            audio_json, text_json, video_json, fused_json
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        timestamp,
-        transcript,
-        fused.get("fluency"),
-        fused.get("grammar"),
-        fused.get("coherence"),
-        fused.get("readability"),
-        fused.get("video", {}).get("posture") if video else None,
-        fused.get("video", {}).get("gaze") if video else None,
-        fused.get("video", {}).get("movement") if video else None,
-        fused.get("overall"),
-        json.dumps(audio),
-        json.dumps(text),
-        json.dumps(video) if video else None,
-        json.dumps(fused)
-    ))
-
-    conn.commit()
+def get_session_timeline(session_id):
+    """Timeline columns of a session, or None if it has none (older sessions)."""
+    conn = get_connection()
+    row = conn.execute("SELECT timeline_path FROM sessions WHERE id = ?", (session_id,)).fetchone()
     conn.close()
+    if row is None or not row["timeline_path"]:
+        return None
+    try:
+        return load_timeline(row["timeline_path"])
+    except OSError:
+        return None
+
+
+# columns of the history list: scores and timestamp, no transcript or JSON blobs
+LIST_COLUMNS = (
+    "id", "timestamp", "fluency", "grammar", "coherence", "readability",
+    "posture", "gaze", "movement", "overall",
+)
+
 
+def _range_filter(since=None, until=None):
+    """WHERE clauses / params for an optional [since, until) timestamp range (ISO strings)."""
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("timestamp < ?")
+        params.append(until)
+    return clauses, params
+
+
+def list_sessions(limit=config.HISTORY_PAGE_SIZE, cursor=None, since=None, until=None):
+    """
+    One page of the history, newest first, with only LIST_COLUMNS. Keyset
+    pagination: pass the returned next_cursor (the last id of the page) to
+    get the following page, so deep pages cost the same as the first.
+    Returns {"items": [...], "next_cursor": int or None}.
+    """
+    clauses, params = _range_filter(since, until)
+    if cursor is not None:
+        clauses.append("id < ?")
+        params.append(cursor)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
 
-def get_all_sessions():
     conn = get_connection()
-    cur = conn.cursor()
-    rows = cur.execute("SELECT * FROM sessions ORDER BY id DESC").fetchall()
+    rows = conn.execute(
+        f"SELECT {', '.join(LIST_COLUMNS)} FROM sessions {where} ORDER BY id DESC LIMIT ?",
+        params + [limit + 1],
+    ).fetchall()
     conn.close()
 
-    return [dict(row) for row in rows]
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = items[-1]["id"] if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def get_session(session_id):
+    """Full row of one session (transcript and JSON blobs included), or None."""
+    conn = get_connection()
+    row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+    conn.close()
+    return dict(row) if row is not None else None
+
+
+def iter_sessions(since=None, until=None, batch_size=config.HISTORY_EXPORT_BATCH):
+    """
+    Yield full session rows, oldest first, reading batch_size rows per
+    query (keyset on id) so an export never holds the whole history in
+    memory or keeps a connection checked out between batches.
+    """
+    last_id = 0
+    while True:
+        clauses, params = _range_filter(since, until)
+        clauses.append("id > ?")
+        params.append(last_id)
+        conn = get_connection()
+        rows = conn.execute(
+            f"SELECT * FROM sessions WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?",
+            params + [batch_size],
+        ).fetchall()
+        conn.close()
+        if not rows:
+            return
+        for row in rows:
+            yield dict(row)
+        last_id = rows[-1]["id"]
 
 
 def get_summary():
+    """Average scores and session count, read from the running rollups (no table scan)."""
     conn = get_connection()
-    cur = conn.cursor()
-
-    rows = cur.execute("""
-        SELECT 
-            AVG(fluency) AS avg_fluency,
-            AVG(grammar) AS avg_grammar,
-            AVG(posture) AS avg_posture,
-            AVG(overall) AS avg_overall,
-            COUNT(*) AS total_sessions
-        FROM sessions
-    """).fetchone()
+    summary = summary_from_rollups(conn.cursor())
+    conn.close()
+    return summary
+
 
+def get_trends(bucket="week", periods=12, window=4):
+    """Per-day or per-week score averages, moving averages and slopes (see rollups.trends_from_rollups)."""
+    conn = get_connection()
+    trends = trends_from_rollups(conn.cursor(), bucket, periods, window)
     conn.close()
-    return dict(rows)
+    return trends
@@ -0,0 +1,238 @@
+# backend/app/services/job_service.py
+import asyncio
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .. import config
+from ..db.database import get_connection
+from .history_service import save_session_async
+from .pipeline import run_multimodal_pipeline
+from .uploads import remove_upload
+from .worker_pool import PoolBusyError
+
+# Stages reported in a job's progress, in display order
+JOB_STAGES = ["audio", "text", "video", "fusion"]
+
+_job_slots: Optional[asyncio.Semaphore] = None
+_running_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def create_job(filename: str, upload_path: str) -> str:
+    job_id = uuid.uuid4().hex
+    timestamp = _now()
+
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        INSERT INTO jobs (
+            id, status, filename, upload_path, progress_json,
+            created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (
+        job_id,
+        "queued",
+        filename,
+        upload_path,
+        json.dumps({stage: 0.0 for stage in JOB_STAGES}),
+        timestamp,
+        timestamp,
+    ))
+    conn.commit()
+    conn.close()
+    return job_id
+
+
+def update_job_progress(job_id: str, stage: str, percent: float):
+    """
+    Record progress for one stage. Safe to call from worker processes:
+    json_set updates a single key atomically, so the audio and video
+    branches can report concurrently without overwriting each other.
+    """
+    _store_progress(job_id, {stage: percent})
+
+
+def _store_progress(job_id: str, progress: Dict[str, float]):
+    conn = get_connection()
+    cur = conn.cursor()
+    for stage, percent in progress.items():
+        cur.execute("""
+            UPDATE jobs
+            SET progress_json = json_set(COALESCE(progress_json, '{}'), '$.' || ?, ?),
+                updated_at = ?
+            WHERE id = ?
+        """, (stage, float(percent), _now(), job_id))
+    conn.commit()
+    conn.close()
+
+
+class JobProgress:
+    """
+    Progress callback `(stage, percent)` of one job. It is picklable, so
+    the vision worker reports through it too and, having no event loop,
+    writes directly. On the event loop it only records the value: one
+    background task at a time writes the latest values in a thread, so the
+    loop never waits on SQLite and a stage's updates stay in order.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._pending: Dict[str, float] = {}
+        self._writer: Optional[asyncio.Task] = None
+
+    def __reduce__(self):
+        return JobProgress, (self.job_id,)
+
+    def __call__(self, stage: str, percent: float):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            update_job_progress(self.job_id, stage, percent)
+            return
+        self._pending[stage] = percent
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._write())
+
+    async def _write(self):
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(_store_progress, self.job_id, pending)
+            except sqlite3.Error:
+                pass  # progress is advisory; the final state is written separately
+
+    async def flush(self):
+        """Wait until the recorded progress is written."""
+        if self._writer is not None:
+            await self._writer
+
+
+def _set_job_state(job_id: str, status: str, **fields):
+    columns = ["status = ?", "updated_at = ?"]
+    values = [status, _now()]
+    for name, value in fields.items():
+        columns.append(f"{name} = ?")
+        values.append(value)
+    values.append(job_id)
+
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(f"UPDATE jobs SET {', '.join(columns)} WHERE id = ?", values)
+    conn.commit()
+    conn.close()
+
+
+def _format_progress(progress: Dict[str, float]) -> str:
+    return ", ".join(
+        f"{stage} {int(round(progress.get(stage, 0.0)))}%" for stage in JOB_STAGES
+    )
+
+
+def get_job(job_id: str, include_result: bool = False) -> Optional[Dict]:
+    conn = get_connection()
+    cur = conn.cursor()
+    row = cur.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    conn.close()
+    if row is None:
+        return None
+
+    progress = json.loads(row["progress_json"] or "{}")
+    job = {
+        "id": row["id"],
+        "status": row["status"],
+        "filename": row["filename"],
+        "progress": progress,
+        "progress_text": _format_progress(progress),
+        "session_id": row["session_id"],
+        "error": row["error"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+    if include_result:
+        job["result"] = json.loads(row["result_json"]) if row["result_json"] else None
+    return job
+
+
+def _get_unfinished_jobs() -> List[Dict]:
+    conn = get_connection()
+    cur = conn.cursor()
+    rows = cur.execute("""
+        SELECT id, upload_path FROM jobs
+        WHERE status IN ('queued', 'running')
+        ORDER BY created_at
+    """).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+async def _run_job(job_id: str, upload_path: str):
+    global _job_slots
+    if _job_slots is None:
+        _job_slots = asyncio.Semaphore(max(1, config.JOB_CONCURRENCY))
+
+    async with _job_slots:
+        await asyncio.to_thread(_set_job_state, job_id, "running")
+        progress = JobProgress(job_id)
+        try:
+            while True:
+                try:
+                    result = await run_multimodal_pipeline(upload_path, progress)
+                    break
+                except PoolBusyError as e:
+                    # jobs wait for capacity instead of failing like sync requests
+                    await asyncio.sleep(e.retry_after)
+
+            session_id = await save_session_async(
+                transcript=result["transcript"],
+                fused=result["fused"],
+                audio=result["audio"],
+                text=result["text"],
+                video=result["video"],
+                timeline=result.pop("timeline", None)
+            )
+            await progress.flush()
+            await asyncio.to_thread(
+                _set_job_state, job_id, "done",
+                result_json=json.dumps(result),
+                session_id=session_id,
+            )
+        except asyncio.CancelledError:
+            # shutting down: keep the upload so the job resumes on next start
+            raise
+        except Exception as e:
+            await progress.flush()
+            await asyncio.to_thread(_set_job_state, job_id, "failed", error=str(e) or e.__class__.__name__)
+        finally:
+            _running_tasks.pop(job_id, None)
+        # done or failed: the upload is no longer needed
+        remove_upload(upload_path)
+
+
+def schedule_job(job_id: str, upload_path: str):
+    """Start a job in the background on the running event loop."""
+    if job_id in _running_tasks:
+        return
+    _running_tasks[job_id] = asyncio.get_running_loop().create_task(_run_job(job_id, upload_path))
+
+
+def resume_unfinished_jobs() -> int:
+    """
+    Re-schedule jobs left queued or running by a previous process.
+    Jobs whose upload is gone are marked failed. Returns the number resumed.
+    """
+    resumed = 0
+    for job in _get_unfinished_jobs():
+        if job["upload_path"] and os.path.exists(job["upload_path"]):
+            _set_job_state(job["id"], "queued")
+            schedule_job(job["id"], job["upload_path"])
+            resumed += 1
+        else:
+            _set_job_state(job["id"], "failed", error="Upload was lost before the job could run.")
+    return resumed
@@ -0,0 +1,423 @@
+# backend/app/services/live_session.py
+"""
+Live rehearsal analysis over a WebSocket (/ws/live).
+
+Client -> server messages:
+  binary                        audio samples, mono, encoding/rate from "start"
+                                (default 16-bit little-endian PCM at 16 kHz)
+  {"type": "start", "sample_rate": 16000, "encoding": "pcm_s16le" | "f32le"}
+  {"type": "frame", "data": "<base64 JPEG>"}   optional camera frames
+  {"type": "end"}               finish, persist the session, close
+                                (a disconnect without "end" saves the rolling result)
+
+Server -> client messages:
+  {"type": "ready"}
+  {"type": "partial", "elapsed_seconds", "transcript", "audio": {...}, "video": {...}}
+  {"type": "busy", "pool"}      an update was skipped because a pool is full
+  {"type": "final", "session_id", "result": {...}}
+  {"type": "error", "detail"}   unusable message or failed update (the session
+                                goes on), or followed by a close (1008 for invalid
+                                "start" parameters, 1011 for server errors)
+"""
+import asyncio
+import base64
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .. import config
+from .audio_extract import SAMPLE_RATE
+from .audio_processor import _compute_fluency_metrics, detect_speech_regions, transcribe_speech, build_audio_response
+from .history_service import save_session_async
+from .pipeline import assemble_response, transcribe_pcm
+from .text_processor import analyze_text
+from .timeline import build_timeline
+from .uploads import remove_upload
+from .worker_pool import PoolBusyError, asr_pool, nlp_pool
+
+logger = logging.getLogger(__name__)
+
+
+class MessageError(ValueError):
+    """A client message that cannot be used; reported, and the session goes on."""
+
+
+# accepted "start" parameters; rates outside this range are almost
+# certainly a client bug (and tiny ones would blow up the resampling)
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 192000
+ENCODINGS = ("pcm_s16le", "f32le")
+
+
+class LiveSession:
+    """
+    State of one live stream: the audio received so far, the incremental
+    transcript and the per-frame video features.
+
+    Transcription is incremental: each update transcribes only audio after
+    the last committed segment (at most LIVE_WINDOW_SECONDS of it). Segments
+    that end well before the live edge are committed; the tail stays
+    tentative and is re-transcribed next time with more context.
+    """
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.sample_rate = SAMPLE_RATE
+        self.encoding = "pcm_s16le"
+        self._pcm = bytearray()          # float32 samples at 16 kHz
+        self._send_lock = asyncio.Lock()
+        self.started = time.perf_counter()
+
+        self.committed_segments: List[Dict] = []
+        self.committed_until = 0.0
+        self.tentative_segments: List[Dict] = []
+
+        self.shoulder_tilts: List[float] = []
+        self.gaze_contacts: List[int] = []
+        self.movements: List[float] = []
+        # aligned with shoulder_tilts, for the session timeline
+        self.frame_times: List[float] = []
+        self.frame_movements: List[float] = []
+        self._prev_nose = None
+        self._graphs = None
+        self._last_frame_at = 0.0
+        self._frame_task: Optional[asyncio.Task] = None
+        self._update_task: Optional[asyncio.Task] = None
+        self.session_id: Optional[int] = None
+
+    # --- audio ---------------------------------------------------------
+
+    def _samples(self) -> np.ndarray:
+        return np.frombuffer(self._pcm, dtype=np.float32)
+
+    @property
+    def seconds_received(self) -> float:
+        return len(self._pcm) / (4.0 * SAMPLE_RATE)
+
+    def configure(self, payload: Dict):
+        """Apply a "start" message; raises ValueError for an unusable rate or encoding."""
+        try:
+            sample_rate = int(payload.get("sample_rate", SAMPLE_RATE))
+        except (TypeError, ValueError):
+            raise ValueError("sample_rate must be an integer.")
+        if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"sample_rate must be between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE} Hz.")
+        encoding = payload.get("encoding", "pcm_s16le")
+        if encoding not in ENCODINGS:
+            raise ValueError(f"encoding must be one of {', '.join(ENCODINGS)}.")
+        self.sample_rate = sample_rate
+        self.encoding = encoding
+
+    def add_audio(self, data: bytes):
+        if self.encoding == "f32le":
+            samples = np.frombuffer(data, dtype="<f4").astype(np.float32)
+        else:
+            samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        if self.sample_rate != SAMPLE_RATE and len(samples) > 1:
+            n_out = int(round(len(samples) * SAMPLE_RATE / self.sample_rate))
+            samples = np.interp(
+                np.linspace(0, len(samples) - 1, n_out), np.arange(len(samples)), samples
+            ).astype(np.float32)
+        self._pcm.extend(samples.tobytes())
+
+        max_bytes = int(config.LIVE_MAX_SECONDS * SAMPLE_RATE * 4)
+        if len(self._pcm) > max_bytes:
+            raise ValueError(f"Live sessions are limited to {config.LIVE_MAX_SECONDS} seconds.")
+
+    async def _transcribe_increment(self):
+        now = self.seconds_received
+        start = self.committed_until
+        end = min(now, start + config.LIVE_WINDOW_SECONDS)
+        if end - start < 1.0:
+            return
+
+        samples = np.array(self._samples()[int(start * SAMPLE_RATE): int(end * SAMPLE_RATE)])
+        result = await asr_pool.submit(transcribe_speech, samples)
+        segments = [
+            {"start": seg["start"] + start, "end": seg["end"] + start, "text": seg["text"]}
+            for seg in result.get("segments", [])
+        ]
+
+        if end < now:
+            # falling behind the live edge: commit the whole slice
+            stable, tentative = segments, []
+            self.committed_until = end
+        else:
+            edge = end - config.LIVE_TAIL_SECONDS
+            stable = [seg for seg in segments if seg["end"] <= edge]
+            tentative = [seg for seg in segments if seg["end"] > edge]
+            if stable:
+                self.committed_until = stable[-1]["end"]
+            elif not segments:
+                # silence: no need to look at it again
+                self.committed_until = max(start, edge)
+        self.committed_segments.extend(stable)
+        self.tentative_segments = tentative
+
+    def _rolling_audio_metrics(self) -> Dict:
+        """Fluency metrics over the last LIVE_WINDOW_SECONDS of the stream."""
+        now = self.seconds_received
+        window_start = max(0.0, now - config.LIVE_WINDOW_SECONDS)
+        segments = [
+            seg for seg in self.committed_segments + self.tentative_segments
+            if seg["end"] >= window_start
+        ]
+        window = self._samples()[int(window_start * SAMPLE_RATE):]
+        regions = [
+            [r_start + window_start, r_end + window_start]
+            for r_start, r_end in detect_speech_regions(window)
+        ] if config.VAD_ENABLED else None
+
+        transcript = " ".join(seg["text"].strip() for seg in segments)
+        metrics = _compute_fluency_metrics(transcript, segments, regions)
+        return {
+            "wpm": round(metrics["wpm"], 2),
+            "filler_count": metrics["filler_count"],
+            "pause_ratio": round(metrics["pause_ratio"], 3),
+            "fluency_score": metrics["fluency_score"],
+        }
+
+    # --- video ---------------------------------------------------------
+
+    def _process_frame(self, jpeg: bytes):
+        # imported here so audio-only sessions never load OpenCV / MediaPipe
+        import cv2
+        from .video_processor import analyze_frame, graph_pool
+
+        frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return
+        if self._graphs is None:
+            # held for the whole session so pose/face tracking carries across frames
+            self._graphs, _wait = graph_pool.acquire()
+        pose, face_mesh = self._graphs
+
+        tilt_deg, gaze, nose_pt = analyze_frame(pose, face_mesh, frame)
+        self.shoulder_tilts.append(tilt_deg)
+        self.gaze_contacts.append(gaze)
+        self.frame_times.append(self.seconds_received)
+        movement = float("nan")
+        if nose_pt is not None:
+            if self._prev_nose is not None:
+                movement = float(np.linalg.norm(np.array(nose_pt) - np.array(self._prev_nose)))
+                self.movements.append(movement)
+            self._prev_nose = nose_pt
+        self.frame_movements.append(movement)
+
+    def add_frame(self, data_b64: str):
+        """Analyze a frame unless one is still running or it comes too soon (frame rate cap)."""
+        now = time.perf_counter()
+        if self._frame_task is not None and not self._frame_task.done():
+            return
+        if now - self._last_frame_at < 1.0 / max(0.1, config.LIVE_FRAME_HZ):
+            return
+        try:
+            jpeg = base64.b64decode(data_b64, validate=True)
+        except (TypeError, ValueError):
+            raise MessageError("Frame data must be base64-encoded JPEG.")
+        self._last_frame_at = now
+        # MediaPipe runs in native code, so a thread keeps the event loop free
+        self._frame_task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._process_frame, jpeg))
+
+    def _video_summary(self) -> Optional[Dict]:
+        if not self.shoulder_tilts:
+            return None
+        from .video_processor import summarize_video
+        return summarize_video(
+            self.shoulder_tilts, self.gaze_contacts, self.movements,
+            duration=self.seconds_received, frames_analyzed=len(self.shoulder_tilts),
+        )
+
+    # --- messaging -----------------------------------------------------
+
+    async def send(self, message: Dict):
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(message))
+
+    async def _update(self):
+        try:
+            await self._transcribe_increment()
+        except PoolBusyError as e:
+            await self.send({"type": "busy", "pool": e.pool_name})
+            return
+        except Exception:
+            # e.g. a crashed ASR worker: tell the client and try again next tick
+            logger.exception("live update failed")
+            await self.send({"type": "error", "detail": "Live update failed; retrying."})
+            return
+
+        video = self._video_summary()
+        await self.send({
+            "type": "partial",
+            "elapsed_seconds": round(self.seconds_received, 2),
+            "transcript": " ".join(
+                seg["text"].strip() for seg in self.committed_segments + self.tentative_segments
+            ),
+            "audio": self._rolling_audio_metrics(),
+            "video": video["scores"] if video else None,
+        })
+
+    def maybe_update(self):
+        """Start a partial update unless the previous one is still running."""
+        if self._update_task is None or self._update_task.done():
+            self._update_task = asyncio.get_running_loop().create_task(self._update())
+
+    async def _wait_for_tasks(self):
+        for task in (self._update_task, self._frame_task):
+            if task is not None:
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def finalize(self) -> Dict:
+        """
+        Re-transcribe the whole stream in one pass (chunked if long) for a
+        result as good as an upload's, then analyze, fuse and save it.
+        """
+        await self._wait_for_tasks()
+
+        fd, pcm_path = tempfile.mkstemp(suffix=".pcm.f32")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._pcm)
+            asr_result = await _retry_when_busy(lambda: transcribe_pcm(pcm_path))
+        finally:
+            remove_upload(pcm_path)
+        return await self._analyze_and_save(asr_result)
+
+    async def save_rolling(self) -> Optional[int]:
+        """
+        The client went away without "end": save the session from the
+        rolling transcript (no final re-transcription, nobody is waiting for
+        it). Returns the session id, or None if nothing was transcribed yet.
+        """
+        await self._wait_for_tasks()
+        if self.session_id is not None:
+            return self.session_id
+        segments = self.committed_segments + self.tentative_segments
+        if not segments:
+            return None
+        asr_result = {
+            "text": " ".join(seg["text"].strip() for seg in segments if seg["text"].strip()),
+            "segments": segments,
+        }
+        if config.VAD_ENABLED:
+            asr_result["speech_regions"] = detect_speech_regions(self._samples())
+        return (await self._analyze_and_save(asr_result))["session_id"]
+
+    async def _analyze_and_save(self, asr_result: Dict) -> Dict:
+        audio_dict = build_audio_response(asr_result).dict()
+        text_dict = await _retry_when_busy(lambda: nlp_pool.submit(analyze_text, audio_dict["transcript"]))
+        video_result = self._video_summary()
+
+        response = assemble_response(audio_dict, text_dict, video_result, pipeline="live stream -> fusion")
+        session_id = await save_session_async(
+            transcript=response["transcript"],
+            fused=response["fused"],
+            audio=response["audio"],
+            text=response["text"],
+            video=response["video"],
+            timeline=build_timeline(
+                asr_result.get("segments", []),
+                frame_times=self.frame_times,
+                tilts=self.shoulder_tilts,
+                gazes=self.gaze_contacts,
+                movements=self.frame_movements,
+                duration=self.seconds_received,
+            ),
+        )
+        self.session_id = session_id
+        return {"session_id": session_id, "result": response}
+
+    def close(self):
+        if self._graphs is not None:
+            from .video_processor import graph_pool
+            graph_pool.release(self._graphs)
+            self._graphs = None
+
+
+async def _retry_when_busy(make_call):
+    # finalizing must not lose the rehearsal, so wait for capacity
+    while True:
+        try:
+            return await make_call()
+        except PoolBusyError as e:
+            await asyncio.sleep(min(e.retry_after, 5))
+
+
+def _parse_message(text: str) -> Dict:
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        raise MessageError("Messages must be JSON.")
+    if not isinstance(payload, dict):
+        raise MessageError("Messages must be JSON objects.")
+    return payload
+
+
+async def _handle_text(session: "LiveSession", text: str) -> bool:
+    """Handle one JSON message; returns True once the session is finished."""
+    payload = _parse_message(text)
+    kind = payload.get("type")
+    if kind == "start":
+        session.configure(payload)
+    elif kind == "frame" and payload.get("data"):
+        session.add_frame(payload["data"])
+    elif kind == "end":
+        final = await session.finalize()
+        await session.send({"type": "final", **final})
+        await session.websocket.close()
+        return True
+    return False
+
+
+async def run_live_session(websocket):
+    """Drive one /ws/live connection until the client sends "end" or disconnects."""
+    await websocket.accept()
+    session = LiveSession(websocket)
+    await session.send({"type": "ready"})
+    last_update = time.perf_counter()
+
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout=config.LIVE_UPDATE_SECONDS)
+            except asyncio.TimeoutError:
+                message = None
+
+            if message is not None:
+                if message["type"] == "websocket.disconnect":
+                    await session.save_rolling()
+                    return
+                try:
+                    if message.get("bytes") is not None:
+                        session.add_audio(message["bytes"])
+                    elif message.get("text") is not None and await _handle_text(session, message["text"]):
+                        return
+                except MessageError as e:
+                    await session.send({"type": "error", "detail": str(e)})
+
+            if time.perf_counter() - last_update >= config.LIVE_UPDATE_SECONDS:
+                last_update = time.perf_counter()
+                session.maybe_update()
+    except Exception as e:
+        # bad "start" parameters or too long a stream (ValueError) are the
+        # client's problem; anything else is ours. Either way keep what was
+        # rehearsed so far before closing.
+        client_error = isinstance(e, ValueError)
+        if not client_error:
+            logger.exception("live session failed")
+        try:
+            await session.save_rolling()
+        except Exception:
+            logger.exception("could not save the live session")
+        try:
+            await session.send({"type": "error", "detail": str(e) if client_error else "Live session failed."})
+            await websocket.close(code=1008 if client_error else 1011)
+        except Exception:
+            pass  # the client is already gone
+    finally:
+        session.close()
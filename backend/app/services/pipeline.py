@@ -0,0 +1,312 @@
+# backend/app/services/pipeline.py
+import asyncio
+import time
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
+
+from .. import config
+from .audio_extract import extract_pcm, pcm_duration_seconds
+from .audio_processor import (
+    asr_version,
+    build_audio_response,
+    detect_speech_regions_file,
+    plan_transcription_chunks,
+    stitch_chunk_transcripts,
+    transcribe_pcm_chunk,
+    transcribe_pcm_file,
+)
+from .text_processor import TEXT_ANALYZER_VERSION, analyze_text
+from .video_processor import (
+    VIDEO_ANALYZER_VERSION,
+    VIDEO_LANDMARKS_VERSION,
+    extract_video_features,
+    frame_features,
+    frame_movements,
+    merge_video_features,
+    plan_video_shards,
+    probe_video,
+    summarize_features,
+)
+from .fusion import fuse_audio_text_video
+from .result_cache import result_cache, file_sha256, text_sha256
+from .timeline import build_timeline
+from .uploads import remove_upload
+from .worker_pool import PoolBusyError, asr_pool, nlp_pool, record_worker_graph_stats, vision_pool
+from ..models.api_models import MultimodalStats
+
+
+ProgressCallback = Callable[[str, float], None]
+
+
+def _report(progress: Optional[ProgressCallback], stage: str, percent: float):
+    if progress is not None:
+        progress(stage, percent)
+
+
+async def transcribe_pcm(pcm_path: str, progress: Optional[ProgressCallback] = None) -> Dict:
+    """
+    Transcribe decoded PCM on the ASR pool. Long recordings are split at
+    silences into chunks that run in parallel across the ASR workers and
+    are stitched back into one result with the same shape.
+    """
+    duration = pcm_duration_seconds(pcm_path)
+    if duration < config.ASR_CHUNK_MIN_SECONDS:
+        return await asr_pool.submit(transcribe_pcm_file, pcm_path)
+
+    regions = await asyncio.to_thread(detect_speech_regions_file, pcm_path)
+    chunks = plan_transcription_chunks(regions, duration)
+
+    finished = 0
+
+    def _chunk_done():
+        nonlocal finished
+        finished += 1
+        _report(progress, "audio", round(100.0 * finished / len(chunks), 1))
+
+    results = await asr_pool.submit_many(
+        transcribe_pcm_chunk,
+        [(pcm_path, chunk, regions) for chunk in chunks],
+        on_done=_chunk_done,
+    )
+    return stitch_chunk_transcripts(chunks, results, regions)
+
+
+async def _run_speech_branch(
+    path: str,
+    upload_hash: str,
+    cache_status: Dict[str, str],
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[Dict, Dict, Dict, Dict[str, float]]:
+    """
+    Whisper -> text branch: transcribe the audio track on the ASR pool,
+    then run the text analyzer on the NLP pool. Each stage is looked up
+    in the result cache first. Returns (asr result, audio dict, text dict,
+    timings).
+    """
+    t0 = time.perf_counter()
+    _report(progress, "audio", 0.0)
+    asr_cache_version = asr_version()
+    asr_result = result_cache.get("asr", upload_hash, asr_cache_version)
+    cache_status["asr"] = "hit" if asr_result is not None else "miss"
+    if asr_result is None:
+        # decode the audio track once; the worker memory-maps the PCM file
+        pcm_path = await asyncio.to_thread(extract_pcm, path)
+        try:
+            asr_result = await transcribe_pcm(pcm_path, progress)
+        finally:
+            remove_upload(pcm_path)
+        result_cache.put("asr", upload_hash, asr_cache_version, asr_result)
+    # fluency metrics are cheap, so they are always recomputed from the segments
+    audio_dict = build_audio_response(asr_result).dict()
+    _report(progress, "audio", 100.0)
+    t1 = time.perf_counter()
+
+    # the text result depends only on the transcript: keyed on its hash, it is
+    # reused across uploads and ASR versions that produce the same text
+    transcript = audio_dict.get("transcript", "")
+    transcript_hash = text_sha256(transcript)
+    _report(progress, "text", 0.0)
+    text_dict = result_cache.get("text", transcript_hash, TEXT_ANALYZER_VERSION)
+    cache_status["text"] = "hit" if text_dict is not None else "miss"
+    if text_dict is None:
+        text_dict = await nlp_pool.submit(analyze_text, transcript)
+        result_cache.put("text", transcript_hash, TEXT_ANALYZER_VERSION, text_dict)
+    _report(progress, "text", 100.0)
+    t2 = time.perf_counter()
+
+    return asr_result, audio_dict, text_dict, {"audio": t1 - t0, "text": t2 - t1}
+
+
+async def extract_video_landmarks(path: str, progress: Optional[ProgressCallback] = None) -> Dict:
+    """
+    Run landmark detection on the vision pool. Long videos are split into
+    time shards processed in parallel, one per vision worker, each with its
+    own MediaPipe graphs; the shards' landmark tensors are merged in order
+    before movement and scores are computed, so results match a single pass.
+    Returns the tensors plus "duration", "fps" and "graph_wait_seconds"
+    (time spent waiting for a warm graph pair).
+    """
+    info = await asyncio.to_thread(probe_video, path)
+    n_shards = config.VIDEO_SHARDS or vision_pool.max_workers
+    if info["duration"] < config.VIDEO_SHARD_MIN_SECONDS or n_shards <= 1:
+        # the callback crosses the process boundary, so it must be picklable
+        video_progress = partial(progress, "video") if progress is not None else None
+        features = await vision_pool.submit(extract_video_features, path, 0, None, video_progress)
+        record_worker_graph_stats(features.pop("graph_stats"))
+    else:
+        shards = plan_video_shards(info["frame_count"], info["fps"], n_shards)
+        finished = 0
+
+        def _shard_done():
+            nonlocal finished
+            finished += 1
+            _report(progress, "video", round(100.0 * finished / len(shards), 1))
+
+        parts = await vision_pool.submit_many(
+            extract_video_features,
+            [(path, start, end) for start, end in shards],
+            on_done=_shard_done,
+        )
+        for part in parts:
+            record_worker_graph_stats(part.pop("graph_stats"))
+        features = merge_video_features(parts)
+    features["duration"] = info["duration"]
+    features["fps"] = info["fps"]
+    return features
+
+
+async def _run_video_branch(
+    path: str,
+    upload_hash: str,
+    cache_status: Dict[str, str],
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[Optional[Dict], Optional[Dict], Dict[str, float]]:
+    """
+    MediaPipe branch on the vision pool. Returns (video result, landmark
+    tensors, timings). Video analysis is best-effort:
+    audio-only uploads (or unreadable containers) simply yield no video result.
+
+    Landmark tensors are cached separately from the scores, so a scoring
+    change (VIDEO_SCORING_VERSION) re-scores the saved landmarks without
+    re-running vision.
+    """
+    t0 = time.perf_counter()
+    _report(progress, "video", 0.0)
+    timings: Dict[str, float] = {}
+    landmarks = None
+    video_result = result_cache.get("video", upload_hash, VIDEO_ANALYZER_VERSION)
+    cache_status["video"] = "hit" if video_result is not None else "miss"
+    if video_result is not None:
+        # the session timeline is built from the landmarks (None if evicted)
+        landmarks = result_cache.get_arrays("landmarks", upload_hash, VIDEO_LANDMARKS_VERSION)
+    else:
+        try:
+            landmarks = result_cache.get_arrays("landmarks", upload_hash, VIDEO_LANDMARKS_VERSION)
+            cache_status["landmarks"] = "hit" if landmarks is not None else "miss"
+            if landmarks is None:
+                landmarks = await extract_video_landmarks(path, progress)
+                timings["video_graph_wait"] = landmarks.pop("graph_wait_seconds")
+                await asyncio.to_thread(
+                    result_cache.put_arrays, "landmarks", upload_hash, VIDEO_LANDMARKS_VERSION, landmarks
+                )
+            video_result = summarize_features(landmarks, float(landmarks["duration"]))
+        except (PoolBusyError, BrokenProcessPool):
+            # the pool's problem, not the upload's: do not cache "no video"
+            raise
+        except Exception:
+            video_result = landmarks = None
+        result_cache.put("video", upload_hash, VIDEO_ANALYZER_VERSION, video_result)
+    _report(progress, "video", 100.0)
+    timings["video"] = time.perf_counter() - t0
+    return video_result, landmarks, timings
+
+
+def build_session_timeline(asr_result: Dict, landmarks: Optional[Dict], duration: float) -> Dict:
+    """Per-segment speech metrics plus per-frame tilt/gaze/movement from the landmark tensors."""
+    segments = asr_result.get("segments", [])
+    if landmarks is None or not len(landmarks["frame_indices"]):
+        return build_timeline(segments, duration=duration)
+
+    per_frame = frame_features(landmarks["pose"], landmarks["face"], landmarks["frame_size"])
+    fps = float(landmarks["fps"]) if "fps" in landmarks else 25.0
+    return build_timeline(
+        segments,
+        frame_times=landmarks["frame_indices"] / fps,
+        tilts=per_frame["tilts"],
+        gazes=per_frame["gazes"],
+        movements=frame_movements(per_frame["noses"]),
+        duration=max(duration, float(landmarks["duration"])),
+    )
+
+
+def assemble_response(audio_dict: Dict, text_dict: Dict, video_result: Optional[Dict],
+                      pipeline: str = "(audio -> text) || video -> fusion") -> Dict:
+    """Fuse the analyzer outputs and build the full multimodal response dict."""
+    fused = fuse_audio_text_video(audio_dict, text_dict, video_result)
+
+    # --- STATISTICS MODEL ---
+    stats = MultimodalStats(
+        word_count=audio_dict["stats"]["word_count"],
+        duration_seconds=audio_dict["stats"]["duration_seconds"],
+        total_pause_seconds=audio_dict["stats"]["total_pause_seconds"],
+        sentence_count=text_dict["stats"]["sentence_count"],
+        avg_sentence_length=text_dict["stats"]["avg_sentence_length"],
+        grammar_errors=text_dict["stats"]["grammar_errors"],
+    )
+
+    return {
+        "transcript": audio_dict.get("transcript", ""),
+        "audio": audio_dict,
+        "text": text_dict,
+        "video": video_result,
+        "fused": fused,
+        "stats": stats.dict(),
+        "notes": {
+            "pipeline": pipeline,
+            "storage": "session saved to SQLite history",
+        },
+    }
+
+
+async def run_multimodal_pipeline(
+    path: str,
+    progress: Optional[ProgressCallback] = None,
+    upload_hash: Optional[str] = None,
+) -> Dict:
+    """
+    Run the speech branch (audio -> text) and the video branch concurrently
+    on their worker pools, then fuse once both have finished.
+    Returns the full response dict (transcript, audio, text, video, fused,
+    stats, notes) with per-stage timings in `notes`, plus "timeline": the
+    per-frame / per-segment columns (NumPy arrays, not JSON-serializable)
+    that save_session stores; callers pop it before returning the response.
+
+    progress: optional picklable callback `(stage, percent)` used to report
+    per-stage progress ("audio", "text", "video", "fusion"). The video stage
+    calls it from inside the vision worker process.
+
+    upload_hash: SHA-256 of the upload, if already computed while streaming
+    it to disk; otherwise the file is hashed here. Used as the result cache key.
+
+    Raises PoolBusyError when any analyzer pool queue is full.
+    """
+    t_start = time.perf_counter()
+    if upload_hash is None:
+        upload_hash = await asyncio.to_thread(file_sha256, path)
+
+    cache_status: Dict[str, str] = {}
+    speech = asyncio.ensure_future(_run_speech_branch(path, upload_hash, cache_status, progress))
+    video = asyncio.ensure_future(_run_video_branch(path, upload_hash, cache_status, progress))
+    try:
+        await asyncio.wait((speech, video), return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        # one branch failed (e.g. PoolBusyError) or we were cancelled: stop the
+        # other one too, so it does not hold a pool slot for a dropped request
+        for branch in (speech, video):
+            branch.cancel()
+        await asyncio.gather(speech, video, return_exceptions=True)
+    for branch in (speech, video):
+        if not branch.cancelled() and branch.exception() is not None:
+            raise branch.exception()
+    asr_result, audio_dict, text_dict, speech_timings = speech.result()
+    video_result, landmarks, video_timings = video.result()
+
+    # --- FUSION (starts once both branches are done) ---
+    t_fusion = time.perf_counter()
+    response = assemble_response(audio_dict, text_dict, video_result)
+    fusion_seconds = time.perf_counter() - t_fusion
+    _report(progress, "fusion", 100.0)
+
+    timings = {**speech_timings, **video_timings, "fusion": fusion_seconds}
+    timings["total"] = time.perf_counter() - t_start
+
+    notes = response["notes"]
+    notes["cache"] = ", ".join(f"{stage}={status}" for stage, status in sorted(cache_status.items()))
+    for stage, seconds in timings.items():
+        notes[f"{stage}_seconds"] = f"{seconds:.3f}"
+
+    response["timeline"] = build_session_timeline(
+        asr_result, landmarks, audio_dict["stats"]["duration_seconds"]
+    )
+    return response
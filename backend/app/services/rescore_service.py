@@ -0,0 +1,254 @@
+# backend/app/services/rescore_service.py
+"""
+Re-score stored sessions with the current scoring rules, without running
+ASR or vision again.
+
+What is recomputed from each `sessions` row:
+  audio   fluency metrics from the transcript and the stored duration/pause
+          totals (fluency_from_totals)
+  text    optionally re-analyzed from the transcript on the NLP pool
+          (rerun_text=True); otherwise the stored text scores are kept
+  video   stats/scores from the session timeline's per-frame columns when
+          the session has one; otherwise the stored video scores are kept
+  fused   fuse_audio_text_video over the three results
+
+Rows are streamed by id in batches; each batch is updated in one
+transaction. dry_run computes the same report (with per-session diffs)
+without writing anything.
+"""
+import asyncio
+import json
+import re
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .. import config
+from ..db.database import get_connection
+from .audio_processor import fluency_from_totals
+from .fusion import fuse_audio_text_video
+from .rollups import ROLLUP_COLUMNS, apply_to_rollups
+from .text_processor import analyze_texts
+from .timeline import load_timeline
+from .video_processor import summarize_video
+from .worker_pool import nlp_pool
+
+# sessions columns rewritten by a re-score
+SCORE_COLUMNS = ("fluency", "grammar", "coherence", "readability", "posture", "gaze", "movement", "overall")
+JSON_COLUMNS = ("audio_json", "text_json", "video_json", "fused_json")
+
+
+def rescore_audio(audio: Dict, transcript: str) -> Dict:
+    """Audio scores/stats from the stored totals with the current fluency rules."""
+    stats = audio.get("stats", {})
+    metrics = fluency_from_totals(
+        re.findall(r"\w+", transcript or ""),
+        max(0.1, float(stats.get("duration_seconds") or 60.0)),
+        float(stats.get("total_pause_seconds") or 0.0),
+    )
+    return {
+        **audio,
+        "scores": {
+            "wpm": round(metrics["wpm"], 2),
+            "articulation_rate": round(metrics["articulation_rate"], 2),
+            "filler_count": metrics["filler_count"],
+            "pause_ratio": round(metrics["pause_ratio"], 3),
+            "fluency_score": metrics["fluency_score"],
+        },
+        "stats": {
+            "word_count": metrics["word_count"],
+            "duration_seconds": round(metrics["duration_seconds"], 2),
+            "total_pause_seconds": round(metrics["total_pause_seconds"], 2),
+        },
+    }
+
+
+def rescore_video(video: Optional[Dict], timeline_path: Optional[str]) -> Optional[Dict]:
+    """Video scores from the timeline's per-frame columns, or the stored result without one."""
+    if not video or not timeline_path:
+        return video
+    try:
+        timeline = load_timeline(timeline_path)
+    except OSError:
+        return video
+    if not len(timeline["frame_time"]):
+        return video
+    movements = timeline["frame_movement"]
+    return summarize_video(
+        timeline["frame_tilt"], timeline["frame_gaze"], movements[~np.isnan(movements)],
+        duration=video.get("stats", {}).get("duration_seconds", float(timeline["duration"])),
+        frames_analyzed=len(timeline["frame_time"]),
+    )
+
+
+def rescore_session(row: Dict, text: Optional[Dict] = None) -> Dict:
+    """
+    New column values for one sessions row. `text` is a freshly computed
+    text result, or None to keep the stored one.
+    """
+    audio = rescore_audio(json.loads(row["audio_json"] or "{}"), row["transcript"])
+    text = text if text is not None else json.loads(row["text_json"] or "{}")
+    video = rescore_video(json.loads(row["video_json"]) if row["video_json"] else None, row.get("timeline_path"))
+    fused = fuse_audio_text_video(audio, text, video)
+    fused_video = fused.get("video") or {}
+    return {
+        "fluency": fused.get("fluency"),
+        "grammar": fused.get("grammar"),
+        "coherence": fused.get("coherence"),
+        "readability": fused.get("readability"),
+        "posture": fused_video.get("posture") if video else None,
+        "gaze": fused_video.get("gaze") if video else None,
+        "movement": fused_video.get("movement") if video else None,
+        "overall": fused.get("overall"),
+        "audio_json": json.dumps(audio),
+        "text_json": json.dumps(text),
+        "video_json": json.dumps(video) if video else None,
+        "fused_json": json.dumps(fused),
+    }
+
+
+def _diff(row: Dict, new: Dict) -> Dict[str, List]:
+    """Changed score columns as {column: [old, new]}."""
+    return {
+        column: [row[column], new[column]]
+        for column in SCORE_COLUMNS
+        if row[column] != new[column]
+    }
+
+
+def _json_changed(row: Dict, new: Dict) -> bool:
+    """Whether a stored result document changed (compared parsed, not as text)."""
+    return any(
+        json.loads(row[column] or "null") != json.loads(new[column] or "null")
+        for column in JSON_COLUMNS
+    )
+
+
+def _read_batch(last_id: int, size: int, session_ids: Optional[List[int]] = None) -> List[Dict]:
+    """Up to `size` sessions rows with id > last_id, by ascending id (keyset pagination)."""
+    conn = get_connection()
+    try:
+        if session_ids:
+            placeholders = ",".join("?" * len(session_ids))
+            rows = conn.execute(
+                f"SELECT * FROM sessions WHERE id > ? AND id IN ({placeholders}) ORDER BY id LIMIT ?",
+                (last_id, *session_ids, size),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM sessions WHERE id > ? ORDER BY id LIMIT ?", (last_id, size)
+            ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def _rescore_batch(batch: List[Dict], texts: List[Optional[Dict]]):
+    """
+    Re-score one batch. Returns (updates, diffs): the new column values of
+    every row whose scores or stored results changed, and the changed score
+    columns per session as (session_id, diff).
+    """
+    updates, diffs = [], []
+    for row, text in zip(batch, texts):
+        new = rescore_session(row, text)
+        diff = _diff(row, new)
+        if diff or _json_changed(row, new):
+            updates.append({"id": row["id"], **new})
+        if diff:
+            diffs.append((row["id"], diff))
+    return updates, diffs
+
+
+def _write_batch(updates: List[Dict]):
+    """Apply one batch of re-scored rows in a single transaction."""
+    columns = SCORE_COLUMNS + JSON_COLUMNS
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    conn = get_connection()
+    try:
+        with conn:
+            cur = conn.cursor()
+            # move the rollups from the old scores to the new ones in the same transaction
+            old_rows = [dict(row) for row in cur.execute(
+                f"SELECT id, timestamp, {', '.join(ROLLUP_COLUMNS)} FROM sessions "
+                f"WHERE id IN ({', '.join('?' for _ in updates)})",
+                [update["id"] for update in updates],
+            )]
+            timestamps = {row["id"]: row["timestamp"] for row in old_rows}
+            apply_to_rollups(cur, old_rows, sign=-1)
+            cur.executemany(
+                f"UPDATE sessions SET {assignments} WHERE id = ?",
+                [tuple(update[column] for column in columns) + (update["id"],) for update in updates],
+            )
+            apply_to_rollups(cur, [{**update, "timestamp": timestamps.get(update["id"])} for update in updates])
+    finally:
+        conn.close()
+
+
+async def rescore_sessions(
+    dry_run: bool = False,
+    rerun_text: bool = False,
+    session_ids: Optional[List[int]] = None,
+    limit: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_diffs: int = 100,
+) -> Dict:
+    """
+    Re-score sessions (all, or only `session_ids`) and return a report:
+    counts, elapsed seconds, sessions per second and, up to `max_diffs`,
+    the changed score columns of each session.
+
+    rerun_text re-analyzes each transcript on the NLP pool (each batch is
+    split across its workers, which run spaCy with nlp.pipe); everything
+    else is cheap arithmetic.
+    """
+    batch_size = max(1, batch_size or config.RESCORE_BATCH_SIZE)
+    t0 = time.perf_counter()
+    scanned = changed = written = 0
+    diffs = []
+
+    last_id = 0
+    remaining = limit
+    while remaining is None or remaining > 0:
+        # reads, scoring and writes run in a thread; only the NLP pool is awaited here
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        batch = await asyncio.to_thread(_read_batch, last_id, size, session_ids)
+        if not batch:
+            break
+        last_id = batch[-1]["id"]
+        if remaining is not None:
+            remaining -= len(batch)
+
+        texts = [None] * len(batch)
+        if rerun_text:
+            # one nlp.pipe call per NLP worker over its share of the batch
+            transcripts = [row["transcript"] or "" for row in batch]
+            step = -(-len(transcripts) // nlp_pool.max_workers)
+            parts = await nlp_pool.submit_many(
+                analyze_texts, [(transcripts[i:i + step],) for i in range(0, len(transcripts), step)]
+            )
+            texts = [text for part in parts for text in part]
+
+        updates, batch_diffs = await asyncio.to_thread(_rescore_batch, batch, texts)
+        changed += len(batch_diffs)
+        for session_id, diff in batch_diffs[:max(0, max_diffs - len(diffs))]:
+            diffs.append({"session_id": session_id, "changes": diff})
+        scanned += len(batch)
+
+        if updates and not dry_run:
+            await asyncio.to_thread(_write_batch, updates)
+            written += len(updates)
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "dry_run": dry_run,
+        "rerun_text": rerun_text,
+        "scanned": scanned,
+        "changed": changed,
+        "written": written,
+        "seconds": round(elapsed, 3),
+        "sessions_per_second": round(scanned / elapsed, 1) if elapsed > 0 else 0.0,
+        "diffs": diffs,
+        "diffs_truncated": changed > len(diffs),
+    }
@@ -0,0 +1,207 @@
+# backend/app/services/result_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .. import config
+
+
+class ResultCache:
+    """
+    Content-addressed cache for per-stage analysis results.
+
+    Entries are JSON files (or .npz for array artifacts such as landmark
+    tensors) named by sha256(content hash + stage + analyzer version), so
+    re-uploads of the same recording skip the expensive stages and a
+    version bump naturally invalidates stale results. The content hash is
+    the upload's for stages that read the media, and the transcript's for
+    the text stage (see text_sha256).
+    Eviction drops entries older than `max_age_seconds` first, then the
+    least recently used ones until the cache fits in `max_bytes`.
+    """
+
+    # run a full eviction pass every N writes
+    EVICT_EVERY = 32
+
+    def __init__(self, directory: Path, max_bytes: int, max_age_seconds: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._writes = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(upload_hash: str, stage: str, version: str) -> str:
+        return hashlib.sha256(f"{upload_hash}:{stage}:{version}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str = ".json") -> Path:
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def _count(self, counter: Dict[str, int], stage: str):
+        with self._lock:
+            counter[stage] = counter.get(stage, 0) + 1
+
+    def get(self, stage: str, upload_hash: Optional[str], version: str) -> Optional[Any]:
+        if not upload_hash:
+            return None
+        path = self._path(self.make_key(upload_hash, stage, version))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self._count(self._misses, stage)
+            return None
+
+        # touch so LRU eviction keeps frequently re-used entries
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._count(self._hits, stage)
+        return value
+
+    def put(self, stage: str, upload_hash: Optional[str], version: str, value: Any):
+        if not upload_hash or value is None:
+            return
+        path = self._path(self.make_key(upload_hash, stage, version))
+        self._write(path, lambda f: f.write(json.dumps(value).encode("utf-8")))
+
+    def get_arrays(self, stage: str, upload_hash: Optional[str], version: str) -> Optional[Dict[str, np.ndarray]]:
+        """Like get(), for a dict of NumPy arrays stored with put_arrays()."""
+        if not upload_hash:
+            return None
+        path = self._path(self.make_key(upload_hash, stage, version), ".npz")
+        try:
+            with np.load(path) as data:
+                value = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            self._count(self._misses, stage)
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._count(self._hits, stage)
+        return value
+
+    def put_arrays(self, stage: str, upload_hash: Optional[str], version: str, arrays: Dict[str, Any]):
+        """Store a dict of NumPy arrays (or scalars) as a compressed .npz entry."""
+        if not upload_hash or not arrays:
+            return
+        path = self._path(self.make_key(upload_hash, stage, version), ".npz")
+        self._write(path, lambda f: np.savez_compressed(f, **arrays))
+
+    def _write(self, path: Path, write):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write-then-rename so concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Apply age and size limits. Returns the number of entries removed."""
+        if not self.directory.exists():
+            return 0
+
+        now = time.time()
+        entries = []
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith((".json", ".npz")):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+
+        removed = 0
+        kept = []
+        for mtime, size, path in entries:
+            if now - mtime > self.max_age_seconds:
+                removed += self._remove(path)
+            else:
+                kept.append((mtime, size, path))
+
+        total = sum(size for _, size, _ in kept)
+        kept.sort()  # oldest access first
+        for mtime, size, path in kept:
+            if total <= self.max_bytes:
+                break
+            removed += self._remove(path)
+            total -= size
+
+        with self._lock:
+            self._evictions += removed
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = dict(self._hits)
+            misses = dict(self._misses)
+            evictions = self._evictions
+        total_hits = sum(hits.values())
+        total_lookups = total_hits + sum(misses.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(total_hits / total_lookups, 3) if total_lookups else 0.0,
+            "evictions": evictions,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+        }
+
+
+result_cache = ResultCache(
+    config.RESULT_CACHE_DIR,
+    max_bytes=config.RESULT_CACHE_MAX_BYTES,
+    max_age_seconds=config.RESULT_CACHE_MAX_AGE_SECONDS,
+)
+
+
+def file_sha256(path: str) -> str:
+    """Streaming SHA-256 of a file on disk (used when no hash was computed on upload)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(config.UPLOAD_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_sha256(text: str) -> str:
+    """SHA-256 of a text (UTF-8); the cache key of stages that only read the transcript."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def settings_version(version: str, *settings: Any) -> str:
+    """
+    `version` plus a short hash of the settings a stage's output depends
+    on, so changing one of them (e.g. FLUENTIQ_VIDEO_SAMPLE_HZ) misses the
+    entries computed with the old value instead of serving them.
+    """
+    digest = hashlib.sha256(json.dumps(settings, default=str).encode("utf-8")).hexdigest()
+    return f"{version}+{digest[:8]}"
@@ -0,0 +1,123 @@
+# backend/app/services/rollups.py
+"""
+Running aggregates of the session scores, so /history/summary and the
+trend endpoint never scan the sessions table.
+
+session_rollups holds one row per (kind, bucket):
+  kind "all"  bucket ""             every session
+  kind "day"  bucket "YYYY-MM-DD"   sessions of that UTC day
+  kind "week" bucket "YYYY-MM-DD"   sessions of the ISO week starting that Monday
+with, for each score column, the sum and the count of non-NULL values (so
+averages match SQL AVG) plus the number of sessions.
+
+Rows are adjusted inside the transaction that changes the sessions:
+insert_sessions adds new sessions, re-scoring subtracts the old scores and
+adds the new ones. The table itself is created (and filled from existing
+sessions) by init_db.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from ..db.database import ROLLUP_COLUMNS, ROLLUP_VALUE_COLUMNS
+
+BUCKET_KINDS = ("day", "week")
+
+
+def bucket_keys(timestamp: str) -> Dict[str, str]:
+    """Day and week bucket of an ISO timestamp (UTC)."""
+    day = date.fromisoformat(timestamp[:10])
+    return {"day": day.isoformat(), "week": (day - timedelta(days=day.weekday())).isoformat()}
+
+
+def apply_to_rollups(cur, rows: Iterable[Dict], sign: int = 1):
+    """
+    Add (sign=1) or subtract (sign=-1) sessions to/from the rollups. Each
+    row needs "timestamp" and the score columns; changes are merged per
+    bucket first, so a batch costs one upsert per touched bucket.
+    """
+    deltas: Dict[tuple, List[float]] = {}
+    for row in rows:
+        if not row.get("timestamp"):
+            continue
+        values = [0.0] * (1 + len(ROLLUP_VALUE_COLUMNS))
+        values[0] = sign
+        for i, column in enumerate(ROLLUP_COLUMNS):
+            if row.get(column) is not None:
+                values[1 + 2 * i] = sign * float(row[column])
+                values[2 + 2 * i] = sign
+        keys = [("all", "")] + list(bucket_keys(row["timestamp"]).items())
+        for key in keys:
+            total = deltas.setdefault(key, [0.0] * len(values))
+            for i, value in enumerate(values):
+                total[i] += value
+
+    if not deltas:
+        return
+    names = ["sessions"] + ROLLUP_VALUE_COLUMNS
+    cur.executemany(f"""
+        INSERT INTO session_rollups (kind, bucket, {", ".join(names)})
+        VALUES (?, ?, {", ".join("?" for _ in names)})
+        ON CONFLICT (kind, bucket) DO UPDATE SET
+            {", ".join(f"{name} = {name} + excluded.{name}" for name in names)}
+    """, [key + tuple(total) for key, total in deltas.items()])
+
+
+def _average(row, column: str) -> Optional[float]:
+    count = row[f"{column}_count"]
+    return row[f"{column}_sum"] / count if count else None
+
+
+def summary_from_rollups(cur) -> Dict:
+    """Overall averages and session count (the "all" rollup row)."""
+    row = cur.execute("SELECT * FROM session_rollups WHERE kind = 'all' AND bucket = ''").fetchone()
+    summary = {f"avg_{column}": _average(row, column) if row else None for column in ROLLUP_COLUMNS}
+    summary["total_sessions"] = int(row["sessions"]) if row else 0
+    return summary
+
+
+def _slope(xs: List[float], ys: List[float]) -> Optional[float]:
+    """Least-squares slope of ys over xs (None with fewer than two points)."""
+    if len(xs) < 2:
+        return None
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def trends_from_rollups(cur, kind: str = "week", periods: int = 12, window: int = 4,
+                        columns: Iterable[str] = ROLLUP_COLUMNS) -> Dict:
+    """
+    Per-bucket averages of the last `periods` buckets that have sessions,
+    oldest first, with a moving average over the last `window` buckets
+    (weighted by session count) and the least-squares improvement slope in
+    score points per day or week. Reads at most `periods` rollup rows, so
+    the cost does not grow with the history.
+    """
+    rows = cur.execute(
+        "SELECT * FROM session_rollups WHERE kind = ? ORDER BY bucket DESC LIMIT ?", (kind, periods)
+    ).fetchall()[::-1]
+    step_days = 7 if kind == "week" else 1
+    origin = date.fromisoformat(rows[0]["bucket"]) if rows else None
+
+    result = {}
+    for column in columns:
+        points, xs, ys = [], [], []
+        for i, row in enumerate(rows):
+            recent = rows[max(0, i - window + 1): i + 1]
+            count = sum(r[f"{column}_count"] for r in recent)
+            avg = _average(row, column)
+            points.append({
+                "bucket": row["bucket"],
+                "sessions": int(row["sessions"]),
+                "avg": None if avg is None else round(avg, 2),
+                "moving_avg": round(sum(r[f"{column}_sum"] for r in recent) / count, 2) if count else None,
+            })
+            if avg is not None:
+                xs.append((date.fromisoformat(row["bucket"]) - origin).days / step_days)
+                ys.append(avg)
+        slope = _slope(xs, ys)
+        result[column] = {"points": points, "slope": None if slope is None else round(slope, 3)}
+    return {"bucket": kind, "periods": periods, "window": window, "columns": result}
@@ -1,16 +1,50 @@
 # backend/app/services/text_processor.py
 import re
-from typing import Dict
-import language_tool_python
-import spacy
-import nltk
-from nltk.corpus import stopwords
+from typing import Dict, Iterable, List
+from .. import config
 from . import __name__  # silence unused import in some editors
+from .grammar_checker import checker_from_config
+from .result_cache import settings_version
 
-# Load spaCy model once
-nlp = spacy.load("en_core_web_sm")
-lt_tool = language_tool_python.LanguageTool("en-US")
-_stopwords = set(stopwords.words("english"))
+# spaCy components text analysis never reads; the parser is replaced by the
+# rule-based sentencizer, which is enough to split punctuated ASR output
+_UNUSED_PIPES = ["ner", "lemmatizer", "parser"]
+_WORD_RE = re.compile(r"\w")
+
+
+def load_nlp(model: str = config.SPACY_MODEL):
+    """
+    Lean spaCy pipeline: tokenizer, tagger + attribute ruler (for POS) and
+    a sentencizer, so one pass yields sentences, words and POS tags.
+    """
+    try:
+        import spacy
+    except ImportError as e:
+        raise RuntimeError(
+            "The 'spacy' package is required for text analysis. "
+            "Install it with 'pip install spacy' and 'python -m spacy download en_core_web_sm'.") from e
+    lean = spacy.load(model, exclude=_UNUSED_PIPES)
+    lean.add_pipe("sentencizer")
+    return lean
+
+
+# spaCy pipeline of this process, loaded on first use (or by warm_up) so
+# importing this module stays cheap
+_nlp = None
+
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        _nlp = load_nlp()
+    return _nlp
+
+# LanguageTool server(s), started on first use or by warm_up
+grammar_checker = checker_from_config()
+
+# Bump when the text heuristics change; part of the result cache key, together
+# with the spaCy model and the LanguageTool server the results come from
+TEXT_ANALYZER_VERSION = settings_version("text-3", config.SPACY_MODEL, config.LANGUAGETOOL_URL)
 
 # Simple list of discourse/signpost markers used to estimate structure/coherence
 _SIGNPOSTS = [
@@ -20,8 +54,32 @@ _SIGNPOSTS = [
 ]
 
 
-def _tokenize_sentences(text: str):
-    return nltk.tokenize.sent_tokenize(text)
+def warm_up():
+    """
+    Run one tiny check so the LanguageTool server and spaCy pipeline are
+    fully started before the first real transcript (worker initializer).
+    """
+    grammar_checker.warm_up()
+    get_nlp()("This is a warm up sentence.")
+
+
+def _empty_result() -> Dict:
+    return {
+        "transcript": "",
+        "scores": {
+            "grammar_score": 0,
+            "lexical_richness": 0.0,
+            "coherence_score": 0,
+            "readability_score": 0.0,
+        },
+        "stats": {
+            "word_count": 0,
+            "sentence_count": 0,
+            "avg_sentence_length": 0.0,
+            "grammar_errors": 0,
+        },
+        "highlights": {},
+    }
 
 
 def analyze_text(transcript: str) -> Dict:
@@ -36,35 +94,36 @@ def analyze_text(transcript: str) -> Dict:
     text = transcript.strip()
     if not text:
         # empty response
-        return {
-            "transcript": "",
-            "scores": {
-                "grammar_score": 0,
-                "lexical_richness": 0.0,
-                "coherence_score": 0,
-                "readability_score": 0.0,
-            },
-            "stats": {
-                "word_count": 0,
-                "sentence_count": 0,
-                "avg_sentence_length": 0.0,
-                "grammar_errors": 0,
-            },
-            "highlights": {},
-        }
-
-    # Basic tokenization & counts
-    sentences = _tokenize_sentences(text)
+        return _empty_result()
+    return _analyze_doc(text, get_nlp()(text))
+
+
+def analyze_texts(transcripts: Iterable[str]) -> List[Dict]:
+    """
+    analyze_text for many transcripts (batch jobs): spaCy runs over them
+    with nlp.pipe, in SPACY_PROCESSES processes, instead of one call each.
+    """
+    texts = [t.strip() for t in transcripts]
+    non_empty = [t for t in texts if t]
+    docs = iter(get_nlp().pipe(non_empty, batch_size=config.SPACY_BATCH_SIZE,
+                         n_process=max(1, config.SPACY_PROCESSES)))
+    return [_analyze_doc(text, next(docs)) if text else _empty_result() for text in texts]
+
+
+def _analyze_doc(text: str, doc) -> Dict:
+    # Sentences, words and POS all come from the single spaCy pass
+    sentences = list(doc.sents)
     sentence_count = len(sentences) or 1
 
-    words = re.findall(r"\w+", text)
+    # word tokens (anything with a letter/digit; "n't" counts like in r"\w+" splits)
+    words = [token.text for token in doc if _WORD_RE.search(token.text)]
     word_count = len(words) or 0
     unique_words = len(set(w.lower() for w in words))
     lexical_richness = (unique_words / word_count) if word_count else 0.0
     avg_sentence_len = word_count / sentence_count if sentence_count else 0.0
 
-    # LanguageTool grammar checks
-    matches = lt_tool.check(text)
+    # LanguageTool grammar checks, per sentence (cached, in parallel)
+    matches = grammar_checker.check(text, [(sent.start_char, sent.end_char) for sent in sentences])
     grammar_errors = len(matches)
 
     # Map grammar errors to score (simple heuristic)
@@ -99,14 +158,13 @@ def analyze_text(transcript: str) -> Dict:
     if matches:
         # pick top 3 matches
         for i, m in enumerate(matches[:3], start=1):
-            message = m.message
-            context = text[m.offset : m.offset + m.errorLength] if hasattr(m, "errorLength") else ""
+            message = m["message"]
+            context = text[m["offset"] : m["offset"] + m["length"]]
             highlights[f"issue_{i}"] = f"{message} — Example: '{context}'"
     else:
         highlights["positive"] = "No obvious grammar/style issues detected."
 
     # Also compute POS distribution (optional small example highlight)
-    doc = nlp(text)
     pos_counts = {}
     for token in doc:
         pos_counts[token.pos_] = pos_counts.get(token.pos_, 0) + 1
@@ -0,0 +1,178 @@
+# backend/app/services/timeline.py
+"""
+Per-session timelines: per-frame video features and per-segment speech
+metrics, stored column by column in a compressed NumPy .npz file next to
+the database and referenced from sessions.timeline_path.
+
+Columns:
+  frame_time, frame_tilt, frame_gaze, frame_movement     one row per sampled frame
+  segment_start, segment_end, segment_words, segment_wpm,
+  segment_pause_before, segment_fillers                  one row per ASR segment
+  word_start, word_end, word_text, word_filler           one row per word (only with
+                                                         ASR word timestamps)
+  duration                                               scalar, seconds
+"""
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .. import config
+from .audio_processor import word_timings
+from .fillers import filler_matcher, tokenize
+
+FRAME_COLUMNS = ("frame_time", "frame_tilt", "frame_gaze", "frame_movement")
+SEGMENT_COLUMNS = (
+    "segment_start", "segment_end", "segment_words", "segment_wpm",
+    "segment_pause_before", "segment_fillers",
+)
+WORD_COLUMNS = ("word_start", "word_end", "word_text", "word_filler")
+
+
+def segment_columns(segments: List[Dict]) -> Dict[str, np.ndarray]:
+    """Words / WPM / pause before / filler count for each ASR segment."""
+    starts = np.array([seg["start"] for seg in segments], dtype=np.float64)
+    ends = np.array([seg["end"] for seg in segments], dtype=np.float64)
+    words = [tokenize(seg.get("text", "")) for seg in segments]
+    word_counts = np.array([len(w) for w in words], dtype=np.int32)
+    matcher = filler_matcher()
+    fillers = np.array([matcher.count(w) for w in words], dtype=np.int32)
+
+    durations = np.maximum(ends - starts, 0.1)
+    pauses = np.zeros(len(segments))
+    if len(segments) > 1:
+        pauses[1:] = np.maximum(starts[1:] - ends[:-1], 0.0)
+    return {
+        "segment_start": starts,
+        "segment_end": ends,
+        "segment_words": word_counts,
+        "segment_wpm": word_counts / (durations / 60.0),
+        "segment_pause_before": pauses,
+        "segment_fillers": fillers,
+    }
+
+
+def word_columns(segments: List[Dict]) -> Dict[str, np.ndarray]:
+    """Start / end / text of every timed word, and whether it is part of a filler."""
+    words = word_timings(segments)
+    # filler spans are found on tokens, then mapped back to the words they came from
+    tokens, token_word = [], []
+    for i, word in enumerate(words):
+        for token in tokenize(word["word"]):
+            tokens.append(token)
+            token_word.append(i)
+    filler = np.zeros(len(words), dtype=np.int8)
+    for start, end in filler_matcher().find(tokens):
+        filler[token_word[start]:token_word[end - 1] + 1] = 1
+    return {
+        "word_start": np.array([w["start"] for w in words], dtype=np.float64),
+        "word_end": np.array([w["end"] for w in words], dtype=np.float64),
+        "word_text": np.array([w["word"] for w in words], dtype=np.str_),
+        "word_filler": filler,
+    }
+
+
+def build_timeline(segments: Optional[List[Dict]], frame_times=None, tilts=None, gazes=None,
+                   movements=None, duration: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Assemble the timeline columns. Frame columns are optional (audio-only
+    sessions); movements holds NaN for frames without a previous detection.
+    """
+    timeline = segment_columns(segments or [])
+    timeline.update(word_columns(segments or []))
+    n_frames = len(frame_times) if frame_times is not None else 0
+    timeline.update({
+        "frame_time": np.asarray(frame_times if n_frames else [], dtype=np.float64),
+        "frame_tilt": np.asarray(tilts if n_frames else [], dtype=np.float32),
+        "frame_gaze": np.asarray(gazes if n_frames else [], dtype=np.int8),
+        "frame_movement": np.asarray(movements if n_frames else [], dtype=np.float32),
+    })
+    ends = [duration]
+    if len(timeline["segment_end"]):
+        ends.append(float(timeline["segment_end"][-1]))
+    if n_frames:
+        ends.append(float(timeline["frame_time"][-1]))
+    timeline["duration"] = np.float64(max(ends))
+    return timeline
+
+
+def save_timeline(session_id: int, timeline: Dict[str, np.ndarray]) -> str:
+    """Write a session's timeline; returns the path stored in the sessions row."""
+    directory = Path(config.TIMELINE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"session-{session_id}.npz"
+    tmp_path = directory / f".session-{session_id}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **timeline)
+    os.replace(tmp_path, path)
+    return str(path)
+
+
+def load_timeline(path: str) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _downsample(times: np.ndarray, columns: Dict[str, np.ndarray], max_points: int) -> Dict[str, List]:
+    """Average rows into at most max_points equal-count buckets (NaN-aware)."""
+    n = len(times)
+    if n > max_points > 0:
+        edges = np.linspace(0, n, max_points + 1).astype(int)
+        times = np.add.reduceat(times, edges[:-1]) / np.diff(edges)
+        reduced = {}
+        for name, values in columns.items():
+            values = values.astype(np.float64)
+            valid = ~np.isnan(values)
+            sums = np.add.reduceat(np.where(valid, values, 0.0), edges[:-1])
+            counts = np.add.reduceat(valid.astype(np.int64), edges[:-1])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                reduced[name] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        columns = reduced
+    out = {"time": [round(float(t), 3) for t in times]}
+    for name, values in columns.items():
+        out[name] = [None if np.isnan(v) else round(float(v), 4) for v in values.astype(np.float64)]
+    return out
+
+
+def timeline_window(timeline: Dict[str, np.ndarray], start: float = 0.0, end: Optional[float] = None,
+                    max_points: int = 500) -> Dict:
+    """
+    JSON-ready slice of a timeline between start and end (seconds). Frame
+    series are averaged down to at most max_points points (gaze becomes the
+    eye-contact fraction of each bucket); segments and words overlapping
+    the window are returned as they are (no words for timelines saved
+    without ASR word timestamps).
+    """
+    end = float(timeline["duration"]) if end is None else end
+
+    frame_time = timeline["frame_time"]
+    in_window = (frame_time >= start) & (frame_time <= end)
+    video = _downsample(frame_time[in_window], {
+        "tilt": timeline["frame_tilt"][in_window],
+        "gaze": timeline["frame_gaze"][in_window],
+        "movement": timeline["frame_movement"][in_window],
+    }, max_points)
+
+    overlaps = (timeline["segment_end"] >= start) & (timeline["segment_start"] <= end)
+    audio = {
+        name[len("segment_"):]: [round(float(v), 3) for v in timeline[name][overlaps]]
+        for name in SEGMENT_COLUMNS
+    }
+    words = {"start": [], "end": [], "text": [], "filler": []}
+    if "word_start" in timeline:
+        overlaps = (timeline["word_end"] >= start) & (timeline["word_start"] <= end)
+        words = {
+            "start": [round(float(v), 3) for v in timeline["word_start"][overlaps]],
+            "end": [round(float(v), 3) for v in timeline["word_end"][overlaps]],
+            "text": [str(v) for v in timeline["word_text"][overlaps]],
+            "filler": [bool(v) for v in timeline["word_filler"][overlaps]],
+        }
+    return {
+        "duration": round(float(timeline["duration"]), 3),
+        "start": start,
+        "end": end,
+        "video": video,
+        "audio": audio,
+        "words": words,
+    }
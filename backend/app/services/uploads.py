@@ -0,0 +1,47 @@
+# backend/app/services/uploads.py
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from .. import config
+
+
+async def save_upload(upload_file, directory: Optional[Union[str, Path]] = None) -> Tuple[str, str]:
+    """
+    Stream an uploaded file to disk in fixed-size chunks and return
+    (path, sha256 hex digest). The digest is computed on the same pass.
+
+    This is the only copy of the upload the backend makes: every analyzer
+    receives this path, so memory use stays at one chunk regardless of the
+    upload size. The caller owns the file and must delete it.
+    """
+    digest = hashlib.sha256()
+    suffix = Path(upload_file.filename or "").suffix or ".mp4"
+    if directory is not None:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=directory) as tmp:
+        try:
+            while True:
+                chunk = await upload_file.read(config.UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                tmp.write(chunk)
+                digest.update(chunk)
+        except BaseException:
+            tmp.close()
+            remove_upload(tmp.name)
+            raise
+        return tmp.name, digest.hexdigest()
+
+
+def remove_upload(path: Optional[str]):
+    """Delete a saved upload, ignoring files that are already gone."""
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
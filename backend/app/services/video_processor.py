@@ -1,175 +1,488 @@
 # backend/app/services/video_processor.py
-import cv2
-import numpy as np
-import tempfile
 import os
-from pathlib import Path
-from typing import Dict, Tuple
 
-import mediapipe as mp
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .. import config
+from .graph_pool import GraphPool
+from .result_cache import settings_version
+
+
+# OpenCV and MediaPipe are imported on first use: the API process only
+# scores landmark tensors and builds timelines, so it starts without them.
+def _cv2():
+    try:
+        import cv2
+    except ImportError as e:
+        raise RuntimeError(
+            "The 'opencv-python' package is required for video analysis. "
+            "Install it with 'pip install opencv-python'.") from e
+    return cv2
+
+
+def _mediapipe():
+    try:
+        import mediapipe as mp
+    except ImportError as e:
+        raise RuntimeError(
+            "The 'mediapipe' package is required for video analysis. "
+            "Install it with 'pip install mediapipe'.") from e
+    return mp
+
+# Bump when sampling or landmark detection change (cached landmark tensors become stale);
+# the sampling and face-ROI settings are folded in, so changing them does the same
+VIDEO_LANDMARKS_VERSION = settings_version(
+    "landmarks-2",
+    config.VIDEO_SAMPLE_HZ, config.VIDEO_MAX_WIDTH, config.VIDEO_SEEK_MIN_STEP,
+    config.VIDEO_FACE_ROI, config.VIDEO_FACE_ROI_SIZE, config.VIDEO_FACE_ROI_SCALE,
+    config.VIDEO_HEAD_MIN_VISIBILITY,
+)
+# Bump when the posture/gaze/movement heuristics change (landmarks are re-scored, not re-detected)
+VIDEO_SCORING_VERSION = "scores-1"
+# Part of the result cache key for video results
+VIDEO_ANALYZER_VERSION = f"{VIDEO_LANDMARKS_VERSION}/{VIDEO_SCORING_VERSION}"
+
+# Landmark tensor layout: pose rows are the 33 Pose landmarks as (x, y, visibility),
+# face rows the FaceMesh gaze landmarks as (x, y, z); x/y are normalized to the
+# full frame, rows of undetected people/faces are NaN
+N_POSE_LANDMARKS = 33
+# nose tip ~1, left eye inner ~33, right eye inner ~263 (indices may vary; this is approximate)
+FACE_GAZE_LANDMARKS = (1, 33, 263)
+_NOSE, _LEFT_SHOULDER, _RIGHT_SHOULDER = 0, 11, 12
+# no pose landmarks detected: mild penalty by assuming larger tilt
+_NO_POSE_TILT_DEG = 30.0
+
+def create_graphs():
+    """Build the Pose + FaceMesh pair used for per-frame analysis (caller closes them)."""
+    mp = _mediapipe()
+    pose = mp.solutions.pose.Pose(static_image_mode=False, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+    # head crops move from frame to frame, so the cascade detects the face in each crop instead of tracking
+    face_mesh = mp.solutions.face_mesh.FaceMesh(static_image_mode=config.VIDEO_FACE_ROI, max_num_faces=1,
+                                                refine_landmarks=True, min_detection_confidence=0.5)
+    return pose, face_mesh
+
+
+def _create_warm_graphs():
+    """create_graphs() plus one blank frame through each graph so the models are loaded."""
+    pose, face_mesh = create_graphs()
+    blank = np.zeros((64, 64, 3), dtype=np.uint8)
+    pose.process(blank)
+    face_mesh.process(blank)
+    pose.reset()
+    face_mesh.reset()
+    return pose, face_mesh
+
+
+# Warm Pose + FaceMesh pairs of this process, checked out per video / live session
+graph_pool = GraphPool(_create_warm_graphs, config.VIDEO_GRAPH_POOL_SIZE, config.VIDEO_GRAPH_MAX_WAIT_SECONDS)
+
+
+def warm_up(pool_size: Optional[int] = None):
+    """
+    Build this process's MediaPipe graph pool up front so the first
+    request gets a warm Pose + FaceMesh pair (worker initializer, which
+    passes VIDEO_WORKER_GRAPH_POOL_SIZE: a worker runs one video at a time).
+    """
+    if pool_size is not None:
+        graph_pool.size = max(1, pool_size)
+    graph_pool.fill()
+
+
+# pose landmarks 0-10: nose, eyes, ears and mouth corners
+_POSE_HEAD_LANDMARKS = range(11)
+
 
-mp_pose = mp.solutions.pose
-mp_face_mesh = mp.solutions.face_mesh
+def _head_roi(pose_landmarks, width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Square head region (x0, y0, x1, y1) in pixels of the inference frame,
+    derived from the pose's face landmarks, or None when the head is not
+    confidently visible.
+    """
+    head = [pose_landmarks[i] for i in _POSE_HEAD_LANDMARKS]
+    if head[0].visibility < config.VIDEO_HEAD_MIN_VISIBILITY:
+        return None
+    xs = [p.x * width for p in head]
+    ys = [p.y * height for p in head]
+    # the pose points span eyes-ears-mouth; widen to cover forehead and chin
+    side = max(max(xs) - min(xs), max(ys) - min(ys), 16.0) * config.VIDEO_FACE_ROI_SCALE
+    cx = (max(xs) + min(xs)) / 2.0
+    cy = (max(ys) + min(ys)) / 2.0
+    x0 = int(max(0, cx - side / 2))
+    y0 = int(max(0, cy - side / 2))
+    x1 = int(min(width, cx + side / 2))
+    y1 = int(min(height, cy + side / 2))
+    if x1 - x0 < 8 or y1 - y0 < 8:
+        return None
+    return x0, y0, x1, y1
+
+
+def detect_landmarks(pose, face_mesh, frame, pose_out: np.ndarray, face_out: np.ndarray) -> bool:
+    """
+    Run Pose + FaceMesh on one BGR frame and write the landmarks into
+    preallocated rows: pose_out (33 x 3) and face_out (3 x 3), see the
+    tensor layout above. Rows of undetected parts are left NaN.
+    Returns whether a person was detected.
+
+    With FLUENTIQ_VIDEO_FACE_ROI on (default) FaceMesh runs on the head crop
+    found by Pose; when Pose finds no confident head (missed pose, turned
+    away, nose visibility below FLUENTIQ_VIDEO_HEAD_MIN_VISIBILITY) it falls
+    back to the full frame, so gaze is only lost when FaceMesh finds no face.
+    """
+    cv2 = _cv2()
+    # convert BGR -> RGB
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    inf_h, inf_w = rgb.shape[:2]
+    pose_out.fill(np.nan)
+    face_out.fill(np.nan)
+    head_roi = None
+
+    # Pose
+    pose_res = pose.process(rgb)
+    if pose_res.pose_landmarks:
+        lm = pose_res.pose_landmarks.landmark
+        pose_out[:] = [(p.x, p.y, p.visibility) for p in lm[:N_POSE_LANDMARKS]]
+        if config.VIDEO_FACE_ROI:
+            head_roi = _head_roi(lm, inf_w, inf_h)
+
+    # Face: only the gaze landmarks are kept
+    if head_roi is None:
+        face_res = face_mesh.process(rgb)
+        to_frame = None
+    else:
+        # cascade: face mesh on the head crop only, at reduced resolution
+        x0, y0, x1, y1 = head_roi
+        crop = rgb[y0:y1, x0:x1]
+        side = max(x1 - x0, y1 - y0)
+        if side > config.VIDEO_FACE_ROI_SIZE:
+            scale = config.VIDEO_FACE_ROI_SIZE / float(side)
+            crop = cv2.resize(crop, (max(1, int(round((x1 - x0) * scale))), max(1, int(round((y1 - y0) * scale)))),
+                              interpolation=cv2.INTER_AREA)
+        face_res = face_mesh.process(np.ascontiguousarray(crop))
+        # crop-normalized -> frame-normalized, so the gaze thresholds keep their meaning
+        to_frame = (x0 / inf_w, y0 / inf_h, (x1 - x0) / inf_w, (y1 - y0) / inf_h)
 
-# helper: compute angle between three points (in degrees)
-def _angle_between(a, b, c):
-    # angle at b formed by points a-b-c
-    ba = np.array(a) - np.array(b)
-    bc = np.array(c) - np.array(b)
-    cosine = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc) + 1e-9)
-    cosine = np.clip(cosine, -1.0, 1.0)
-    angle = np.degrees(np.arccos(cosine))
-    return float(angle)
+    if face_res.multi_face_landmarks:
+        fm = face_res.multi_face_landmarks[0].landmark
+        if len(fm) > max(FACE_GAZE_LANDMARKS):
+            face_out[:] = [(fm[i].x, fm[i].y, fm[i].z) for i in FACE_GAZE_LANDMARKS]
+            if to_frame is not None:
+                off_x, off_y, scale_x, scale_y = to_frame
+                face_out[:, 0] = off_x + face_out[:, 0] * scale_x
+                face_out[:, 1] = off_y + face_out[:, 1] * scale_y
+    return pose_res.pose_landmarks is not None
 
-def _percentage_in_range(values, low, high):
-    if len(values) == 0:
-        return 0.0
-    arr = np.array(values)
-    return float(((arr >= low) & (arr <= high)).sum() / arr.size)
 
-async def analyze_video_file(upload_file) -> Dict:
+def frame_features(pose_lm: np.ndarray, face_lm: np.ndarray, frame_size) -> Dict[str, np.ndarray]:
     """
-    Save uploaded video -> sample frames -> run MediaPipe Pose + FaceMesh.
-    Returns posture/gaze/movement stats and scores (0-100).
+    Vectorized per-frame heuristics over landmark tensors (frames x landmarks x 3).
+    Returns {"tilts": shoulder tilt in degrees, "gazes": eye contact 0/1,
+    "noses": nose point in pixels of the original frame size, NaN when no
+    person was detected}.
     """
-    suffix = Path(upload_file.filename).suffix or ".mp4"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        contents = await upload_file.read()
-        tmp.write(contents)
-        tmp_path = tmp.name
+    pose_lm = np.asarray(pose_lm, dtype=np.float64)
+    face_lm = np.asarray(face_lm, dtype=np.float64)
+    w, h = float(frame_size[0]), float(frame_size[1])
+    has_pose = ~np.isnan(pose_lm[:, _NOSE, 0])
+
+    # compute tilt angle of shoulders relative to horizontal, in image coords
+    dx = (pose_lm[:, _RIGHT_SHOULDER, 0] - pose_lm[:, _LEFT_SHOULDER, 0]) * w
+    dy = (pose_lm[:, _RIGHT_SHOULDER, 1] - pose_lm[:, _LEFT_SHOULDER, 1]) * h
+    with np.errstate(invalid="ignore"):
+        tilts = np.abs(np.degrees(np.arctan2(dy, dx)))
+    tilts = np.where(has_pose, tilts, _NO_POSE_TILT_DEG)
+
+    # nose position, used for movement magnitude between frames
+    noses = pose_lm[:, _NOSE, :2] * (w, h)
+
+    # gaze: if nose is roughly centered between eyes horizontally and not strongly tilted, likely facing camera
+    eye_mid = (face_lm[:, 1, :2] + face_lm[:, 2, :2]) / 2.0
+    offset = np.abs(face_lm[:, 0, :2] - eye_mid)
+    # thresholds tuned empirically; NaN (no face) compares False
+    with np.errstate(invalid="ignore"):
+        gazes = ((offset[:, 0] < 0.03) & (offset[:, 1] < 0.05)).astype(np.int8)
 
+    return {"tilts": tilts, "gazes": gazes, "noses": noses}
+
+
+def frame_movements(noses: np.ndarray) -> np.ndarray:
+    """
+    Per-frame nose displacement (pixels) from the previous frame where a
+    person was detected; NaN for frames without a person and for the first
+    detection.
+    """
+    movements = np.full(len(noses), np.nan)
+    detected = np.flatnonzero(~np.isnan(noses[:, 0]))
+    if len(detected) > 1:
+        movements[detected[1:]] = np.linalg.norm(np.diff(noses[detected], axis=0), axis=1)
+    return movements
+
+
+def movement_magnitudes(noses: np.ndarray) -> np.ndarray:
+    """Nose displacement (pixels) between consecutive frames where a person was detected."""
+    movements = frame_movements(noses)
+    return movements[~np.isnan(movements)]
+
+
+def analyze_frame(pose, face_mesh, frame, frame_size: Optional[Tuple[int, int]] = None
+                  ) -> Tuple[float, int, Optional[Tuple[float, float]]]:
+    """
+    Per-frame posture/gaze heuristics on one BGR frame (live sessions).
+    Returns (shoulder tilt in degrees, eye contact 0/1, nose point in pixels
+    or None when no person was detected).
+
+    frame_size: (width, height) of the original frame when `frame` was
+    downscaled; pixel coordinates (and so movement magnitudes) are reported
+    at that size, which keeps scores independent of the inference resolution.
+    """
+    if frame_size is None:
+        frame_size = (frame.shape[1], frame.shape[0])
+    pose_lm = np.empty((1, N_POSE_LANDMARKS, 3), dtype=np.float32)
+    face_lm = np.empty((1, len(FACE_GAZE_LANDMARKS), 3), dtype=np.float32)
+    detect_landmarks(pose, face_mesh, frame, pose_lm[0], face_lm[0])
+
+    features = frame_features(pose_lm, face_lm, frame_size)
+    nose = features["noses"][0]
+    nose_pt = None if np.isnan(nose[0]) else (float(nose[0]), float(nose[1]))
+    return float(features["tilts"][0]), int(features["gazes"][0]), nose_pt
+
+
+def summarize_video(shoulder_tilt_list, gaze_contact_list, movement_magnitudes,
+                    duration: float, frames_analyzed: int) -> Dict:
+    """Turn per-frame features (lists or arrays) into the video stats and 0-100 scores."""
+    tilts = np.asarray(shoulder_tilt_list, dtype=np.float64)
+    gazes = np.asarray(gaze_contact_list, dtype=np.float64)
+    movements = np.asarray(movement_magnitudes, dtype=np.float64)
+
+    # compute stats
+    frames_analyzed = max(1, frames_analyzed)
+    avg_shoulder_tilt = float(tilts.mean()) if tilts.size else _NO_POSE_TILT_DEG
+    # percent eye contact
+    percent_eye_contact = float(gazes.mean()) if gazes.size else 0.0
+    # movement score: high movement magnitude -> lower score
+    avg_movement = float(movements.mean()) if movements.size else 0.0
+
+    # Score heuristics (0-100)
+    # Posture: shoulder tilt near 0 is ideal; penalize larger tilt
+    posture_score = int(max(0, min(100, 100 - (avg_shoulder_tilt * 1.5))))  # ~0 deg ->100, 30deg->55
+    # Gaze: percent eye contact scaled to 0-100
+    gaze_score = int(round(min(100, percent_eye_contact * 100)))
+    # Movement: prefer small movement; large movements lower score
+    movement_score = int(max(0, min(100, 100 - avg_movement * 50)))
+
+    video_stats = {
+        "duration_seconds": round(duration, 2),
+        "frames_analyzed": int(frames_analyzed),
+        "avg_shoulder_tilt_deg": round(avg_shoulder_tilt, 2),
+        "percent_eye_contact": round(percent_eye_contact, 3),
+    }
+
+    video_scores = {
+        "posture_score": int(posture_score),
+        "gaze_score": int(gaze_score),
+        "movement_score": int(movement_score),
+    }
+
+    return {
+        "scores": video_scores,
+        "stats": video_stats,
+    }
+
+
+def _sampling_step(fps: float, target_hz: Optional[float] = None) -> int:
+    """Frames between two samples (1-based sample indices are multiples of it)."""
+    target_hz = target_hz or config.VIDEO_SAMPLE_HZ
+    return max(1, int(round(fps / target_hz))) if target_hz > 0 else 1
+
+
+def iter_sampled_frames(cap, fps: float, target_hz: Optional[float] = None,
+                        max_width: Optional[int] = None,
+                        start_frame: int = 0, end_frame: Optional[int] = None):
+    """
+    Sampling engine: yield (frame_idx, frame, (orig_width, orig_height)) for
+    every sampled frame, where frame_idx is 1-based and a multiple of the
+    sampling step (round(fps / target_hz)).
+
+    Only sampled frames are converted to images: skipped frames go through
+    grab(), which advances the demuxer/decoder without producing a BGR
+    image. When the step is large (sparse sampling), seeking with
+    CAP_PROP_POS_FRAMES to the next sample is cheaper than walking through
+    the frames in between. Frames wider than max_width are downscaled
+    before inference.
+    """
+    cv2 = _cv2()
+    max_width = config.VIDEO_MAX_WIDTH if max_width is None else max_width
+    step = _sampling_step(fps, target_hz)
+    use_seek = step >= config.VIDEO_SEEK_MIN_STEP
+
+    # index of the next frame the decoder will return (0-based)
+    position = start_frame
+    if start_frame > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    # first 1-based index at or after start_frame + 1 that is a multiple of step
+    next_sample = ((start_frame // step) + 1) * step
+    while end_frame is None or next_sample <= end_frame:
+        target_pos = next_sample - 1
+        if use_seek and target_pos - position > 1:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target_pos)
+            position = target_pos
+        else:
+            ok = True
+            while position < target_pos:
+                if not cap.grab():
+                    ok = False
+                    break
+                position += 1
+            if not ok:
+                return
+
+        # only the sampled frame is retrieved (decoded into a BGR image)
+        if not cap.grab():
+            return
+        position += 1
+        ret, frame = cap.retrieve()
+        if not ret:
+            return
+
+        h, w = frame.shape[:2]
+        if max_width and w > max_width:
+            scale = max_width / float(w)
+            frame = cv2.resize(frame, (max_width, int(round(h * scale))), interpolation=cv2.INTER_AREA)
+        yield next_sample, frame, (w, h)
+        next_sample += step
+
+
+def probe_video(path: str) -> Dict:
+    """Read fps / frame count / duration from the container header."""
+    cv2 = _cv2()
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError("Cannot open video file for processing.")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    cap.release()
+    return {
+        "fps": fps,
+        "frame_count": frame_count,
+        "duration": frame_count / fps if fps > 0 else 0.0,
+    }
+
+
+def _empty_landmarks(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    return (np.full((n, N_POSE_LANDMARKS, 3), np.nan, dtype=np.float32),
+            np.full((n, len(FACE_GAZE_LANDMARKS), 3), np.nan, dtype=np.float32))
+
+
+def extract_video_features(path: str, start_frame: int = 0, end_frame: Optional[int] = None,
+                           progress: Optional[Callable[[float], None]] = None) -> Dict:
+    """
+    Detect landmarks on the sampled frames in (start_frame, end_frame]
+    (1-based frame numbers; end_frame None = to the end of the video) with a
+    Pose + FaceMesh pair checked out of the process's graph pool. Returns
+    {"frame_indices", "pose", "face", "frame_size", "graph_wait_seconds",
+    "graph_stats"}: landmark tensors preallocated for the expected number
+    of samples (see the layout above), so shards of one video can be merged
+    and scored in one vectorized pass, plus the wait for the graphs and the
+    worker's graph pool stats (keyed by "pid") for get_pool_stats.
+
+    progress: optional callback receiving percent complete (0-100) of this
+    range; it is called roughly every 5%.
+    """
+    cv2 = _cv2()
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError("Cannot open video file for processing.")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    last_frame = end_frame if end_frame is not None else frame_count
+    span = max(1, last_frame - start_frame)
+
+    capacity = max(16, span // _sampling_step(fps) + 2)
+    frame_indices = np.zeros(capacity, dtype=np.int32)
+    pose_lm, face_lm = _empty_landmarks(capacity)
+    frame_size = (0, 0)
+    n = 0
+
+    graphs, graph_wait = graph_pool.acquire()
+    pose, face_mesh = graphs
     try:
-        cap = cv2.VideoCapture(tmp_path)
-        if not cap.isOpened():
-            raise RuntimeError("Cannot open video file for processing.")
-
-        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
-        duration = frame_count / fps if fps > 0 else 0.0
-
-        # sample every Nth frame to speed up
-        sample_rate = max(1, int(fps * 0.5))  # roughly 1 sample every 2 seconds
-        frames_analyzed = 0
-
-        shoulder_tilt_list = []
-        gaze_contact_list = []   # 1 if eyes facing camera-like, else 0
-        movement_magnitudes = []
-
-        prev_landmarks = None
-        prev_nose = None
-
-        pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5, min_tracking_confidence=0.5)
-        face_mesh = mp_face_mesh.FaceMesh(static_image_mode=False, max_num_faces=1, refine_landmarks=True, min_detection_confidence=0.5)
-
-        frame_idx = 0
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            frame_idx += 1
-
-            if frame_idx % sample_rate != 0:
-                continue
-
-            frames_analyzed += 1
-            # convert BGR -> RGB
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-            # Pose
-            pose_res = pose.process(rgb)
-            if pose_res.pose_landmarks:
-                lm = pose_res.pose_landmarks.landmark
-                # shoulder points: left (11), right (12) - mp indices
-                left_sh = lm[11]
-                right_sh = lm[12]
-                # convert to image coords
-                h, w, _ = frame.shape
-                left_sh_pt = (left_sh.x * w, left_sh.y * h)
-                right_sh_pt = (right_sh.x * w, right_sh.y * h)
-                # compute tilt angle of shoulders relative to horizontal
-                dx = right_sh_pt[0] - left_sh_pt[0]
-                dy = right_sh_pt[1] - left_sh_pt[1]
-                tilt_rad = np.arctan2(dy, dx)
-                tilt_deg = np.degrees(tilt_rad)
-                shoulder_tilt_list.append(abs(tilt_deg))
-                # movement magnitude (nose movement)
-                nose = lm[0]
-                nose_pt = (nose.x * w, nose.y * h)
-                if prev_nose is not None:
-                    movement = np.linalg.norm(np.array(nose_pt) - np.array(prev_nose))
-                    movement_magnitudes.append(movement)
-                prev_nose = nose_pt
-            else:
-                # no pose landmarks detected, add mild penalty by assuming larger tilt
-                shoulder_tilt_list.append(30.0)
-
-            # Face / gaze: use nose + inner eye landmarks to approximate facing direction
-            face_res = face_mesh.process(rgb)
-            if face_res.multi_face_landmarks and len(face_res.multi_face_landmarks) > 0:
-                fm = face_res.multi_face_landmarks[0].landmark
-                # Using landmarks: nose tip ~1, left eye inner ~33, right eye inner ~263 (indices may vary; this is approximate)
-                # For robustness, try multiple indices and fallback
-                try:
-                    nose_lm = fm[1]
-                    left_eye = fm[33]
-                    right_eye = fm[263]
-                    # vector from nose to midpoint of eyes
-                    eye_mid = ((left_eye.x + right_eye.x) / 2.0, (left_eye.y + right_eye.y) / 2.0)
-                    nose_pt = (nose_lm.x, nose_lm.y)
-                    # simple heuristic: if nose is roughly centered between eyes horizontally and not strongly tilted, likely facing camera
-                    horiz_offset = abs(nose_pt[0] - eye_mid[0])
-                    vert_offset = abs(nose_pt[1] - eye_mid[1])
-                    # thresholds tuned empirically
-                    if horiz_offset < 0.03 and vert_offset < 0.05:
-                        gaze_contact_list.append(1)
-                    else:
-                        gaze_contact_list.append(0)
-                except Exception:
-                    gaze_contact_list.append(0)
-            else:
-                gaze_contact_list.append(0)
-
-        # cleanup mediapipe
-        pose.close()
-        face_mesh.close()
-        cap.release()
+        last_reported = 0.0
+        # sample VIDEO_SAMPLE_HZ frames per second; skipped frames are never converted
+        for frame_idx, frame, frame_size in iter_sampled_frames(cap, fps, start_frame=start_frame, end_frame=end_frame):
+            if progress is not None and last_frame > 0:
+                percent = min(100.0, 100.0 * (frame_idx - start_frame) / span)
+                if percent - last_reported >= 5.0:
+                    progress(round(percent, 1))
+                    last_reported = percent
 
-        # compute stats
-        frames_analyzed = max(1, frames_analyzed)
-        avg_shoulder_tilt = float(np.mean(shoulder_tilt_list)) if shoulder_tilt_list else 30.0
-        # percent eye contact
-        percent_eye_contact = float(np.sum(gaze_contact_list) / len(gaze_contact_list)) if gaze_contact_list else 0.0
-        # movement score: high movement magnitude -> lower score
-        avg_movement = float(np.mean(movement_magnitudes)) if movement_magnitudes else 0.0
-
-        # Score heuristics (0-100)
-        # Posture: shoulder tilt near 0 is ideal; penalize larger tilt
-        posture_score = int(max(0, min(100, 100 - (avg_shoulder_tilt * 1.5))))  # ~0 deg ->100, 30deg->55
-        # Gaze: percent eye contact scaled to 0-100
-        gaze_score = int(round(min(100, percent_eye_contact * 100)))
-        # Movement: prefer small movement; large movements lower score
-        movement_score = int(max(0, min(100, 100 - avg_movement * 50)))
-
-        video_stats = {
-            "duration_seconds": round(duration, 2),
-            "frames_analyzed": int(frames_analyzed),
-            "avg_shoulder_tilt_deg": round(avg_shoulder_tilt, 2),
-            "percent_eye_contact": round(percent_eye_contact, 3),
-        }
-
-        video_scores = {
-            "posture_score": int(posture_score),
-            "gaze_score": int(gaze_score),
-            "movement_score": int(movement_score),
-        }
-
-        return {
-            "scores": video_scores,
-            "stats": video_stats,
-        }
+            if n == capacity:
+                # frame count in the header was short: grow the buffers
+                more_pose, more_face = _empty_landmarks(capacity)
+                frame_indices = np.concatenate([frame_indices, np.zeros(capacity, dtype=np.int32)])
+                pose_lm = np.concatenate([pose_lm, more_pose])
+                face_lm = np.concatenate([face_lm, more_face])
+                capacity *= 2
 
+            detect_landmarks(pose, face_mesh, frame, pose_lm[n], face_lm[n])
+            frame_indices[n] = frame_idx
+            n += 1
     finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
+        # hand the graphs back (reset) for the next video
+        graph_pool.release(graphs)
+        cap.release()
+
+    return {
+        "frame_indices": frame_indices[:n].copy(),
+        "pose": pose_lm[:n].copy(),
+        "face": face_lm[:n].copy(),
+        "frame_size": np.array(frame_size, dtype=np.int32),
+        "graph_wait_seconds": graph_wait,
+        "graph_stats": {"pid": os.getpid(), **graph_pool.stats()},
+    }
+
+
+def plan_video_shards(frame_count: int, fps: float, n_shards: int) -> List[Tuple[int, Optional[int]]]:
+    """
+    Split the timeline into n_shards contiguous (start_frame, end_frame]
+    ranges. Boundaries fall on sampling-step multiples, so the union of
+    the shards samples exactly the frames a single pass would; the last
+    shard runs to the end of the file (frame counts can be approximate).
+    """
+    step = _sampling_step(fps)
+    n_samples = max(1, frame_count // step)
+    n_shards = max(1, min(n_shards, n_samples))
+
+    bounds = [round(i * n_samples / n_shards) * step for i in range(n_shards)]
+    shards = []
+    for i, start in enumerate(bounds):
+        end = bounds[i + 1] if i + 1 < len(bounds) else None
+        shards.append((start, end))
+    return shards
+
+
+def merge_video_features(parts: List[Dict]) -> Dict:
+    """Concatenate per-shard landmark tensors in timeline order."""
+    parts = sorted(parts, key=lambda p: p["frame_indices"][0] if len(p["frame_indices"]) else np.inf)
+    sizes = [p["frame_size"] for p in parts if p["frame_size"].any()]
+    return {
+        "frame_indices": np.concatenate([p["frame_indices"] for p in parts]),
+        "pose": np.concatenate([p["pose"] for p in parts]),
+        "face": np.concatenate([p["face"] for p in parts]),
+        "frame_size": sizes[0] if sizes else np.zeros(2, dtype=np.int32),
+        "graph_wait_seconds": sum(p.get("graph_wait_seconds", 0.0) for p in parts),
+    }
+
+
+def summarize_features(features: Dict, duration: float) -> Dict:
+    """
+    Score landmark tensors (fresh, merged from shards, or loaded from a
+    saved artifact) in one vectorized pass. Movement is computed over the
+    whole timeline, so it is continuous across shard boundaries.
+    """
+    per_frame = frame_features(features["pose"], features["face"], features["frame_size"])
+    return summarize_video(
+        per_frame["tilts"], per_frame["gazes"], movement_magnitudes(per_frame["noses"]),
+        duration, len(features["frame_indices"]),
+    )
@@ -0,0 +1,317 @@
+# backend/app/services/worker_pool.py
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .. import config
+from .graph_pool import combine_stats
+
+
+class PoolBusyError(RuntimeError):
+    """Raised when an analyzer pool's queue is full (maps to HTTP 503)."""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        super().__init__(f"The '{pool_name}' analyzer pool is at capacity; retry later.")
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+
+
+class AnalyzerPool:
+    """
+    A process pool dedicated to one analyzer (ASR, NLP or vision).
+
+    Workers are started lazily with `initializer`, which loads the heavy
+    model once per process so later tasks hit a warm worker. At most
+    `max_workers` tasks run at a time and at most `max_queue` more may
+    wait; anything beyond that is rejected with PoolBusyError instead of
+    piling up behind a slow upload. warm() starts every worker ahead of
+    the first request; readiness() reports how far that got.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        initializer: Optional[Callable[[], None]] = None,
+        retry_after: int = config.POOL_RETRY_AFTER_SECONDS,
+    ):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._initializer = initializer
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._completed = 0
+        # cold -> warming -> ready | failed
+        self._state = "cold"
+        self._warm_seconds: Optional[float] = None
+        self._warm_error: Optional[str] = None
+        self._recovery: Optional[asyncio.Task] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # "spawn" avoids forking a parent that already holds torch /
+                # JVM / MediaPipe threads, which can deadlock the child.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._initializer,
+                )
+            return self._executor
+
+    def _acquire_slots(self, count: int = 1):
+        with self._lock:
+            if self._in_flight + count > self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PoolBusyError(self.name, self.retry_after)
+            self._in_flight += count
+
+    def _mark_loaded(self):
+        # a task finished on a worker, so its initializer (the model load)
+        # succeeded: an earlier failed warm-up no longer applies
+        with self._lock:
+            if self._state != "warming":
+                self._state = "ready"
+                self._warm_error = None
+
+    def _discard_broken(self, executor: ProcessPoolExecutor, error: BaseException):
+        """
+        A worker died (OOM, segfault): the executor is unusable. Drop it so
+        the next task starts a fresh one, report the pool failed and reload
+        its workers in the background so /ready recovers without traffic.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return  # another task of the same executor got here first
+            self._executor = None
+            self._state = "failed"
+            self._warm_error = f"worker crashed: {str(error) or error.__class__.__name__}"
+        executor.shutdown(wait=False, cancel_futures=True)
+        if self._recovery is None or self._recovery.done():
+            self._recovery = asyncio.get_running_loop().create_task(_warm_with_retry(self))
+
+    def _start(self, executor: ProcessPoolExecutor, fn: Callable[..., Any], arg_tuples: List[Tuple]) -> List[Future]:
+        """
+        Submit one request's tasks. The request holds min(tasks, workers)
+        slots, since that many workers can be busy with it; a slot is only
+        given back when a task really finishes on its worker, not when the
+        caller stops waiting (cancelling a running task does not stop it).
+        """
+        count = min(len(arg_tuples), self.max_workers)
+        self._acquire_slots(count)
+        remaining = len(arg_tuples)
+
+        def _finished(_future=None):
+            nonlocal remaining
+            with self._lock:
+                remaining -= 1
+                self._completed += 1
+                if remaining < count:
+                    self._in_flight -= 1
+
+        futures: List[Future] = []
+        try:
+            for args in arg_tuples:
+                future = executor.submit(fn, *args)
+                future.add_done_callback(_finished)
+                futures.append(future)
+        except BaseException:
+            for _ in range(len(arg_tuples) - len(futures)):
+                _finished()
+            for future in futures:
+                future.cancel()
+            raise
+        return futures
+
+    async def submit(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run `fn(*args)` on a worker process without blocking the event loop.
+        `fn` and its arguments must be picklable (module-level functions).
+        Raises BrokenProcessPool if a worker died; the pool restarts itself.
+        """
+        return (await self._run(fn, [args]))[0]
+
+    async def submit_many(
+        self,
+        fn: Callable[..., Any],
+        arg_tuples: Iterable[Tuple],
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> List[Any]:
+        """
+        Run `fn(*args)` for every tuple in `arg_tuples` across the pool's
+        workers and return the results in order. The request takes one
+        queue slot per worker it can keep busy (see _start); the executor
+        spreads the tasks over the workers. `on_done` is called in the
+        event loop as each task finishes (e.g. for progress reporting).
+        """
+        return await self._run(fn, list(arg_tuples), on_done)
+
+    async def _run(self, fn: Callable[..., Any], arg_tuples: List[Tuple],
+                   on_done: Optional[Callable[[], None]] = None) -> List[Any]:
+        if not arg_tuples:
+            return []
+        executor = self._get_executor()
+        try:
+            futures = self._start(executor, fn, arg_tuples)
+            waiters = [asyncio.wrap_future(future) for future in futures]
+            if on_done is not None:
+                for waiter in waiters:
+                    waiter.add_done_callback(lambda _f: on_done())
+            try:
+                results = await asyncio.gather(*waiters)
+            except BaseException:
+                # one task failed or the caller gave up: drop what has not started
+                for future in futures:
+                    future.cancel()
+                raise
+        except BrokenProcessPool as e:
+            self._discard_broken(executor, e)
+            raise
+        self._mark_loaded()
+        return results
+
+    async def warm(self):
+        """
+        Start all workers now (each runs the initializer, i.e. loads its
+        model) instead of on the first request. A failed start is recorded
+        for readiness() and the executor is dropped, so the next request
+        (or warm_pools' retry) tries again; the failure is cleared as soon
+        as a later task succeeds.
+        """
+        with self._lock:
+            if self._state in ("warming", "ready"):
+                return
+            self._state = "warming"
+            self._warm_error = None
+        t0 = time.perf_counter()
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            # one task per worker: with no idle worker yet, each submit spawns a process
+            await asyncio.gather(*(loop.run_in_executor(executor, _worker_pid) for _ in range(self.max_workers)))
+        except Exception as e:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+                self._state = "failed"
+                self._warm_error = str(e) or e.__class__.__name__
+            executor.shutdown(wait=False, cancel_futures=True)
+            return
+        with self._lock:
+            self._state = "ready"
+            self._warm_seconds = round(time.perf_counter() - t0, 3)
+
+    def readiness(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "workers": self.max_workers,
+                "warm_seconds": self._warm_seconds,
+                "error": self._warm_error,
+            }
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_size": self.max_queue,
+                "in_flight": self._in_flight,
+                "running": min(self._in_flight, self.max_workers),
+                "queued": max(0, self._in_flight - self.max_workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            recovery, self._recovery = self._recovery, None
+            self._state = "cold"
+        if recovery is not None:
+            recovery.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def _warm_asr():
+    from .audio_processor import warm_up
+    warm_up()
+
+
+def _warm_nlp():
+    from .text_processor import warm_up
+    warm_up()
+
+
+def _warm_vision():
+    from .video_processor import warm_up
+    warm_up(config.VIDEO_WORKER_GRAPH_POOL_SIZE)
+
+
+asr_pool = AnalyzerPool("asr", config.ASR_WORKERS, config.ASR_QUEUE_SIZE, initializer=_warm_asr)
+nlp_pool = AnalyzerPool("nlp", config.NLP_WORKERS, config.NLP_QUEUE_SIZE, initializer=_warm_nlp)
+vision_pool = AnalyzerPool("vision", config.VISION_WORKERS, config.VISION_QUEUE_SIZE, initializer=_warm_vision)
+
+
+# latest graph pool stats reported by each vision worker process, by pid
+_worker_graph_stats: Dict[int, Dict] = {}
+
+
+def record_worker_graph_stats(stats: Dict):
+    """Keep the graph pool stats a vision task returned (see extract_video_features)."""
+    stats = dict(stats)
+    _worker_graph_stats[stats.pop("pid")] = stats
+
+
+def get_pool_stats() -> Dict[str, Dict]:
+    stats = {pool.name: pool.stats() for pool in (asr_pool, nlp_pool, vision_pool)}
+    # MediaPipe graphs of this process (live sessions); only once video analysis was loaded here
+    video_processor = sys.modules.get(f"{__package__}.video_processor")
+    if video_processor is not None:
+        stats["vision_graphs"] = video_processor.graph_pool.stats()
+    if _worker_graph_stats:
+        stats["vision_worker_graphs"] = combine_stats(_worker_graph_stats.values())
+    return stats
+
+
+async def _warm_with_retry(pool: AnalyzerPool):
+    delay = max(1, config.WARM_UP_RETRY_SECONDS)
+    await pool.warm()
+    while pool.readiness()["state"] == "failed":
+        await asyncio.sleep(delay)
+        delay = min(2 * delay, max(1, config.WARM_UP_RETRY_MAX_SECONDS))
+        await pool.warm()
+
+
+async def warm_pools():
+    """
+    Load every analyzer's model in its workers (background task at API
+    startup). A pool that fails to start is retried with exponential
+    backoff (FLUENTIQ_WARM_UP_RETRY), so a transient failure does not keep
+    /ready at 503 until a restart.
+    """
+    await asyncio.gather(*(_warm_with_retry(pool) for pool in (asr_pool, nlp_pool, vision_pool)))
+
+
+def get_pool_readiness() -> Dict[str, Dict]:
+    return {pool.name: pool.readiness() for pool in (asr_pool, nlp_pool, vision_pool)}
+
+
+def shutdown_pools():
+    for pool in (asr_pool, nlp_pool, vision_pool):
+        pool.shutdown()
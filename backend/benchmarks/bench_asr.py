@@ -0,0 +1,81 @@
+# backend/benchmarks/bench_asr.py
+"""
+Compare ASR backend options by real-time factor (RTF = processing time /
+audio duration; lower is faster, < 1.0 is faster than real time).
+
+Usage (from backend/):
+    python -m benchmarks.bench_asr talk.mp4
+    python -m benchmarks.bench_asr talk.mp4 --option whisper:tiny:fp32 \\
+        --option whisper:base:int8 --option faster-whisper:base:int8 --threads 4
+"""
+import argparse
+import time
+
+from app.services.asr_backends import create_asr_backend
+from app.services.audio_extract import extract_pcm, load_pcm, SAMPLE_RATE
+from app.services.uploads import remove_upload
+
+DEFAULT_OPTIONS = [
+    "whisper:tiny:fp32",
+    "whisper:base:fp32",
+    "whisper:base:int8",
+    "faster-whisper:tiny:int8",
+    "faster-whisper:base:int8",
+    "faster-whisper:small:int8",
+]
+
+
+def _parse_option(option: str):
+    parts = option.split(":")
+    name = parts[0]
+    model_size = parts[1] if len(parts) > 1 else "base"
+    compute_type = parts[2] if len(parts) > 2 else None
+    return name, model_size, compute_type
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("media", help="audio or video file to transcribe")
+    parser.add_argument("--option", action="append", dest="options",
+                        help="backend:model_size[:compute_type], may be repeated")
+    parser.add_argument("--threads", type=int, default=0, help="CPU threads (0 = library default)")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per option (best is reported)")
+    args = parser.parse_args()
+
+    # decode once, like the pipeline does, so only ASR time is measured
+    pcm_path = extract_pcm(args.media)
+    try:
+        audio = load_pcm(pcm_path, mmap=False)
+        duration = len(audio) / SAMPLE_RATE
+        print(f"audio duration: {duration:.1f}s\n")
+        print(f"{'option':32} {'load s':>8} {'best s':>8} {'RTF':>7} {'words':>6}")
+
+        for option in args.options or DEFAULT_OPTIONS:
+            name, model_size, compute_type = _parse_option(option)
+            try:
+                backend = create_asr_backend(name, model_size, compute_type, args.threads, args.batch_size)
+                t0 = time.perf_counter()
+                backend.ensure_loaded()
+                load_seconds = time.perf_counter() - t0
+
+                best = None
+                result = {}
+                for _ in range(max(1, args.repeat)):
+                    t0 = time.perf_counter()
+                    result = backend.transcribe(audio)
+                    elapsed = time.perf_counter() - t0
+                    best = elapsed if best is None else min(best, elapsed)
+            except (RuntimeError, ValueError) as e:
+                print(f"{option:32} skipped: {e}")
+                continue
+
+            rtf = best / duration if duration > 0 else 0.0
+            words = len(result.get("text", "").split())
+            print(f"{backend.version:32} {load_seconds:8.2f} {best:8.2f} {rtf:7.3f} {words:6d}")
+    finally:
+        remove_upload(pcm_path)
+
+
+if __name__ == "__main__":
+    main()
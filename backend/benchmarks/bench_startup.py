@@ -0,0 +1,116 @@
+# backend/benchmarks/bench_startup.py
+"""
+Measure API cold start: how long `import app.main` takes in a fresh
+interpreter, which heavy model libraries that import pulls in (none is
+expected; they load in the pool workers), and the slowest imports. With
+--serve, also start uvicorn and time the first answer of /ping and the
+moment /ready reports every model loaded.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 5 --top 15 --serve --port 8765
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+HEAVY_MODULES = ("spacy", "language_tool_python", "nltk", "cv2", "mediapipe", "torch", "whisper", "faster_whisper")
+
+_PROBE = (
+    "import sys, time; t0 = time.perf_counter(); import app.main; "
+    "elapsed = time.perf_counter() - t0; "
+    f"print(elapsed, ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def _import_once():
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True).stdout
+    elapsed, _, heavy = out.strip().partition(" ")
+    return float(elapsed), [m for m in heavy.split(",") if m]
+
+
+def _slowest_imports(top: int):
+    """Cumulative time per module from python -X importtime (microseconds)."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def _get(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return response.status, json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"null")
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return None, None
+
+
+def _serve(port: int, timeout: float):
+    base = f"http://127.0.0.1:{port}"
+    t0 = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    ping_at = ready_at = None
+    readiness = None
+    try:
+        while time.perf_counter() - t0 < timeout and server.poll() is None:
+            if ping_at is None and _get(f"{base}/ping")[0] == 200:
+                ping_at = time.perf_counter() - t0
+            if ping_at is not None:
+                status, readiness = _get(f"{base}/ready")
+                if status == 200:
+                    ready_at = time.perf_counter() - t0
+                    break
+                if readiness and any(m["state"] == "failed" for m in readiness["models"].values()):
+                    break
+            time.sleep(0.05)
+        exit_code = server.poll()
+    finally:
+        server.terminate()
+        server.wait()
+
+    if exit_code is not None:
+        print(f"\nserver exited early with code {exit_code}")
+    print(f"\n/ping answered after  {ping_at:.2f}s" if ping_at is not None else "\n/ping never answered")
+    print(f"/ready 200 after      {ready_at:.2f}s" if ready_at is not None else "/ready never reported ready")
+    for name, model in ((readiness or {}).get("models") or {}).items():
+        print(f"  {name:8} {model['state']:8} warm {model['warm_seconds']}s  {model['error'] or ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters to time the import in")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--serve", action="store_true", help="also time /ping and /ready of a real server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for /ready")
+    args = parser.parse_args()
+
+    runs = [_import_once() for _ in range(max(1, args.repeat))]
+    times = [elapsed for elapsed, _ in runs]
+    print(f"import app.main: median {statistics.median(times):.3f}s  "
+          f"(min {min(times):.3f}s, max {max(times):.3f}s, {len(times)} runs)")
+    print(f"heavy modules imported: {', '.join(runs[0][1]) or 'none'}")
+
+    print("\nslowest imports (cumulative):")
+    for cumulative_us, name in _slowest_imports(args.top):
+        print(f"  {cumulative_us / 1000.0:8.1f} ms  {name}")
+
+    if args.serve:
+        _serve(args.port, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# backend/benchmarks/bench_text.py
+"""
+Compare the full en_core_web_sm pipeline (plus NLTK sentence splitting and
+regex word splitting, as text analysis used to do) with the lean pipeline
+from text_processor.load_nlp: load time, resident memory growth and
+per-transcript latency of the tokenization/POS pass, each in its own
+process. Grammar checking is not included (it does not depend on the
+spaCy pipeline).
+
+Usage (from backend/):
+    python -m benchmarks.bench_text transcript.txt
+    python -m benchmarks.bench_text transcript.txt --repeat 20 --batch 50
+"""
+import argparse
+import re
+import resource
+import subprocess
+import sys
+import time
+
+import spacy
+
+from app.services.text_processor import load_nlp
+
+
+def _rss_mb() -> float:
+    # peak resident set size of this process (KiB on Linux)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _full_pass(nlp, text):
+    import nltk
+    sentences = nltk.tokenize.sent_tokenize(text)
+    words = re.findall(r"\w+", text)
+    pos = [token.pos_ for token in nlp(text)]
+    return len(sentences), len(words), len(pos)
+
+
+def _lean_pass(nlp, text):
+    doc = nlp(text)
+    sentences = list(doc.sents)
+    words = [token.text for token in doc if re.search(r"\w", token.text)]
+    pos = [token.pos_ for token in doc]
+    return len(sentences), len(words), len(pos)
+
+
+def _time(label, load, run, text, repeat, batch):
+    rss_before = _rss_mb()
+    t0 = time.perf_counter()
+    nlp = load()
+    load_seconds = time.perf_counter() - t0
+    rss_growth = _rss_mb() - rss_before
+
+    run(nlp, text)  # warm caches
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        counts = run(nlp, text)
+    per_call_ms = 1000.0 * (time.perf_counter() - t0) / repeat
+
+    t0 = time.perf_counter()
+    for _doc in nlp.pipe([text] * batch):
+        pass
+    pipe_ms = 1000.0 * (time.perf_counter() - t0) / batch
+
+    print(f"{label:8} {load_seconds:8.2f} {rss_growth:9.1f} {per_call_ms:10.1f} {pipe_ms:10.1f}   "
+          f"sentences={counts[0]} words={counts[1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transcript", help="text file with a transcript")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=20, help="transcripts per nlp.pipe run")
+    parser.add_argument("--pipeline", choices=("lean", "full"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.pipeline is None:
+        # each pipeline in a fresh process so load time and memory are not shared
+        print(f"{'pipeline':8} {'load s':>8} {'+RSS MB':>9} {'ms/call':>10} {'ms/pipe':>10}")
+        for pipeline in ("full", "lean"):
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_text", args.transcript,
+                            "--repeat", str(args.repeat), "--batch", str(args.batch),
+                            "--pipeline", pipeline], check=True)
+        return
+
+    with open(args.transcript, encoding="utf-8") as f:
+        text = f.read().strip()
+    if args.pipeline == "lean":
+        _time("lean", load_nlp, _lean_pass, text, args.repeat, args.batch)
+    else:
+        _time("full", lambda: spacy.load("en_core_web_sm"), _full_pass, text, args.repeat, args.batch)
+
+
+if __name__ == "__main__":
+    main()
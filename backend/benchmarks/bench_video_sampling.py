@@ -0,0 +1,75 @@
+# backend/benchmarks/bench_video_sampling.py
+"""
+Compare the old read-every-frame loop with the sampling engine
+(iter_sampled_frames) on one video, reporting sampled frames per second
+of wall time. With --inference the Pose + FaceMesh heuristics run on each
+sampled frame too, so the downscaling gain is included.
+
+Usage (from backend/):
+    python -m benchmarks.bench_video_sampling talk.mp4
+    python -m benchmarks.bench_video_sampling talk.mp4 --hz 1 --max-width 480 --inference
+"""
+import argparse
+import time
+
+import cv2
+
+from app.services.video_processor import analyze_frame, create_graphs, iter_sampled_frames
+
+
+def _legacy_frames(cap, fps, target_hz):
+    """Original loop: cap.read() decodes every frame, all but each Nth are discarded."""
+    step = max(1, int(round(fps / target_hz)))
+    frame_idx = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame_idx += 1
+        if frame_idx % step != 0:
+            continue
+        h, w = frame.shape[:2]
+        yield frame_idx, frame, (w, h)
+
+
+def _run(path, make_iter, inference):
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    graphs = create_graphs() if inference else None
+
+    sampled = 0
+    t0 = time.perf_counter()
+    for _idx, frame, frame_size in make_iter(cap, fps):
+        sampled += 1
+        if graphs is not None:
+            analyze_frame(graphs[0], graphs[1], frame, frame_size)
+    elapsed = time.perf_counter() - t0
+
+    cap.release()
+    if graphs is not None:
+        for graph in graphs:
+            graph.close()
+    return sampled, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--hz", type=float, default=2.0, help="target sampling rate")
+    parser.add_argument("--max-width", type=int, default=640, help="downscale width for the new engine (0 = off)")
+    parser.add_argument("--inference", action="store_true", help="also run MediaPipe on sampled frames")
+    args = parser.parse_args()
+
+    runs = [
+        ("before: read every frame", lambda cap, fps: _legacy_frames(cap, fps, args.hz)),
+        ("after: grab/retrieve + resize", lambda cap, fps: iter_sampled_frames(cap, fps, args.hz, args.max_width)),
+    ]
+    print(f"{'mode':32} {'sampled':>8} {'seconds':>8} {'frames/s':>9}")
+    for label, make_iter in runs:
+        sampled, elapsed = _run(args.video, make_iter, args.inference)
+        rate = sampled / elapsed if elapsed > 0 else 0.0
+        print(f"{label:32} {sampled:8d} {elapsed:8.2f} {rate:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# backend/benchmarks/load_history.py
+"""
+Load test for the session history store: writer threads save sessions
+while reader threads run the history queries, against a throwaway
+database. Reports sustained sessions/s, write latency per save call and
+reader queries/s. By default every writer commits one session per call,
+as the API does (save_session); --group N saves N sessions per
+transaction, as batch ingestion does.
+
+Usage (from backend/):
+    python -m benchmarks.load_history
+    python -m benchmarks.load_history --writers 16 --readers 4 --seconds 20
+    python -m benchmarks.load_history --group 25
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+
+def _entry(i: int):
+    fused = {"fluency": 70 + i % 20, "grammar": 80, "coherence": 60, "readability": 55.0,
+             "overall": 72, "video": {"posture": 80, "gaze": 65, "movement": 90}}
+    return {
+        "transcript": f"load test session {i} " + "lorem ipsum " * 50,
+        "fused": fused,
+        "audio": {"scores": {"wpm": 130.0, "filler_count": 2}, "stats": {"word_count": 100}},
+        "text": {"scores": {"grammar_score": 80}, "stats": {"sentence_count": 8}},
+        "video": {"scores": {"posture_score": 80}, "stats": {"frames_analyzed": 120}},
+        "timeline": None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--group", type=int, default=1, help="sessions saved per transaction")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="fluentiq-load-")
+    os.environ["FLUENTIQ_DB_PATH"] = os.path.join(workdir, "load.db")
+    os.environ["FLUENTIQ_TIMELINE_DIR"] = os.path.join(workdir, "timelines")
+
+    # imported after the environment points the app at the throwaway database
+    from app.db.database import init_db, pool
+    from app.services.history_service import get_summary, save_sessions
+
+    init_db()
+    stop = threading.Event()
+    group = max(1, args.group)
+    latencies = [[] for _ in range(args.writers)]
+    reads = [0] * args.readers
+    errors = []
+
+    def _writer(slot: int):
+        i = slot
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                save_sessions([_entry(i + n * args.writers) for n in range(group)])
+            except Exception as e:
+                errors.append(e)
+                return
+            latencies[slot].append(time.perf_counter() - t0)
+            i += args.writers * group
+
+    def _reader(slot: int):
+        while not stop.is_set():
+            try:
+                get_summary()
+                conn = pool.acquire()
+                try:
+                    conn.execute("SELECT id, overall, fused_json FROM sessions ORDER BY id DESC LIMIT 20").fetchall()
+                finally:
+                    conn.close()
+            except Exception as e:
+                errors.append(e)
+                return
+            reads[slot] += 1
+
+    threads = [threading.Thread(target=_writer, args=(n,)) for n in range(args.writers)]
+    threads += [threading.Thread(target=_reader, args=(n,)) for n in range(args.readers)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    pool.close()
+
+    all_latencies = sorted(lat for per_writer in latencies for lat in per_writer)
+    calls = len(all_latencies)
+    saved = calls * group
+    print(f"{group} session(s) per transaction: {args.writers} writers, {args.readers} readers, {elapsed:.1f}s")
+    print(f"  sessions saved   {saved}  ({saved / elapsed:.1f}/s)")
+    if all_latencies:
+        p95 = all_latencies[min(calls - 1, int(0.95 * calls))]
+        print(f"  write latency    p50 {1000 * statistics.median(all_latencies):.1f} ms, p95 {1000 * p95:.1f} ms")
+    print(f"  reader queries   {sum(reads)}  ({sum(reads) / elapsed:.1f}/s)")
+    if errors:
+        print(f"  errors           {len(errors)}, first: {errors[0]!r}")
+    print(f"  database         {os.environ['FLUENTIQ_DB_PATH']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# backend/tests/conftest.py
+import sys
+from pathlib import Path
+
+import pytest
+
+# the app is imported as the `app` package, as uvicorn does from backend/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import config  # noqa: E402
+from app.db import database  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh, initialised database (and timeline directory) per test."""
+    path = tmp_path / "fluentiq.db"
+    pool = database.ConnectionPool(path, size=4)
+    monkeypatch.setattr(database, "DB_PATH", path)
+    monkeypatch.setattr(database, "pool", pool)
+    monkeypatch.setattr(config, "TIMELINE_DIR", tmp_path / "timelines")
+    database.init_db()
+    yield database
+    pool.close()
+
+
+def make_entry(overall=70, video=True, timeline=None, transcript="hello there"):
+    """An entry as the pipeline hands it to save_session(s)."""
+    fused = {"fluency": overall - 5, "grammar": overall + 5, "coherence": overall,
+             "readability": 60.5, "overall": overall}
+    if video:
+        fused["video"] = {"posture": 80, "gaze": 65, "movement": 90}
+    return {
+        "transcript": transcript,
+        "fused": fused,
+        "audio": {"scores": {"wpm": 120.0}},
+        "text": {"scores": {"grammar_score": overall + 5}},
+        "video": {"scores": {"posture_score": 80}} if video else None,
+        "timeline": timeline,
+    }
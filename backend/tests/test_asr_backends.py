@@ -0,0 +1,28 @@
+# backend/tests/test_asr_backends.py
+import pytest
+
+from app.services.asr_backends import ASRBackend, FasterWhisperBackend, WhisperBackend, create_asr_backend
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        ASRBackend()
+
+    class Incomplete(ASRBackend):
+        def load(self):
+            self._model = object()
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_version_identifies_engine_model_and_options():
+    assert WhisperBackend("tiny").version == "whisper-tiny-fp32"
+    assert FasterWhisperBackend("base", compute_type="int8", word_timestamps=True).version.endswith("-int8-words")
+
+
+def test_unknown_backend_or_model_is_rejected():
+    with pytest.raises(ValueError):
+        WhisperBackend("enormous")
+    with pytest.raises(ValueError):
+        create_asr_backend("no-such-engine")
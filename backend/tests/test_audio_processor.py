@@ -0,0 +1,147 @@
+# backend/tests/test_audio_processor.py
+import numpy as np
+import pytest
+
+from app import config
+from app.services import audio_processor
+from app.services.audio_extract import SAMPLE_RATE
+from app.services.audio_processor import (
+    _concat_speech, _to_original_time, detect_speech_regions, plan_transcription_chunks, stitch_chunk_transcripts,
+)
+
+
+def _recording(*parts):
+    """Concatenate (seconds, amplitude) parts: a 220 Hz tone, or faint noise for amplitude 0."""
+    rng = np.random.default_rng(0)
+    pieces = []
+    for seconds, amplitude in parts:
+        n = int(seconds * SAMPLE_RATE)
+        if amplitude:
+            pieces.append(amplitude * np.sin(2 * np.pi * 220 * np.arange(n) / SAMPLE_RATE))
+        else:
+            pieces.append(rng.normal(0.0, 1e-4, n))
+    return np.concatenate(pieces).astype(np.float32)
+
+
+def test_speech_regions_close_short_pauses_and_drop_blips():
+    audio = _recording((1.0, 0), (1.0, 0.3), (0.1, 0), (1.0, 0.3), (1.0, 0), (0.05, 0.3), (1.0, 0))
+    regions = detect_speech_regions(audio)
+    # the 0.1 s pause is shorter than VAD_MIN_SILENCE, the 0.05 s blip shorter than VAD_MIN_SPEECH
+    assert len(regions) == 1
+    frame = config.VAD_FRAME_MS / 1000
+    assert regions[0][0] == pytest.approx(1.0, abs=frame)
+    assert regions[0][1] == pytest.approx(3.1, abs=frame)
+
+
+def test_speech_regions_keep_real_pauses_apart():
+    audio = _recording((0.5, 0), (1.0, 0.3), (1.0, 0), (1.0, 0.3), (0.5, 0))
+    assert [[round(s, 1), round(e, 1)] for s, e in detect_speech_regions(audio)] == [[0.5, 1.5], [2.5, 3.5]]
+
+
+def test_no_speech_regions_in_too_short_audio():
+    assert detect_speech_regions(np.zeros(10, dtype=np.float32)) == []
+
+
+def test_concatenated_times_map_back_to_the_recording():
+    audio = _recording((4.0, 0), (2.0, 0.3), (6.0, 0), (1.0, 0.3), (2.0, 0))
+    regions = [[4.0, 6.0], [12.0, 13.0]]
+    _, offsets = _concat_speech(audio, regions)
+    starts = [o[0] for o in offsets]
+    pad, spacer = config.VAD_PAD_SECONDS, config.VAD_SPACER_SECONDS
+    first_length = 2.0 + 2 * pad
+
+    assert _to_original_time(0.0, offsets, starts) == pytest.approx(4.0 - pad)
+    assert _to_original_time(1.0, offsets, starts) == pytest.approx(5.0 - pad)
+    # inside the spacer after the first region: clamped to that region's (padded) end
+    assert _to_original_time(first_length + spacer / 2, offsets, starts) == pytest.approx(6.0 + pad)
+    second_start = first_length + spacer
+    assert _to_original_time(second_start, offsets, starts) == pytest.approx(12.0 - pad)
+    assert _to_original_time(second_start + 0.5, offsets, starts) == pytest.approx(12.5 - pad)
+
+
+def test_transcribed_segments_are_on_the_original_timeline(monkeypatch):
+    audio = _recording((3.0, 0), (1.0, 0.3), (3.0, 0), (1.0, 0.3), (1.0, 0))
+    regions = detect_speech_regions(audio)
+    _, offsets = _concat_speech(audio, regions)
+    second_start = offsets[1][0]
+
+    def _transcribe(speech_audio):
+        # one segment per region, as the recognizer sees them on the concatenated audio
+        return {"text": "hello there", "segments": [
+            {"start": config.VAD_PAD_SECONDS, "end": offsets[0][2] - config.VAD_PAD_SECONDS, "text": "hello"},
+            {"start": second_start + config.VAD_PAD_SECONDS,
+             "end": second_start + offsets[1][2] - config.VAD_PAD_SECONDS, "text": "there"},
+        ]}
+
+    monkeypatch.setattr(audio_processor, "transcribe_audio", _transcribe)
+    result = audio_processor.transcribe_speech(audio)
+    assert [(seg["start"], seg["end"]) for seg in result["segments"]] == [tuple(r) for r in regions]
+    assert result["speech_regions"] == regions
+
+
+@pytest.fixture
+def chunking(monkeypatch):
+    monkeypatch.setattr(config, "ASR_CHUNK_SECONDS", 120)
+    monkeypatch.setattr(config, "ASR_CHUNK_OVERLAP_SECONDS", 2.0)
+
+
+def _assert_partition(chunks, duration):
+    assert chunks[0]["own_start"] == 0.0 and chunks[-1]["own_end"] == duration
+    for prev, curr in zip(chunks, chunks[1:]):
+        assert prev["own_end"] == curr["own_start"]
+    for chunk in chunks:
+        assert chunk["start"] <= chunk["own_start"] < chunk["own_end"] <= chunk["end"]
+
+
+def test_short_recordings_are_one_chunk(chunking):
+    assert plan_transcription_chunks([[1.0, 100.0]], 140.0) == [
+        {"start": 0.0, "end": 140.0, "own_start": 0.0, "own_end": 140.0}]
+
+
+def test_chunks_are_cut_in_silences(chunking):
+    # 8 s of speech every 10 s
+    regions = [[t, t + 8.0] for t in range(0, 600, 10)]
+    chunks = plan_transcription_chunks(regions, 600.0)
+    _assert_partition(chunks, 600.0)
+    assert len(chunks) > 1
+    for prev, curr in zip(chunks, chunks[1:]):
+        cut = prev["own_end"]
+        assert cut % 10 == 9.0  # the middle of a 2 s silence
+        assert 0.75 * 120 <= cut - prev["own_start"] <= 1.25 * 120
+        # a cut in a silence needs no overlap
+        assert prev["end"] == cut == curr["start"]
+
+
+def test_chunks_overlap_where_there_is_no_silence(chunking):
+    chunks = plan_transcription_chunks([[0.0, 600.0]], 600.0)
+    _assert_partition(chunks, 600.0)
+    for prev, curr in zip(chunks, chunks[1:]):
+        cut = prev["own_end"]
+        assert prev["end"] == cut + 2.0 and curr["start"] == cut - 2.0
+
+
+def _seg(start, end, text):
+    return {"start": start, "end": end, "text": text}
+
+
+def test_stitching_keeps_the_segment_whose_midpoint_the_chunk_owns(chunking):
+    chunks = [{"start": 0.0, "end": 122.0, "own_start": 0.0, "own_end": 120.0},
+              {"start": 118.0, "end": 200.0, "own_start": 120.0, "own_end": 200.0}]
+    results = [
+        {"segments": [_seg(110.0, 117.0, "first"), _seg(117.5, 121.0, "across the cut")]},
+        # the second window hears the same words again, with slightly different times
+        {"segments": [_seg(118.0, 121.5, "across the cut"), _seg(121.5, 130.0, "second")]},
+    ]
+    stitched = stitch_chunk_transcripts(chunks, results, [[110.0, 130.0]])
+    assert [seg["text"] for seg in stitched["segments"]] == ["first", "across the cut", "second"]
+    assert stitched["text"] == "first across the cut second"
+
+
+def test_stitching_drops_a_repeat_owned_by_both_sides_of_the_cut(chunking):
+    chunks = [{"start": 0.0, "end": 122.0, "own_start": 0.0, "own_end": 120.0},
+              {"start": 118.0, "end": 200.0, "own_start": 120.0, "own_end": 200.0}]
+    # the recognizers placed the same phrase on different sides of the cut
+    results = [{"segments": [_seg(117.0, 119.5, "You know,")]},
+               {"segments": [_seg(119.8, 121.0, "you know"), _seg(121.0, 125.0, "then more")]}]
+    stitched = stitch_chunk_transcripts(chunks, results, [])
+    assert [seg["text"] for seg in stitched["segments"]] == ["You know,", "then more"]
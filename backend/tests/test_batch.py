@@ -0,0 +1,80 @@
+# backend/tests/test_batch.py
+import asyncio
+
+from app.services import batch_service
+from app.services.batch_service import BatchSessionWriter, create_batch, get_batch, new_batch_file
+from app.services.history_service import get_session
+
+from conftest import make_entry
+
+
+def _response(overall):
+    entry = make_entry(overall)
+    return {key: entry[key] for key in ("transcript", "fused", "audio", "text", "video", "timeline")}
+
+
+def test_batch_writer_isolates_a_bad_entry(db):
+    saved, failed = {}, []
+    writer = BatchSessionWriter(batch_size=2, on_saved=lambda f, sid: saved.__setitem__(f["filename"], sid),
+                                on_failed=lambda f, e: failed.append(f["filename"]))
+    broken = {**_response(80), "fused": None}  # cannot be inserted
+
+    async def _run():
+        await writer.add({"filename": "a"}, _response(70))
+        await writer.add({"filename": "b"}, broken)
+        await writer.add({"filename": "c"}, _response(90))
+        await writer.flush()
+
+    asyncio.run(_run())
+    assert sorted(saved) == ["a", "c"]
+    assert failed == ["b"]
+    assert get_session(saved["c"])["overall"] == 90
+
+
+def _http_batch(count):
+    files = [new_batch_file(f"f{i}.wav", f"/nonexistent/f{i}.wav") for i in range(count)]
+    return create_batch(files), files
+
+
+def test_batch_is_marked_failed_when_analysis_raises(db, monkeypatch):
+    async def _broken(files, **kwargs):
+        files[0]["status"] = "done"
+        raise RuntimeError("pool crashed")
+
+    monkeypatch.setattr(batch_service, "analyze_batch", _broken)
+    batch_id, files = _http_batch(3)
+    asyncio.run(batch_service._run_batch(batch_id, files))
+
+    batch = get_batch(batch_id)
+    assert batch["status"] == "failed"
+    assert (batch["done"], batch["failed"]) == (1, 2)
+    assert batch["files"][1]["error"] == "pool crashed"
+    assert batch_id not in batch_service._running_batches
+
+
+def test_batch_progress_writes_are_throttled(db, monkeypatch):
+    writes = []
+    store = batch_service._store_batch
+
+    def _counting_store(batch_id, status, files_json):
+        writes.append(status)
+        store(batch_id, status, files_json)
+
+    async def _many_updates(files, on_update=None, **kwargs):
+        for file in files:
+            for status in ("running", "analyzed", "done"):
+                file["status"] = status
+                on_update(file)
+                await asyncio.sleep(0)
+        return batch_service.batch_report(files)
+
+    monkeypatch.setattr(batch_service, "_store_batch", _counting_store)
+    monkeypatch.setattr(batch_service, "analyze_batch", _many_updates)
+    monkeypatch.setattr(batch_service.config, "BATCH_PROGRESS_SECONDS", 60.0)
+    batch_id, files = _http_batch(50)
+    asyncio.run(batch_service._run_batch(batch_id, files))
+
+    # 150 file state changes, but only the initial, one throttled and the final write
+    assert len(writes) <= 3
+    assert writes[-1] == "done"
+    assert get_batch(batch_id)["done"] == 50
@@ -0,0 +1,120 @@
+# backend/tests/test_fillers.py
+import numpy as np
+import pytest
+
+from app import config
+from app.services.audio_processor import _compute_fluency_metrics, fluency_from_totals, fluency_from_words
+from app.services.fillers import FillerMatcher, filler_matcher, tokenize
+from app.services.timeline import word_columns
+
+LEXICON = ["um", "uh", "like", "you know", "i mean", "sort of", "kind of"]
+
+
+def test_tokenize_lowercases_and_drops_punctuation():
+    assert tokenize("Um, you KNOW... it's fine") == ["um", "you", "know", "it", "s", "fine"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", 0),
+    ("so um I think", 1),
+    ("you know like I mean", 3),
+    ("you know like", 2),
+    ("sort of kind of", 2),
+    ("you knew it, you know", 1),
+    ("umbrella unlike", 0),
+    ("i i mean it", 1),
+])
+def test_counts_single_and_multi_word_fillers(text, expected):
+    assert FillerMatcher(LEXICON).count(tokenize(text)) == expected
+
+
+def test_overlapping_matches_do_not_double_count():
+    matcher = FillerMatcher(["you know", "know what", "what"])
+    # "you know" ends first and wins; "know what" overlaps it, "what" alone still fits
+    assert matcher.find(tokenize("you know what")) == [(0, 2), (2, 3)]
+
+
+def _naive_find(phrases, tokens):
+    spans, last_end = [], 0
+    for end in range(1, len(tokens) + 1):
+        fitting = [len(p) for p in phrases if tokens[max(0, end - len(p)):end] == p and end - len(p) >= last_end]
+        if fitting:
+            spans.append((end - max(fitting), end))
+            last_end = end
+    return spans
+
+
+def test_matches_a_naive_scan():
+    rng = np.random.default_rng(0)
+    lexicon = ["a", "b", "a b", "b c", "c", "a b c d", "d d"]
+    matcher = FillerMatcher(lexicon)
+    phrases = [tokenize(p) for p in lexicon]
+    for _ in range(200):
+        tokens = list(rng.choice(["a", "b", "c", "d", "e"], size=rng.integers(0, 12)))
+        spans = matcher.find(tokens)
+        assert spans == _naive_find(phrases, tokens)
+
+
+def test_duplicate_and_empty_entries_are_ignored():
+    matcher = FillerMatcher(["um", "UM", "", "  ", "you  know"])
+    assert matcher.phrases == [["um"], ["you", "know"]]
+
+
+def test_configured_matcher_uses_the_lexicon():
+    assert filler_matcher().phrases == [tokenize(phrase) for phrase in config.FILLER_LEXICON]
+
+
+def _words(*timed):
+    return [{"word": word, "start": start, "end": end} for word, start, end in timed]
+
+
+def test_fluency_from_words_counts_pauses_and_fillers():
+    words = _words(
+        ("So", 0.0, 0.3), ("um,", 0.4, 0.6), ("you", 2.0, 2.2), ("know", 2.2, 2.5),
+        ("it", 2.6, 2.8), ("works.", 2.8, 3.0),
+    )
+    metrics = fluency_from_words(words)
+    assert metrics["word_count"] == 6
+    assert metrics["filler_count"] == 2
+    assert metrics["duration_seconds"] == pytest.approx(3.0)
+    # only the 1.4 s gap reaches the minimum silence
+    assert metrics["total_pause_seconds"] == pytest.approx(1.4)
+    assert metrics["wpm"] == pytest.approx(120.0)
+    assert metrics["articulation_rate"] == pytest.approx(6 / (1.6 / 60))
+
+
+def test_word_path_counts_like_the_matcher():
+    words = _words(*((w, i, i + 0.5) for i, w in enumerate(["you", "know", "what", "um", "like"])))
+    assert fluency_from_words(words)["filler_count"] == filler_matcher().count(tokenize("you know what um like"))
+
+
+def test_fluency_from_words_matches_totals_path():
+    words = _words(("I", 0.0, 0.2), ("mean", 0.2, 0.5), ("yes", 1.5, 1.8))
+    from_words = fluency_from_words(words)
+    from_totals = fluency_from_totals(["I", "mean", "yes"], 1.8, 1.0)
+    assert from_words == pytest.approx(from_totals)
+
+
+def test_word_timestamps_take_precedence_over_segments():
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": "um hello", "words": _words(("um", 0.0, 0.3), ("hello", 0.4, 1.0))},
+        {"start": 3.0, "end": 4.0, "text": "there", "words": _words(("there", 3.0, 4.0))},
+    ]
+    metrics = _compute_fluency_metrics("um hello there", segments, speech_regions=[[0.0, 10.0]])
+    assert metrics["duration_seconds"] == pytest.approx(4.0)
+    assert metrics["filler_count"] == 1
+
+
+def test_word_columns_flag_every_word_of_a_filler():
+    segments = [{"start": 0.0, "end": 3.0, "text": "well you know it", "words": _words(
+        ("well", 0.0, 0.4), ("you", 0.5, 0.7), ("know", 0.7, 1.0), ("it", 1.2, 1.4),
+    )}]
+    columns = word_columns(segments)
+    assert columns["word_filler"].tolist() == [0, 1, 1, 0]
+    assert columns["word_text"].tolist() == ["well", "you", "know", "it"]
+    np.testing.assert_allclose(columns["word_start"], [0.0, 0.5, 0.7, 1.2])
+
+
+def test_word_columns_empty_without_word_timestamps():
+    columns = word_columns([{"start": 0.0, "end": 1.0, "text": "um"}])
+    assert all(len(column) == 0 for column in columns.values())
@@ -0,0 +1,88 @@
+# backend/tests/test_grammar_checker.py
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.grammar_checker import GrammarChecker, normalize_sentence
+
+
+class FakeTool:
+    """A LanguageTool stand-in that flags every occurrence of `pattern`."""
+
+    def __init__(self, pattern=r"teh|big teh"):
+        self.pattern = re.compile(pattern)
+        self.checked = []
+
+    def check(self, text):
+        self.checked.append(text)
+        return [SimpleNamespace(offset=m.start(), errorLength=m.end() - m.start(), message="typo", ruleId="TYPO")
+                for m in self.pattern.finditer(text)]
+
+
+@pytest.fixture
+def checker():
+    checker = GrammarChecker(threads=2, cache_size=2)
+    tool = FakeTool()
+    # what _start would do, with the fake in place of the servers
+    checker._tools = [tool]
+    checker._next_tool = itertools.cycle(checker._tools)
+    checker._executor = ThreadPoolExecutor(max_workers=2)
+    yield checker
+    checker._executor.shutdown()
+
+
+def _spans(text):
+    return [(m.start(), m.end()) for m in re.finditer(r"[^.]+\.?", text)]
+
+
+def test_normalize_sentence_collapses_whitespace_and_maps_offsets():
+    sentence = "  Hello \t big\n\nworld  "
+    normalized, index_map = normalize_sentence(sentence)
+    assert normalized == "Hello big world"
+    assert len(index_map) == len(normalized) + 1
+    for i, ch in enumerate(normalized):
+        if ch != " ":
+            assert sentence[index_map[i]] == ch
+    # a collapsed run maps to its first whitespace character
+    assert index_map[normalized.index(" ")] == sentence.index(" \t")
+    assert index_map[-1] == sentence.rindex("d") + 1
+    assert normalize_sentence("   ") == ("", [0])
+
+
+def test_match_offsets_point_into_the_transcript(checker):
+    text = "I wrote teh  report. It was big   teh end."
+    matches = checker.check(text, _spans(text))
+    found = [text[m["offset"]:m["offset"] + m["length"]] for m in matches]
+    # "big teh" spans a collapsed run of spaces in the transcript
+    assert found == ["teh", "big   teh"]
+    assert all(m["rule_id"] == "TYPO" and m["message"] == "typo" for m in matches)
+
+
+def test_differently_spaced_sentences_share_a_cache_entry(checker):
+    text = "Check teh  thing. Check   teh thing."
+    matches = checker.check(text, _spans(text))
+    assert [text[m["offset"]:m["offset"] + 3] for m in matches] == ["teh", "teh"]
+    assert checker._tools[0].checked == ["Check teh thing."]
+    assert checker.stats()["cache_hits"] == 1
+
+
+def test_cache_evicts_the_least_recently_used_sentence(checker):
+    tool = checker._tools[0]
+    for sentence in ("One.", "Two.", "One.", "Three.", "Two."):
+        checker.check(sentence, [(0, len(sentence))])
+    # "One." was used again before "Three." came in, so "Two." was evicted
+    assert tool.checked == ["One.", "Two.", "Three.", "Two."]
+    stats = checker.stats()
+    assert stats["cache_entries"] == 2 and stats["cache_hits"] == 1 and stats["cache_misses"] == 4
+
+
+def test_no_cache_checks_every_time():
+    checker = GrammarChecker(cache_size=0)
+    checker._tools = [FakeTool()]
+    checker._next_tool = itertools.cycle(checker._tools)
+    for _ in range(2):
+        checker.check("Same teh.", [(0, 9)])
+    assert len(checker._tools[0].checked) == 2 and checker.stats()["cache_entries"] == 0
@@ -0,0 +1,89 @@
+# backend/tests/test_graph_pool.py
+import threading
+import time
+
+from app.services.graph_pool import GraphPool
+
+
+class Graph:
+    def __init__(self, fail_reset=False):
+        self.fail_reset = fail_reset
+        self.resets = 0
+        self.closed = False
+
+    def reset(self):
+        if self.fail_reset:
+            raise RuntimeError("graph broken")
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(size=1, max_wait=0.05):
+    built = []
+
+    def _factory():
+        graphs = (Graph(), Graph())
+        built.append(graphs)
+        return graphs
+
+    return GraphPool(_factory, size, max_wait), built
+
+
+def test_sets_are_built_lazily_and_reused():
+    pool, built = _pool(size=2)
+    first, _ = pool.acquire()
+    pool.release(first)
+    again, waited = pool.acquire()
+    assert again is first and len(built) == 1
+    assert waited < 0.05
+    assert all(graph.resets == 1 for graph in first)
+    stats = pool.stats()
+    assert stats["created"] == 1 and stats["checkouts"] == 2 and stats["idle"] == 0
+
+
+def test_fill_builds_every_set_up_front():
+    pool, built = _pool(size=3)
+    pool.fill()
+    assert len(built) == 3 and pool.stats()["idle"] == 3
+    pool.acquire()
+    assert len(built) == 3
+
+
+def test_exhausted_pool_builds_a_temporary_set_after_the_wait():
+    pool, built = _pool(size=1, max_wait=0.05)
+    held, _ = pool.acquire()
+    extra, waited = pool.acquire()
+    assert extra is not held and waited >= 0.05
+    pool.release(extra)
+    # the temporary set is closed, not kept
+    assert all(graph.closed for graph in extra)
+    stats = pool.stats()
+    assert stats["overflow"] == 1 and stats["created"] == 1 and stats["idle"] == 0
+    pool.release(held)
+    assert pool.stats()["idle"] == 1 and len(built) == 2
+
+
+def test_waiter_gets_the_released_set():
+    pool, built = _pool(size=1, max_wait=5.0)
+    held, _ = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    assert pool.stats()["waiting"] == 1
+    pool.release(held)
+    waiter.join(timeout=5)
+    graphs, waited = got[0]
+    assert graphs is held and 0 < waited < 5.0
+    assert len(built) == 1 and pool.stats()["overflow"] == 0
+
+
+def test_a_set_that_cannot_be_reset_is_replaced():
+    broken = (Graph(fail_reset=True), Graph())
+    pool = GraphPool(lambda: broken, 1, 0.05)
+    graphs, _ = pool.acquire()
+    pool.release(graphs)
+    assert all(graph.closed for graph in broken)
+    assert pool.stats()["created"] == 0 and pool.stats()["idle"] == 0
@@ -0,0 +1,90 @@
+# backend/tests/test_history_api.py
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.db.database import get_connection
+from app.services.history_service import LIST_COLUMNS, get_session, iter_sessions, list_sessions, save_sessions
+
+from conftest import make_entry
+
+
+@pytest.fixture
+def history(db):
+    """25 sessions, one per day from 2024-03-01, overall = 50 + index."""
+    ids = save_sessions([make_entry(50 + i, transcript=f"session {i}") for i in range(25)])
+    conn = get_connection()
+    conn.executemany(
+        "UPDATE sessions SET timestamp = ? WHERE id = ?",
+        [(f"2024-03-{i + 1:02d}T12:00:00", session_id) for i, session_id in enumerate(ids)],
+    )
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def test_keyset_pages_cover_every_session_once(history):
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = list_sessions(limit=10, cursor=cursor)
+        seen += [item["id"] for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == sorted(history, reverse=True)
+
+
+def test_list_items_hold_only_list_columns(history):
+    item = list_sessions(limit=1)["items"][0]
+    assert tuple(item) == LIST_COLUMNS
+    assert item["overall"] == 74
+
+
+def test_exact_last_page_has_no_cursor(history):
+    assert list_sessions(limit=25)["next_cursor"] is None
+    assert list_sessions(limit=24)["next_cursor"] == history[1]
+
+
+def test_range_filter(history):
+    page = list_sessions(limit=100, since="2024-03-10", until="2024-03-13")
+    assert [item["timestamp"][:10] for item in page["items"]] == ["2024-03-12", "2024-03-11", "2024-03-10"]
+
+
+def test_detail_has_full_row(history):
+    row = get_session(history[0])
+    assert row["transcript"] == "session 0"
+    assert json.loads(row["fused_json"])["overall"] == 50
+    assert get_session(10_000) is None
+
+
+def test_export_batches_oldest_first(history):
+    rows = list(iter_sessions(batch_size=4))
+    assert [row["id"] for row in rows] == sorted(history)
+    assert "transcript" in rows[0]
+    assert len(list(iter_sessions(since="2024-03-20", batch_size=2))) == 6
+
+
+def test_export_endpoint_streams_ndjson(history):
+    response = main.history_export(since="2024-03-24", until=None)
+    assert response.media_type == "application/x-ndjson"
+
+    async def _body():
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    lines = asyncio.run(_body()).splitlines()
+    assert [json.loads(line)["transcript"] for line in lines] == ["session 23", "session 24"]
+
+
+def test_endpoints_validate_parameters(history):
+    with pytest.raises(HTTPException) as info:
+        main.history_all(since="last tuesday")
+    assert info.value.status_code == 400
+    with pytest.raises(HTTPException) as info:
+        main.history_session(10_000)
+    assert info.value.status_code == 404
+    assert len(main.history_all(limit=10_000)["items"]) == 25
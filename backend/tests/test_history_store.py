@@ -0,0 +1,87 @@
+# backend/tests/test_history_store.py
+import asyncio
+
+import numpy as np
+
+from app.db.database import ConnectionPool, get_connection
+from app.services import history_service
+from app.services.history_service import get_session, get_session_timeline, save_session_async, save_sessions
+
+from conftest import make_entry
+
+
+def _count_sessions():
+    conn = get_connection()
+    count = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_pool_reuses_connections_in_wal_mode(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", size=1)
+    conn = pool.acquire()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    raw = conn._conn
+    conn.close()
+    again = pool.acquire()
+    assert again._conn is raw
+    # a second checkout while the idle queue is empty opens a new connection,
+    # and releasing it into a full pool closes it
+    extra = pool.acquire()
+    assert extra._conn is not raw
+    again.close()
+    extra.close()
+    pool.close()
+
+
+def test_pool_rolls_back_uncommitted_work(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", size=2)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()  # returned to the pool with the insert still open
+
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    with conn:
+        conn.execute("INSERT INTO t VALUES (2)")
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+    conn.close()
+    pool.close()
+
+
+def test_concurrent_saves_all_commit(db):
+    async def _save_many():
+        return await asyncio.gather(*(
+            save_session_async("t", entry["fused"], entry["audio"], entry["text"], entry["video"])
+            for entry in (make_entry(60 + i) for i in range(20))
+        ))
+
+    ids = asyncio.run(_save_many())
+    assert len(set(ids)) == 20
+    assert _count_sessions() == 20
+    assert sorted(get_session(i)["overall"] for i in ids) == list(range(60, 80))
+
+
+def test_timeline_failure_does_not_fail_committed_session(db, monkeypatch):
+    def _broken(session_id, timeline):
+        raise ValueError("cannot write timeline")
+
+    monkeypatch.setattr(history_service, "save_timeline", _broken)
+    (session_id,) = save_sessions([make_entry(75, timeline={"frame_time": np.arange(3.0)})])
+
+    row = get_session(session_id)
+    assert row["overall"] == 75
+    assert row["timeline_path"] is None
+    assert _count_sessions() == 1
+
+
+def test_timelines_are_saved_and_loaded(db):
+    timeline = {"frame_time": np.arange(4.0), "frame_tilt": np.array([1.0, 2.0, 3.0, 4.0])}
+    with_timeline, without = save_sessions([make_entry(70, timeline=timeline), make_entry(71)])
+
+    loaded = get_session_timeline(with_timeline)
+    np.testing.assert_array_equal(loaded["frame_tilt"], timeline["frame_tilt"])
+    assert get_session_timeline(without) is None
@@ -0,0 +1,113 @@
+# backend/tests/test_jobs.py
+import asyncio
+import os
+import pickle
+import threading
+
+import pytest
+
+from app.services import job_service
+from app.services.job_service import JobProgress, create_job, get_job, resume_unfinished_jobs
+from app.services.worker_pool import PoolBusyError
+from conftest import make_entry
+
+
+def test_progress_on_the_event_loop_is_written_off_the_loop(db, monkeypatch):
+    job_id = create_job("talk.mp4", "/nowhere/talk.mp4")
+    writers = []
+    store = job_service._store_progress
+
+    def _store(job_id, progress):
+        writers.append(threading.current_thread())
+        store(job_id, progress)
+
+    monkeypatch.setattr(job_service, "_store_progress", _store)
+
+    async def _report():
+        progress = JobProgress(job_id)
+        for percent in (0.0, 40.0, 100.0):
+            progress("audio", percent)
+        progress("video", 50.0)
+        await progress.flush()
+
+    asyncio.run(_report())
+    assert threading.main_thread() not in writers
+    assert get_job(job_id)["progress"] == {"audio": 100.0, "text": 0.0, "video": 50.0, "fusion": 0.0}
+
+
+def test_progress_pickles_for_worker_processes(db):
+    job_id = create_job("talk.mp4", "/nowhere/talk.mp4")
+    progress = pickle.loads(pickle.dumps(JobProgress(job_id)))
+    # no event loop here, as in a vision worker: written directly
+    progress("video", 25.0)
+    assert get_job(job_id)["progress"]["video"] == 25.0
+
+
+@pytest.fixture
+def upload(tmp_path, monkeypatch):
+    # a fresh semaphore per test: each test runs its own event loop
+    monkeypatch.setattr(job_service, "_job_slots", None)
+    path = tmp_path / "talk.mp4"
+    path.write_bytes(b"not really a video")
+    return str(path)
+
+
+def _pipeline(*outcomes):
+    """A run_multimodal_pipeline stand-in raising or returning `outcomes` in turn."""
+    outcomes = list(outcomes)
+
+    async def _run(path, progress=None):
+        for stage in job_service.JOB_STAGES:
+            progress(stage, 100.0)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {**make_entry(overall=80), "timeline": None}
+
+    return _run
+
+
+def test_job_runs_to_done(db, upload, monkeypatch):
+    monkeypatch.setattr(job_service, "run_multimodal_pipeline", _pipeline("ok"))
+    job_id = create_job("talk.mp4", upload)
+    assert get_job(job_id)["status"] == "queued"
+
+    asyncio.run(job_service._run_job(job_id, upload))
+    job = get_job(job_id, include_result=True)
+    assert job["status"] == "done"
+    assert job["progress"] == {stage: 100.0 for stage in job_service.JOB_STAGES}
+    assert job["session_id"] is not None and job["result"]["fused"]["overall"] == 80
+    assert "timeline" not in job["result"]
+    assert not os.path.exists(upload)
+
+
+def test_busy_pools_are_waited_for(db, upload, monkeypatch):
+    monkeypatch.setattr(job_service, "run_multimodal_pipeline", _pipeline(PoolBusyError("asr", 0), "ok"))
+    job_id = create_job("talk.mp4", upload)
+    asyncio.run(job_service._run_job(job_id, upload))
+    assert get_job(job_id)["status"] == "done"
+
+
+def test_failed_job_records_the_error(db, upload, monkeypatch):
+    monkeypatch.setattr(job_service, "run_multimodal_pipeline", _pipeline(RuntimeError("decoder crashed")))
+    job_id = create_job("talk.mp4", upload)
+    asyncio.run(job_service._run_job(job_id, upload))
+    job = get_job(job_id)
+    assert job["status"] == "failed" and job["error"] == "decoder crashed"
+    assert not os.path.exists(upload)
+
+
+def test_unfinished_jobs_resume_unless_their_upload_is_gone(db, upload, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(job_service, "schedule_job", lambda job_id, path: scheduled.append((job_id, path)))
+    running = create_job("talk.mp4", upload)
+    job_service._set_job_state(running, "running")
+    lost = create_job("lost.mp4", upload + ".gone")
+    finished = create_job("done.mp4", upload)
+    job_service._set_job_state(finished, "done")
+
+    assert resume_unfinished_jobs() == 1
+    assert scheduled == [(running, upload)]
+    assert get_job(running)["status"] == "queued"
+    assert get_job(lost)["status"] == "failed" and "lost" in get_job(lost)["error"]
+    assert get_job(finished)["status"] == "done"
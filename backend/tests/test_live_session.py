@@ -0,0 +1,134 @@
+# backend/tests/test_live_session.py
+import asyncio
+import json
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+from app.services import live_session
+from app.services.history_service import get_session
+from app.services.live_session import LiveSession, run_live_session
+from app.services.text_processor import _empty_result
+
+
+class FakeWebSocket:
+    """Replays client messages; records what the server sends and how it closes."""
+
+    def __init__(self, messages):
+        self._messages = list(messages)
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        if self._messages:
+            return self._messages.pop(0)
+        return {"type": "websocket.disconnect"}
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+def _text(payload):
+    return {"type": "websocket.receive", "text": json.dumps(payload)}
+
+
+@pytest.mark.parametrize("sample_rate", [0, -16000, 100, "fast"])
+def test_invalid_sample_rate_is_rejected(sample_rate):
+    websocket = FakeWebSocket([_text({"type": "start", "sample_rate": sample_rate})])
+    asyncio.run(run_live_session(websocket))
+    assert websocket.sent[-1]["type"] == "error"
+    assert "sample_rate" in websocket.sent[-1]["detail"]
+    assert websocket.close_code == 1008
+
+
+def test_unknown_encoding_is_rejected():
+    session = LiveSession(FakeWebSocket([]))
+    with pytest.raises(ValueError):
+        session.configure({"sample_rate": 48000, "encoding": "mp3"})
+    session.configure({"sample_rate": 48000, "encoding": "f32le"})
+    session.add_audio(np.zeros(4800, dtype="<f4").tobytes())
+    assert session.seconds_received == pytest.approx(0.1)
+
+
+class FakeNlpPool:
+    async def submit(self, fn, *args):
+        return _empty_result()
+
+
+def test_disconnect_saves_the_rolling_session(db, monkeypatch):
+    monkeypatch.setattr(live_session, "nlp_pool", FakeNlpPool())
+    session = LiveSession(FakeWebSocket([]))
+    session.add_audio(np.zeros(16000 * 4, dtype="<i2").tobytes())
+    session.committed_segments = [{"start": 0.0, "end": 2.0, "text": " so um today I want to"}]
+    session.tentative_segments = [{"start": 2.0, "end": 3.5, "text": " talk about pipelines"}]
+
+    session_id = asyncio.run(session.save_rolling())
+    row = get_session(session_id)
+    assert row["transcript"] == "so um today I want to talk about pipelines"
+    assert row["fluency"] is not None
+
+
+def test_disconnect_before_any_transcript_saves_nothing(db):
+    session = LiveSession(FakeWebSocket([]))
+    assert asyncio.run(session.save_rolling()) is None
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    """Records save_rolling calls instead of analyzing."""
+    calls = []
+
+    async def _save_rolling(self):
+        calls.append(self)
+        return None
+
+    monkeypatch.setattr(LiveSession, "save_rolling", _save_rolling)
+    return calls
+
+
+def test_malformed_messages_are_reported_and_the_session_goes_on(saved):
+    websocket = FakeWebSocket([
+        {"type": "websocket.receive", "text": "{not json"},
+        {"type": "websocket.receive", "text": "[1]"},
+        _text({"type": "frame", "data": "***not base64***"}),
+        {"type": "websocket.receive", "bytes": np.zeros(1600, dtype="<i2").tobytes()},
+    ])
+    asyncio.run(run_live_session(websocket))
+    errors = [message["detail"] for message in websocket.sent if message["type"] == "error"]
+    assert errors == ["Messages must be JSON.", "Messages must be JSON objects.",
+                      "Frame data must be base64-encoded JPEG."]
+    assert websocket.close_code is None
+    assert len(saved) == 1  # the disconnect still saved the rehearsal
+
+
+def test_fatal_error_saves_before_closing(saved, monkeypatch):
+    monkeypatch.setattr(live_session.config, "LIVE_MAX_SECONDS", 1)
+    websocket = FakeWebSocket([{"type": "websocket.receive", "bytes": np.zeros(32000, dtype="<i2").tobytes()}])
+    asyncio.run(run_live_session(websocket))
+    assert websocket.sent[-1]["type"] == "error"
+    assert websocket.close_code == 1008
+    assert len(saved) == 1
+
+
+def test_failed_update_is_reported(monkeypatch):
+    async def _crash(self):
+        raise BrokenProcessPool("asr worker died")
+
+    monkeypatch.setattr(LiveSession, "_transcribe_increment", _crash)
+    websocket = FakeWebSocket([])
+    session = LiveSession(websocket)
+
+    async def _run():
+        session.maybe_update()
+        await session._update_task
+        return session._update_task.exception()
+
+    assert asyncio.run(_run()) is None
+    assert websocket.sent == [{"type": "error", "detail": "Live update failed; retrying."}]
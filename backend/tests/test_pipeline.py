@@ -0,0 +1,56 @@
+# backend/tests/test_pipeline.py
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import pipeline
+from app.services.result_cache import ResultCache
+from app.services.worker_pool import PoolBusyError
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_bytes=1 << 20, max_age_seconds=3600)
+    monkeypatch.setattr(pipeline, "result_cache", cache)
+    return cache
+
+
+@pytest.mark.parametrize("error", [BrokenProcessPool("worker died"), PoolBusyError("vision", 5)])
+def test_pool_failures_are_not_cached_as_no_video(cache, monkeypatch, error):
+    async def _fail(path, progress=None):
+        raise error
+
+    monkeypatch.setattr(pipeline, "extract_video_landmarks", _fail)
+    with pytest.raises(type(error)):
+        asyncio.run(pipeline._run_video_branch("clip.mp4", "upload", {}))
+    assert cache.get("video", "upload", pipeline.VIDEO_ANALYZER_VERSION) is None
+
+
+def test_unreadable_video_yields_no_video(cache, monkeypatch):
+    async def _no_track(path, progress=None):
+        raise ValueError("no video stream")
+
+    monkeypatch.setattr(pipeline, "extract_video_landmarks", _no_track)
+    video_result, landmarks, _timings = asyncio.run(pipeline._run_video_branch("clip.wav", "upload", {}))
+    assert video_result is None and landmarks is None
+
+
+def test_failed_branch_cancels_the_other(cache, monkeypatch):
+    cancelled = []
+
+    async def _speech(*args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def _video(*args):
+        raise PoolBusyError("vision", 5)
+
+    monkeypatch.setattr(pipeline, "_run_speech_branch", _speech)
+    monkeypatch.setattr(pipeline, "_run_video_branch", _video)
+    with pytest.raises(PoolBusyError):
+        asyncio.run(pipeline.run_multimodal_pipeline("clip.mp4", upload_hash="upload"))
+    assert cancelled == [True]
@@ -0,0 +1,62 @@
+# backend/tests/test_rescore.py
+import asyncio
+
+import pytest
+
+from app.db.database import ROLLUP_COLUMNS, get_connection
+from app.services.history_service import get_summary, save_sessions
+from app.services.rescore_service import rescore_sessions
+
+from conftest import make_entry
+
+
+def _entry(overall, video=True):
+    entry = make_entry(overall, video=video, transcript="um so I think that you know this works well")
+    entry["audio"] = {"scores": {"fluency_score": 10},
+                      "stats": {"duration_seconds": 5.0, "total_pause_seconds": 0.5}}
+    return entry
+
+
+def _scores():
+    conn = get_connection()
+    rows = [dict(r) for r in conn.execute(f"SELECT id, {', '.join(ROLLUP_COLUMNS)} FROM sessions ORDER BY id")]
+    conn.close()
+    return rows
+
+
+def test_dry_run_reports_without_writing(db):
+    save_sessions([_entry(70), _entry(40, video=False)])
+    before = _scores()
+    report = asyncio.run(rescore_sessions(dry_run=True, batch_size=1))
+    assert report["scanned"] == 2
+    assert report["written"] == 0
+    assert report["changed"] == len(report["diffs"]) > 0
+    assert _scores() == before
+
+
+def test_rescore_keeps_rollups_in_step(db):
+    save_sessions([_entry(70), _entry(40, video=False), _entry(90)])
+    report = asyncio.run(rescore_sessions(batch_size=2, max_diffs=1))
+    assert report["scanned"] == 3
+    assert report["written"] >= report["changed"] > 0
+    assert len(report["diffs"]) == 1
+    assert report["diffs_truncated"] == (report["changed"] > 1)
+
+    conn = get_connection()
+    expected = conn.execute(f"SELECT {', '.join(f'AVG({c}) AS {c}' for c in ROLLUP_COLUMNS)} FROM sessions").fetchone()
+    conn.close()
+    summary = get_summary()
+    for column in ROLLUP_COLUMNS:
+        if expected[column] is None:
+            assert summary[f"avg_{column}"] is None
+        else:
+            assert summary[f"avg_{column}"] == pytest.approx(expected[column])
+
+    # a second pass finds nothing left to change
+    assert asyncio.run(rescore_sessions())["changed"] == 0
+
+
+def test_limit_and_session_ids(db):
+    ids = save_sessions([_entry(60), _entry(65), _entry(70)])
+    assert asyncio.run(rescore_sessions(dry_run=True, limit=2, batch_size=1))["scanned"] == 2
+    assert asyncio.run(rescore_sessions(dry_run=True, session_ids=[ids[2]]))["scanned"] == 1
@@ -0,0 +1,58 @@
+# backend/tests/test_result_cache.py
+import asyncio
+
+from app.services import pipeline
+from app import config
+from app.services import audio_processor
+from app.services.result_cache import ResultCache, settings_version, text_sha256
+from app.services.text_processor import _empty_result
+
+
+def test_entries_are_keyed_by_content_stage_and_version(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=1 << 20, max_age_seconds=3600)
+    cache.put("asr", "abc", "v1", {"text": "hello"})
+    assert cache.get("asr", "abc", "v1") == {"text": "hello"}
+    assert cache.get("asr", "abc", "v2") is None
+    assert cache.get("text", "abc", "v1") is None
+    assert cache.get("asr", None, "v1") is None
+
+
+def test_settings_version_changes_with_the_settings():
+    assert settings_version("landmarks-1", 2.0, 640) == settings_version("landmarks-1", 2.0, 640)
+    assert settings_version("landmarks-1", 2.0, 640) != settings_version("landmarks-1", 1.0, 640)
+    assert settings_version("landmarks-1", 2.0, 640).startswith("landmarks-1+")
+
+
+def test_asr_version_follows_the_vad_settings(monkeypatch):
+    before = audio_processor.asr_version()
+    monkeypatch.setattr(config, "VAD_MIN_SILENCE_SECONDS", config.VAD_MIN_SILENCE_SECONDS + 0.1)
+    assert audio_processor.asr_version() != before
+
+
+class CountingNlpPool:
+    def __init__(self):
+        self.calls = 0
+
+    async def submit(self, fn, *args):
+        self.calls += 1
+        return _empty_result()
+
+
+def test_text_result_is_shared_by_uploads_with_the_same_transcript(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_bytes=1 << 20, max_age_seconds=3600)
+    nlp = CountingNlpPool()
+    monkeypatch.setattr(pipeline, "result_cache", cache)
+    monkeypatch.setattr(pipeline, "nlp_pool", nlp)
+    asr_result = {"text": "the same words", "segments": [{"start": 0.0, "end": 2.0, "text": "the same words"}]}
+    for upload_hash in ("upload-1", "upload-2"):
+        cache.put("asr", upload_hash, pipeline.asr_version(), asr_result)
+
+    statuses = []
+    for upload_hash in ("upload-1", "upload-2"):
+        status = {}
+        asyncio.run(pipeline._run_speech_branch("unused.wav", upload_hash, status))
+        statuses.append(status)
+
+    assert nlp.calls == 1
+    assert [s["text"] for s in statuses] == ["miss", "hit"]
+    assert cache.get("text", text_sha256("the same words"), pipeline.TEXT_ANALYZER_VERSION) is not None
@@ -0,0 +1,115 @@
+# backend/tests/test_rollups.py
+import pytest
+
+from app.db.database import ROLLUP_COLUMNS, get_connection, rebuild_rollups
+from app.services.history_service import get_summary, get_trends, save_sessions
+from app.services.rollups import bucket_keys
+
+from conftest import make_entry
+
+
+def _sql_averages():
+    conn = get_connection()
+    row = conn.execute(
+        f"SELECT COUNT(*) AS n, {', '.join(f'AVG({c}) AS {c}' for c in ROLLUP_COLUMNS)} FROM sessions"
+    ).fetchone()
+    conn.close()
+    return row
+
+
+def _assert_summary_matches_sql():
+    summary = get_summary()
+    expected = _sql_averages()
+    assert summary["total_sessions"] == expected["n"]
+    for column in ROLLUP_COLUMNS:
+        if expected[column] is None:
+            assert summary[f"avg_{column}"] is None
+        else:
+            assert summary[f"avg_{column}"] == pytest.approx(expected[column])
+
+
+def _insert_raw(conn, timestamp, overall, video):
+    conn.execute(
+        "INSERT INTO sessions (timestamp, transcript, fluency, grammar, coherence, readability, "
+        "posture, gaze, movement, overall) VALUES (?, 't', ?, ?, ?, 50.0, ?, ?, ?, ?)",
+        (timestamp, overall, overall, overall,
+         80 if video else None, 70 if video else None, 90 if video else None, overall),
+    )
+
+
+def test_bucket_keys_week_starts_on_monday():
+    assert bucket_keys("2024-05-15T10:00:00") == {"day": "2024-05-15", "week": "2024-05-13"}
+    assert bucket_keys("2024-05-13T00:00:00")["week"] == "2024-05-13"
+    assert bucket_keys("2024-05-19T23:59:59")["week"] == "2024-05-13"
+
+
+def test_incremental_rollups_match_sql_averages(db):
+    save_sessions([make_entry(70), make_entry(80, video=False)])
+    save_sessions([make_entry(90)])
+    _assert_summary_matches_sql()
+    assert get_summary()["total_sessions"] == 3
+
+
+def test_empty_history_summary(db):
+    summary = get_summary()
+    assert summary["total_sessions"] == 0
+    assert all(summary[f"avg_{c}"] is None for c in ROLLUP_COLUMNS)
+
+
+def test_backfill_with_audio_only_buckets(db):
+    # existing rows from before the rollups table: one day holds only
+    # audio-only sessions, so SUM(posture) etc. is NULL for that bucket
+    conn = get_connection()
+    conn.execute("DROP TABLE session_rollups")
+    _insert_raw(conn, "2024-05-06T09:00:00", 60, video=False)
+    _insert_raw(conn, "2024-05-06T10:00:00", 64, video=False)
+    _insert_raw(conn, "2024-05-14T09:00:00", 80, video=True)
+    conn.commit()
+    conn.close()
+
+    db.init_db()  # recreates and backfills the table
+
+    _assert_summary_matches_sql()
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT * FROM session_rollups WHERE kind = 'day' AND bucket = '2024-05-06'"
+    ).fetchone()
+    week = conn.execute(
+        "SELECT sessions FROM session_rollups WHERE kind = 'week' AND bucket = '2024-05-13'"
+    ).fetchone()
+    conn.close()
+    assert row["sessions"] == 2
+    assert (row["posture_sum"], row["posture_count"]) == (0, 0)
+    assert row["overall_sum"] == 124
+    assert week["sessions"] == 1
+
+
+def test_rebuild_matches_incremental(db):
+    save_sessions([make_entry(70), make_entry(55, video=False), make_entry(88)])
+    conn = get_connection()
+    before = [tuple(r) for r in conn.execute("SELECT * FROM session_rollups ORDER BY kind, bucket")]
+    rebuild_rollups(conn.cursor())
+    conn.commit()
+    after = [tuple(r) for r in conn.execute("SELECT * FROM session_rollups ORDER BY kind, bucket")]
+    conn.close()
+    assert before == after
+
+
+def test_trends_from_rollups(db):
+    conn = get_connection()
+    conn.execute("DROP TABLE session_rollups")
+    for day, overall in (("2024-05-06", 60), ("2024-05-13", 70), ("2024-05-20", 80)):
+        _insert_raw(conn, f"{day}T12:00:00", overall, video=False)
+    conn.commit()
+    conn.close()
+    db.init_db()
+
+    trends = get_trends("week", periods=12, window=2)
+    overall = trends["columns"]["overall"]
+    assert [p["bucket"] for p in overall["points"]] == ["2024-05-06", "2024-05-13", "2024-05-20"]
+    assert [p["avg"] for p in overall["points"]] == [60, 70, 80]
+    assert [p["moving_avg"] for p in overall["points"]] == [60, 65, 75]
+    assert overall["slope"] == pytest.approx(10)
+    posture = trends["columns"]["posture"]
+    assert posture["slope"] is None
+    assert all(p["avg"] is None for p in posture["points"])
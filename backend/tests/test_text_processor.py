@@ -0,0 +1,84 @@
+# backend/tests/test_text_processor.py
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app import config
+from app.services import text_processor
+from app.services.grammar_checker import GrammarChecker
+from app.services.text_processor import _empty_result, analyze_text, analyze_texts
+
+_NOUNS = {"report", "results", "team", "data", "plan", "budget"}
+
+
+class FakeDoc:
+    """The part of a spaCy Doc text analysis reads: sentences with offsets, tokens with POS."""
+
+    def __init__(self, text):
+        self.sents = [SimpleNamespace(start_char=m.start(), end_char=m.end())
+                      for m in re.finditer(r"[^.!?]+[.!?]?", text) if m.group().strip()]
+        self.tokens = [SimpleNamespace(text=m.group(), pos_="NOUN" if m.group().lower() in _NOUNS else "VERB")
+                       for m in re.finditer(r"\w+|[^\w\s]", text)]
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+
+class FakeNlp:
+    def __init__(self):
+        self.pipe_calls = []
+
+    def __call__(self, text):
+        return FakeDoc(text)
+
+    def pipe(self, texts, batch_size, n_process):
+        texts = list(texts)
+        self.pipe_calls.append((len(texts), batch_size, n_process))
+        return (FakeDoc(text) for text in texts)
+
+
+class FakeTool:
+    def check(self, text):
+        return [SimpleNamespace(offset=m.start(), errorLength=3, message="Possible typo", ruleId="TYPO")
+                for m in re.finditer(r"teh", text)]
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    nlp = FakeNlp()
+    checker = GrammarChecker(threads=2)
+    # what _start would do, with the fake in place of the server
+    checker._tools = [FakeTool()]
+    checker._next_tool = itertools.cycle(checker._tools)
+    checker._executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(text_processor, "_nlp", nlp)
+    monkeypatch.setattr(text_processor, "grammar_checker", checker)
+    yield nlp
+    checker._executor.shutdown()
+
+
+TRANSCRIPTS = [
+    "First, teh report shows the results. Then the team reviews the data. Finally we plan the budget.",
+    "   ",
+    "I  think   teh plan works.  It does!",
+    "",
+    "Short one",
+]
+
+
+def test_batched_analysis_matches_one_at_a_time(nlp, monkeypatch):
+    monkeypatch.setattr(config, "SPACY_BATCH_SIZE", 2)
+    one_by_one = [analyze_text(t) for t in TRANSCRIPTS]
+    batched = analyze_texts(TRANSCRIPTS)
+    assert batched == one_by_one
+    # spaCy only sees the non-empty transcripts, in one pipe call
+    assert nlp.pipe_calls == [(3, 2, 1)]
+    assert [r["stats"]["grammar_errors"] for r in batched] == [1, 0, 1, 0, 0]
+    assert batched[1] == batched[3] == _empty_result()
+
+
+def test_no_transcripts(nlp):
+    assert analyze_texts([]) == []
@@ -0,0 +1,247 @@
+# backend/tests/test_video_processor.py
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app import config
+from app.services import video_processor
+from app.services.graph_pool import GraphPool
+from app.services.video_processor import (
+    FACE_GAZE_LANDMARKS, N_POSE_LANDMARKS, detect_landmarks, extract_video_features, frame_features,
+    merge_video_features, plan_video_shards, probe_video, summarize_features,
+)
+
+WIDTH, HEIGHT = 640, 480
+# frame-normalized nose tip, left eye inner, right eye inner of a face looking at the camera
+FACE = {1: (0.50, 0.30), 33: (0.47, 0.27), 263: (0.53, 0.27)}
+
+
+class FakeVideoCapture:
+    """A 30 fps video of FRAMES tiny frames whose pixels hold their 0-based index."""
+    FRAMES = 1000
+
+    def __init__(self, path):
+        self.position = 0
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return {FakeCv2.CAP_PROP_FPS: 30.0, FakeCv2.CAP_PROP_FRAME_COUNT: self.FRAMES}[prop]
+
+    def set(self, prop, value):
+        assert prop == FakeCv2.CAP_PROP_POS_FRAMES
+        self.position = int(value)
+
+    def grab(self):
+        if self.position >= self.FRAMES:
+            return False
+        self.position += 1
+        return True
+
+    def retrieve(self):
+        return True, np.full((4, 4, 3), self.position - 1, dtype=np.int32)
+
+    def release(self):
+        pass
+
+
+class FakeCv2:
+    """Just enough of OpenCV for detect_landmarks (crops stay below the ROI size here) and frame sampling."""
+    COLOR_BGR2RGB = 4
+    CAP_PROP_POS_FRAMES, CAP_PROP_FPS, CAP_PROP_FRAME_COUNT = 1, 5, 7
+    VideoCapture = FakeVideoCapture
+
+    @staticmethod
+    def cvtColor(frame, code):
+        return frame[..., ::-1]
+
+
+class FakePose:
+    def __init__(self, nose_visibility):
+        head = [(0.50, 0.30), (0.48, 0.28), (0.47, 0.28), (0.46, 0.28), (0.52, 0.28), (0.53, 0.28),
+                (0.54, 0.28), (0.44, 0.29), (0.56, 0.29), (0.49, 0.33), (0.51, 0.33)]
+        points = head + [(0.40 + 0.01 * i, 0.60) for i in range(N_POSE_LANDMARKS - len(head))]
+        self.landmarks = [SimpleNamespace(x=x, y=y, visibility=0.9) for x, y in points]
+        self.landmarks[0].visibility = nose_visibility
+
+    def process(self, rgb):
+        return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=self.landmarks))
+
+
+class FakeFaceMesh:
+    """Finds FACE in whatever image it gets: the full frame or the head crop `roi`."""
+
+    def __init__(self, roi=None):
+        self.roi = roi
+        self.shapes = []
+
+    def process(self, rgb):
+        self.shapes.append(rgb.shape[:2])
+        x0, y0, x1, y1 = (0, 0, WIDTH, HEIGHT) if rgb.shape[:2] == (HEIGHT, WIDTH) else self.roi
+        landmarks = [SimpleNamespace(x=0.0, y=0.0, z=0.0) for _ in range(max(FACE_GAZE_LANDMARKS) + 1)]
+        for i, (x, y) in FACE.items():
+            landmarks[i] = SimpleNamespace(x=(x * WIDTH - x0) / (x1 - x0), y=(y * HEIGHT - y0) / (y1 - y0), z=0.0)
+        return SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=landmarks)])
+
+
+@pytest.fixture(autouse=True)
+def fake_cv2(monkeypatch):
+    monkeypatch.setattr(video_processor, "_cv2", FakeCv2)
+
+
+def _detect(pose, face_mesh):
+    pose_lm = np.empty((1, N_POSE_LANDMARKS, 3), dtype=np.float32)
+    face_lm = np.empty((1, len(FACE_GAZE_LANDMARKS), 3), dtype=np.float32)
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    detect_landmarks(pose, face_mesh, frame, pose_lm[0], face_lm[0])
+    return pose_lm, face_lm
+
+
+def test_head_crop_and_full_frame_give_the_same_gaze(monkeypatch):
+    pose = FakePose(nose_visibility=0.9)
+    roi = video_processor._head_roi(pose.landmarks, WIDTH, HEIGHT)
+    roi_mesh = FakeFaceMesh(roi)
+    pose_lm, roi_face = _detect(pose, roi_mesh)
+    assert roi_mesh.shapes == [(roi[3] - roi[1], roi[2] - roi[0])]
+
+    monkeypatch.setattr(config, "VIDEO_FACE_ROI", False)
+    full_mesh = FakeFaceMesh()
+    _, full_face = _detect(pose, full_mesh)
+    assert full_mesh.shapes == [(HEIGHT, WIDTH)]
+
+    np.testing.assert_allclose(roi_face, full_face, atol=1e-5)
+    roi_gaze = frame_features(pose_lm, roi_face, (WIDTH, HEIGHT))["gazes"]
+    full_gaze = frame_features(pose_lm, full_face, (WIDTH, HEIGHT))["gazes"]
+    assert roi_gaze.tolist() == full_gaze.tolist() == [1]
+
+
+def test_face_mesh_falls_back_to_the_full_frame_without_a_head():
+    face_mesh = FakeFaceMesh()
+    pose_lm, face_lm = _detect(FakePose(nose_visibility=0.1), face_mesh)
+    assert face_mesh.shapes == [(HEIGHT, WIDTH)]
+    assert frame_features(pose_lm, face_lm, (WIDTH, HEIGHT))["gazes"].tolist() == [1]
+
+
+class FakeGraph:
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _landmarks_of_frame(pose, face_mesh, frame, pose_out, face_out):
+    """Deterministic landmarks from the frame index; every 7th frame has nobody in it."""
+    index = int(frame[0, 0, 0])
+    pose_out.fill(np.nan)
+    face_out.fill(np.nan)
+    if index % 7 == 0:
+        return False
+    pose_out[:, 0] = 0.5 + 0.1 * np.sin(index / 10.0)
+    pose_out[:, 1] = np.linspace(0.2, 0.8, N_POSE_LANDMARKS) + 0.05 * np.cos(index / 5.0)
+    pose_out[:, 2] = 0.9
+    face_out[:] = [(0.5 + 0.02 * np.sin(index), 0.3, 0.0), (0.47, 0.27, 0.0), (0.53, 0.27, 0.0)]
+    return True
+
+
+@pytest.fixture
+def fake_video(monkeypatch):
+    monkeypatch.setattr(video_processor, "graph_pool", GraphPool(lambda: (FakeGraph(), FakeGraph()), 1))
+    monkeypatch.setattr(video_processor, "detect_landmarks", _landmarks_of_frame)
+
+
+@pytest.mark.parametrize("seek_min_step", [60, 1])
+def test_sharded_landmarks_match_a_single_pass(fake_video, monkeypatch, seek_min_step):
+    monkeypatch.setattr(config, "VIDEO_SEEK_MIN_STEP", seek_min_step)
+    single = extract_video_features("talk.mp4")
+    assert len(single["frame_indices"]) == 1000 // 15
+    info = probe_video("talk.mp4")
+    shards = plan_video_shards(info["frame_count"], info["fps"], 3)
+    assert len(shards) == 3 and shards[0][0] == 0 and shards[-1][1] is None
+    # shards finish in any order
+    merged = merge_video_features([extract_video_features("talk.mp4", start, end) for start, end in reversed(shards)])
+
+    np.testing.assert_array_equal(merged["frame_indices"], single["frame_indices"])
+    np.testing.assert_array_equal(merged["pose"], single["pose"])
+    np.testing.assert_array_equal(merged["face"], single["face"])
+    np.testing.assert_array_equal(merged["frame_size"], single["frame_size"])
+    assert summarize_features(merged, info["duration"]) == summarize_features(single, info["duration"])
+
+
+def test_shards_split_on_sampling_steps():
+    # 30 fps at 2 Hz: every 15th frame is sampled
+    shards = plan_video_shards(1000, 30.0, 4)
+    assert all(start % 15 == 0 for start, _ in shards)
+    assert [end for _, end in shards[:-1]] == [start for start, _ in shards[1:]]
+    assert plan_video_shards(20, 30.0, 4) == [(0, None)]
+
+
+def _old_frame(pose_row, face_row, w, h):
+    """The per-frame heuristics as analyze_frame computed them before the landmark tensors."""
+    if np.isnan(pose_row[0, 0]):
+        tilt, nose = 30.0, None
+    else:
+        left_sh, right_sh = pose_row[11], pose_row[12]
+        dx = float(right_sh[0]) * w - float(left_sh[0]) * w
+        dy = float(right_sh[1]) * h - float(left_sh[1]) * h
+        tilt = abs(float(np.degrees(np.arctan2(dy, dx))))
+        nose = (float(pose_row[0, 0]) * w, float(pose_row[0, 1]) * h)
+    if np.isnan(face_row[0, 0]):
+        gaze = 0
+    else:
+        (nose_x, nose_y), (left_x, left_y), (right_x, right_y) = [(float(x), float(y)) for x, y, _ in face_row]
+        eye_mid = ((left_x + right_x) / 2.0, (left_y + right_y) / 2.0)
+        gaze = 1 if abs(nose_x - eye_mid[0]) < 0.03 and abs(nose_y - eye_mid[1]) < 0.05 else 0
+    return tilt, gaze, nose
+
+
+def _old_summary(pose, face, frame_size, duration):
+    tilts, gazes, movements = [], [], []
+    prev_nose = None
+    for pose_row, face_row in zip(pose, face):
+        tilt, gaze, nose = _old_frame(pose_row, face_row, *frame_size)
+        tilts.append(tilt)
+        gazes.append(gaze)
+        if nose is not None:
+            if prev_nose is not None:
+                movements.append(np.linalg.norm(np.array(nose) - np.array(prev_nose)))
+            prev_nose = nose
+    return tilts, gazes, movements, video_processor.summarize_video(tilts, gazes, movements, duration, len(pose))
+
+
+def _random_landmarks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    pose = rng.uniform(0.0, 1.0, (n, N_POSE_LANDMARKS, 3)).astype(np.float32)
+    face = np.empty((n, len(FACE_GAZE_LANDMARKS), 3), dtype=np.float32)
+    face[:, 1:, :2] = rng.uniform(0.3, 0.5, (n, 2, 2))
+    face[:, 1:, 2] = 0.0
+    # nose tip near the eye midpoint in about half the frames, so both gaze outcomes occur
+    face[:, 0, :2] = face[:, 1:, :2].mean(axis=1) + rng.normal(0.0, 0.03, (n, 2))
+    face[:, 0, 2] = 0.0
+    pose[rng.random(n) < 0.2] = np.nan
+    face[rng.random(n) < 0.2] = np.nan
+    return pose, face
+
+
+def test_vectorized_features_match_the_per_frame_code():
+    pose, face = _random_landmarks(300)
+    frame_size = (1280, 720)
+    tilts, gazes, movements, summary = _old_summary(pose, face, frame_size, 150.0)
+
+    features = frame_features(pose, face, frame_size)
+    np.testing.assert_allclose(features["tilts"], tilts)
+    assert features["gazes"].tolist() == gazes
+    assert 0 < sum(gazes) < len(gazes)
+    np.testing.assert_allclose(video_processor.movement_magnitudes(features["noses"]), movements)
+
+    landmarks = {"frame_indices": np.arange(300), "pose": pose, "face": face, "frame_size": np.array(frame_size)}
+    assert summarize_features(landmarks, 150.0) == summary
+
+
+def test_features_of_a_video_without_people():
+    pose = np.full((5, N_POSE_LANDMARKS, 3), np.nan, dtype=np.float32)
+    face = np.full((5, len(FACE_GAZE_LANDMARKS), 3), np.nan, dtype=np.float32)
+    landmarks = {"frame_indices": np.arange(5), "pose": pose, "face": face, "frame_size": np.array((640, 480))}
+    assert summarize_features(landmarks, 2.5) == _old_summary(pose, face, (640, 480), 2.5)[3]
@@ -0,0 +1,171 @@
+# backend/tests/test_worker_pool.py
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app import config
+from app.services import worker_pool
+from app.services.worker_pool import AnalyzerPool, PoolBusyError, _warm_with_retry, _worker_pid
+
+# workers are spawned, so the initializer learns about the "model" through the environment
+_MODEL_ENV = "FLUENTIQ_TEST_MODEL_PATH"
+
+
+def _load_model():
+    if not os.path.exists(os.environ[_MODEL_ENV]):
+        raise RuntimeError("model missing")
+
+
+@pytest.fixture
+def model_path(tmp_path, monkeypatch):
+    path = tmp_path / "model.bin"
+    monkeypatch.setenv(_MODEL_ENV, str(path))
+    return path
+
+
+def test_failed_warm_up_clears_after_a_successful_task(model_path):
+    pool = AnalyzerPool("test", 1, 0, initializer=_load_model)
+
+    async def _run():
+        await pool.warm()
+        assert pool.readiness()["state"] == "failed"
+        assert pool.readiness()["error"]
+        model_path.write_bytes(b"weights")
+        assert await pool.submit(_worker_pid) != os.getpid()
+
+    try:
+        asyncio.run(_run())
+    finally:
+        pool.shutdown()
+    assert pool.readiness()["state"] == "cold"
+
+
+def test_warm_up_is_retried_until_it_succeeds(model_path, monkeypatch):
+    monkeypatch.setattr(config, "WARM_UP_RETRY_SECONDS", 1)
+    pool = AnalyzerPool("test", 1, 0, initializer=_load_model)
+
+    async def _run():
+        task = asyncio.ensure_future(_warm_with_retry(pool))
+        while pool.readiness()["state"] != "failed":
+            await asyncio.sleep(0.05)
+        model_path.write_bytes(b"weights")
+        await asyncio.wait_for(task, 60)
+        return pool.readiness()
+
+    try:
+        readiness = asyncio.run(_run())
+    finally:
+        pool.shutdown()
+    assert readiness["state"] == "ready"
+    assert readiness["error"] is None
+
+
+def _crash():
+    os._exit(1)
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def test_crashed_worker_is_replaced():
+    pool = AnalyzerPool("test", 1, 0)
+
+    async def _run():
+        first = await pool.submit(_worker_pid)
+        with pytest.raises(BrokenProcessPool):
+            await pool.submit(_crash)
+        assert pool.readiness()["state"] in ("failed", "warming")
+        second = await pool.submit(_worker_pid)
+        for _ in range(200):
+            if pool.readiness()["state"] == "ready":
+                break
+            await asyncio.sleep(0.05)
+        return first, second
+
+    try:
+        first, second = asyncio.run(_run())
+    finally:
+        pool.shutdown()
+    assert first != second
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_cancelled_task_keeps_its_slot_until_the_worker_finishes():
+    pool = AnalyzerPool("test", 1, 0)
+
+    async def _run():
+        await pool.warm()
+        task = asyncio.ensure_future(pool.submit(_sleep, 1.0))
+        await asyncio.sleep(0.3)  # running on the worker by now
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert pool.stats()["in_flight"] == 1
+        with pytest.raises(PoolBusyError):
+            await pool.submit(_worker_pid)
+        for _ in range(100):
+            if pool.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.05)
+        return await pool.submit(_worker_pid)
+
+    try:
+        assert asyncio.run(_run())
+    finally:
+        pool.shutdown()
+
+
+def test_submit_many_holds_a_slot_per_busy_worker():
+    pool = AnalyzerPool("test", 2, 0)
+
+    async def _run():
+        await pool.warm()
+        task = asyncio.ensure_future(pool.submit_many(_sleep, [(0.3,), (0.3,), (0.3,)]))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["in_flight"] == 2
+        with pytest.raises(PoolBusyError):
+            await pool.submit(_worker_pid)
+        assert len(await task) == 3
+        for _ in range(100):
+            if pool.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    try:
+        asyncio.run(_run())
+    finally:
+        pool.shutdown()
+    assert pool.stats()["in_flight"] == 0
+    assert pool.stats()["completed"] == 3
+
+
+def test_full_pool_rejects_with_retry_after():
+    pool = AnalyzerPool("test", 1, 0, retry_after=7)
+    pool._acquire_slots()
+    with pytest.raises(PoolBusyError) as info:
+        pool._acquire_slots()
+    assert info.value.retry_after == 7
+    assert pool.stats()["rejected"] == 1
+
+
+def _graph_stats(pid, checkouts, wait_total, wait_max):
+    return {"pid": pid, "size": 1, "created": 1, "idle": 1, "waiting": 0, "checkouts": checkouts,
+            "overflow": 0, "wait_seconds_total": wait_total, "wait_seconds_avg": 0.0, "wait_seconds_max": wait_max}
+
+
+def test_worker_graph_stats_are_aggregated_per_process(monkeypatch):
+    monkeypatch.setattr(worker_pool, "_worker_graph_stats", {})
+    worker_pool.record_worker_graph_stats(_graph_stats(11, 1, 0.0, 0.0))
+    # a later task on the same worker replaces its (cumulative) snapshot
+    worker_pool.record_worker_graph_stats(_graph_stats(11, 3, 0.5, 0.4))
+    worker_pool.record_worker_graph_stats(_graph_stats(12, 1, 0.1, 0.1))
+    graphs = worker_pool.get_pool_stats()["vision_worker_graphs"]
+    assert graphs["pools"] == 2 and graphs["size"] == 2
+    assert graphs["checkouts"] == 4
+    assert graphs["wait_seconds_total"] == 0.6
+    assert graphs["wait_seconds_avg"] == 0.15
+    assert graphs["wait_seconds_max"] == 0.4
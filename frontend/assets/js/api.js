@@ -7,10 +7,68 @@ async function fetchJSON(url, opts = {}) {
   return res.json();
 }
 
-async function fetchHistoryAll() {
-  return fetchJSON(`${BASE}/history/all`);
+function historyParams({ since = null, until = null } = {}) {
+  const params = new URLSearchParams();
+  if (since) params.set("since", since);
+  if (until) params.set("until", until);
+  return params;
+}
+
+// One page of /history/all: { items: [scores + timestamp], next_cursor }
+async function fetchHistoryPage({ cursor = null, limit = 50, since = null, until = null } = {}) {
+  const params = historyParams({ since, until });
+  params.set("limit", limit);
+  if (cursor !== null) params.set("cursor", cursor);
+  return fetchJSON(`${BASE}/history/all?${params}`);
+}
+
+// Every session (scores + timestamp only), newest first, following the cursors
+async function fetchHistoryAll({ since = null, until = null } = {}) {
+  const sessions = [];
+  let cursor = null;
+  do {
+    const page = await fetchHistoryPage({ cursor, limit: 500, since, until });
+    sessions.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor !== null);
+  return sessions;
+}
+
+// Full session: transcript and the audio/text/video/fused JSON
+async function fetchSession(sessionId) {
+  return fetchJSON(`${BASE}/history/${sessionId}`);
+}
+
+// Full sessions, oldest first, from the NDJSON export
+async function fetchHistoryExport({ since = null, until = null } = {}) {
+  const res = await fetch(`${BASE}/history/export?${historyParams({ since, until })}`);
+  if (!res.ok) throw new Error(`HTTP ${res.status} ${res.statusText}`);
+  const text = await res.text();
+  return text.split("\n").filter((line) => line.trim()).map((line) => JSON.parse(line));
 }
 
 async function fetchHistorySummary() {
   return fetchJSON(`${BASE}/history/summary`);
 }
+
+// Per-day / per-week averages, moving averages and slopes of every score
+async function fetchHistoryTrends({ bucket = "week", periods = 12, window = 4 } = {}) {
+  const params = new URLSearchParams({ bucket, periods, window });
+  return fetchJSON(`${BASE}/history/trends?${params}`);
+}
+
+async function fetchSessionTimeline(sessionId, { start = 0, end = null, maxPoints = 500 } = {}) {
+  const params = new URLSearchParams({ start, max_points: maxPoints });
+  if (end !== null) params.set("end", end);
+  return fetchJSON(`${BASE}/history/${sessionId}/timeline?${params}`);
+}
+
+async function submitBatch(files) {
+  const form = new FormData();
+  for (const file of files) form.append("files", file);
+  return fetchJSON(`${BASE}/batch`, { method: "POST", body: form });
+}
+
+async function fetchBatch(batchId) {
+  return fetchJSON(`${BASE}/batch/${batchId}`);
+}
@@ -109,10 +109,13 @@ function populateCompareSelects(allSessions) {
 }
 
 
-function showSessionDetail(id) {
-  const sessions = window._fiq_sessions || [];
-  const s = sessions.find((x) => x.id === id);
-  if (!s) {
+async function showSessionDetail(id) {
+  // the list only carries scores; the transcript comes with the full session
+  let s;
+  try {
+    s = await fetchSession(id);
+  } catch (err) {
+    console.error(err);
     alert("Session not found");
     return;
   }
@@ -242,9 +245,15 @@ function downloadBlob(filename, blob) {
   URL.revokeObjectURL(url);
 }
 
-// Export all sessions as CSV
-function exportSessionsCSV() {
-  const sessions = window._fiq_sessions || [];
+// Export all sessions as CSV (full rows from the NDJSON export, for the transcripts)
+async function exportSessionsCSV() {
+  let sessions;
+  try {
+    sessions = (await fetchHistoryExport()).reverse(); // newest first, like the table
+  } catch (err) {
+    console.error(err);
+    return alert("Failed to export sessions.");
+  }
   if (!sessions.length) return alert("No sessions to export.");
 
   // header
@@ -305,13 +314,17 @@ function exportChartsPNG() {
 }
 
 // Export single session JSON
-function exportSessionJSON() {
+async function exportSessionJSON() {
   const sel = document.getElementById("sessionExportSelect");
   const id = Number(sel.value);
   if (!id) return alert("Choose a session to export.");
-  const sessions = window._fiq_sessions || [];
-  const s = sessions.find(x => x.id === id);
-  if (!s) return alert("Session not found.");
+  let s;
+  try {
+    s = await fetchSession(id);
+  } catch (err) {
+    console.error(err);
+    return alert("Session not found.");
+  }
 
   const blob = new Blob([JSON.stringify(s, null, 2)], { type: "application/json" });
   downloadBlob(`session_${s.id}_${new Date().toISOString().slice(0,19)}.json`, blob);